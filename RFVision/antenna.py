@@ -0,0 +1,401 @@
+"""
+RFVision - 天线阵列因子引擎
+
+发射演示页面只有几种单天线的解析方向图。这里在服务端计算均匀线阵（ULA）与
+均匀面阵（URA）的阵列因子：
+- 波束扫描：各阵元施加渐进相位，主瓣指向 steer 方向
+- 幅度加权（锥削）：uniform / hann / hamming / blackman / bartlett / kaiser 取自
+  spectrum.get_window，另有按指定副瓣电平设计的道尔夫-切比雪夫加权
+- 线阵一次评估 阵元数 × 阵元间距 × 角度 的整批方向图：不同阵元数的加权补零到最大阵元数，
+  与 (间距, 阵元序号, 角度) 的相位因子做一次批量矩阵乘，不逐配置、逐角度循环
+- 面阵的加权可分离，AF(u, v) = AF_x(u)·AF_y(v)，两个线阵因子各用 Horner 法在 (θ, φ) 网格上
+  求值后相乘
+- 主瓣指向、半功率波束宽度、峰值副瓣电平在加权补零 FFT 给出的 sinθ 细网格上按整批
+  向量化计算，不受显示分辨率影响；线阵方向性系数用阵元加权的自相关闭式求出，不做数值积分
+- 结果按 (几何, 参数, 角度网格) 缓存在有界 LRU 中，拖动滑块回到已算过的参数时不再计算
+
+阵元为各向同性辐射单元。间距以波长为单位，角度为度：线阵角度从阵列法向起算
+（-90° ~ 90°）；面阵 θ 为偏离阵面法向的角度（0° ~ 90°），φ 为方位角（0° ~ 360°）。
+"""
+
+import os
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from link_budget import TileCache
+from spectrum import WINDOWS, get_window
+
+TAPERS = ('uniform', 'chebyshev') + tuple(name for name in WINDOWS if name != 'rectangular')
+
+DEFAULT_SIDELOBE_DB = 30.0
+
+# 方向图的显示下限 (dB)
+DEFAULT_FLOOR_DB = -60.0
+
+# 副瓣电平的下限 (dB)，低于此值（如单阵元、两阵元）时按此值报告
+METRIC_FLOOR_DB = -200.0
+
+# 每个坐标轴的阵元数上限
+MAX_ELEMENTS = 1024
+
+# 单次请求的 阵元数 × 间距 组合数上限
+MAX_CONFIGURATIONS = 256
+
+# 单个角度轴的最大点数
+MAX_ANGLE_POINTS = 100_000
+
+# 阵列因子的最大计算量（线阵：间距数 × 最大阵元数 × 角度数；面阵：(Mx + My) × θ点数 × φ点数）
+MAX_EVALUATION_POINTS = 8_000_000
+
+
+def resolve_taper(name: str) -> str:
+    taper = str(name).lower()
+    if taper == 'rectangular':
+        taper = 'uniform'
+    if taper not in TAPERS:
+        raise ValueError(f'Unsupported taper: {name}')
+    return taper
+
+
+def chebyshev_weights(count: int, sidelobe_db: float = DEFAULT_SIDELOBE_DB) -> np.ndarray:
+    """道尔夫-切比雪夫加权：全部副瓣等于 -sidelobe_db，峰值归一化为 1
+
+    在 x = β·cos(πk/N) 处对 N-1 阶切比雪夫多项式取样，再经 DFT 得到阵元加权。
+    """
+    if count < 3:
+        return np.ones(count)
+    if sidelobe_db <= 0:
+        raise ValueError('sidelobe_db must be positive')
+    order = count - 1
+    beta = np.cosh(np.arccosh(10 ** (sidelobe_db / 20)) / order)
+    x = beta * np.cos(np.pi * np.arange(count) / count)
+    samples = np.empty(count)
+    outside = np.abs(x) > 1
+    samples[~outside] = np.cos(order * np.arccos(x[~outside]))
+    sign = np.where(x[outside] > 0, 1.0, -1.0 if order % 2 else 1.0)
+    samples[outside] = sign * np.cosh(order * np.arccosh(np.abs(x[outside])))
+    if count % 2:
+        weights = np.real(np.fft.fft(samples))
+        half = (count + 1) // 2
+        weights = np.concatenate([weights[half - 1:0:-1], weights[:half]])
+    else:
+        weights = np.real(np.fft.fft(samples * np.exp(1j * np.pi * np.arange(count) / count)))
+        half = count // 2 + 1
+        weights = np.concatenate([weights[half - 1:0:-1], weights[1:half]])
+    return weights / weights.max()
+
+
+def taper_weights(taper: str, count: int, sidelobe_db: float = DEFAULT_SIDELOBE_DB) -> np.ndarray:
+    """count 个阵元的幅度加权"""
+    taper = resolve_taper(taper)
+    if taper == 'chebyshev':
+        return chebyshev_weights(count, sidelobe_db)
+    weights = get_window('rectangular' if taper == 'uniform' else taper, count)
+    if taper in ('hann', 'bartlett', 'blackman'):
+        # numpy 的这些窗两端为 0，端点阵元不起作用；改用去掉端点的 count + 2 点窗
+        weights = get_window(taper, count + 2)[1:-1]
+    return weights
+
+
+def check_elements(count) -> int:
+    count = int(count)
+    if not 1 <= count <= MAX_ELEMENTS:
+        raise ValueError(f'elements must be in 1..{MAX_ELEMENTS}')
+    return count
+
+
+def check_spacing(spacing) -> float:
+    spacing = float(spacing)
+    if not 0.05 <= spacing <= 16:
+        raise ValueError('spacing must be in [0.05, 16] wavelengths')
+    return spacing
+
+
+def parse_values(value, cast) -> Tuple:
+    """单个值、列表或逗号分隔的字符串（查询参数）→ 元组"""
+    if isinstance(value, str):
+        value = [item for item in value.split(',') if item.strip()]
+    elif not isinstance(value, (list, tuple)):
+        value = [value]
+    if not value:
+        raise ValueError('at least one value is required')
+    return tuple(cast(item) for item in value)
+
+
+def angle_axis(start: float, stop: float, resolution: float,
+               endpoint: bool = True) -> np.ndarray:
+    """[start, stop] 上步长为 resolution 的角度轴（度）"""
+    start, stop, resolution = float(start), float(stop), float(resolution)
+    if resolution <= 0 or stop <= start:
+        raise ValueError('angle axis needs stop > start and a positive resolution')
+    count = int(round((stop - start) / resolution)) + (1 if endpoint else 0)
+    if count > MAX_ANGLE_POINTS:
+        raise ValueError(f'angle axis must have at most {MAX_ANGLE_POINTS} points')
+    return np.linspace(start, stop, max(count, 2), endpoint=endpoint)
+
+
+def linear_directivity(weights: np.ndarray, spacings: np.ndarray,
+                       steer_deg: float) -> np.ndarray:
+    """实数加权线阵的方向性系数（线性值），weights (C, N)，spacings (S,) → (C, S)
+
+    D = (Σw)² / Σ_l R[l]·cos(2π·d·l·u0)·sinc(2·d·l)，R 为加权的自相关，u0 = sin(steer)。
+    """
+    count = weights.shape[-1]
+    spectrum = np.fft.rfft(weights, 2 * count, axis=-1)
+    correlation = np.fft.irfft(np.abs(spectrum) ** 2, 2 * count, axis=-1)[:, :count]
+    lags = np.arange(count)
+    u0 = np.sin(np.radians(steer_deg))
+    kernel = (np.cos(2 * np.pi * spacings[:, None] * lags * u0)
+              * np.sinc(2 * spacings[:, None] * lags))
+    kernel[:, 1:] *= 2
+    denominator = correlation @ kernel.T
+    return weights.sum(axis=-1)[:, None] ** 2 / denominator
+
+
+def beam_metrics(power: np.ndarray, angles: np.ndarray,
+                 steer_deg: float = 0.0) -> Dict[str, np.ndarray]:
+    """方向图（功率，(R, A)）的主瓣指向、半功率波束宽度与峰值副瓣电平，按行向量化
+
+    存在与主瓣等高的栅瓣时，取最靠近扫描角的最大值为主瓣，栅瓣计为 0 dB 副瓣。
+    半功率点在相邻采样间插值，超出角度范围时取范围边界；主瓣以两侧第一个极小值为界，
+    其余部分的最大值为副瓣。
+    """
+    rows, count = power.shape
+    index = np.arange(count)
+    row = np.arange(rows)
+    maxima = power >= power.max(axis=1, keepdims=True) * (1 - 1e-9)
+    peak_index = np.argmax(np.where(maxima, -np.abs(angles - steer_deg), -np.inf), axis=1)
+    peak = power[row, peak_index]
+    half = peak / 2
+    centre = peak_index[:, None]
+
+    below = power < half[:, None]
+    left = np.where(below & (index < centre), index, -1).max(axis=1)
+    right = np.where(below & (index > centre), index, count).min(axis=1)
+
+    # 在幅度域插值：半功率点附近幅度方向图接近线性
+    level = np.sqrt(power)
+    target = np.sqrt(half)
+
+    def crossing(lower, upper):
+        lower = np.clip(lower, 0, count - 1)
+        upper = np.clip(upper, 0, count - 1)
+        low, high = level[row, lower], level[row, upper]
+        fraction = np.divide(target - low, high - low, out=np.zeros(rows), where=high != low)
+        return angles[lower] + fraction * (angles[upper] - angles[lower])
+
+    left_angle = np.where(left >= 0, crossing(left, left + 1), angles[0])
+    right_angle = np.where(right < count, crossing(right - 1, right), angles[-1])
+
+    slope = np.diff(power, axis=1)
+    steps = index[:-1]
+    left_null = np.where((slope < 0) & (steps + 1 < centre), steps + 1, 0).max(axis=1)
+    right_null = np.where((slope > 0) & (steps > centre), steps, count - 1).min(axis=1)
+    sidelobes = (index < left_null[:, None]) | (index > right_null[:, None])
+    sidelobe = np.where(sidelobes, power, 0).max(axis=1)
+
+    return {
+        'peak_deg': angles[peak_index],
+        'hpbw_deg': right_angle - left_angle,
+        'sidelobe_db': to_db(np.divide(sidelobe, peak, out=np.zeros(rows), where=peak > 0),
+                             METRIC_FLOOR_DB),
+    }
+
+
+def metric_fft_size(count: int, rows: int, spacing: float) -> int:
+    """波束指标所用 FFT 的长度：每个主瓣宽度约 16 个样本，受 MAX_EVALUATION_POINTS 限制"""
+    minimum = 1 << int(np.ceil(np.log2(count)))
+    size = max(1 << int(np.ceil(np.log2(16 * count))), 256)
+    while size > minimum and rows * 2 * size * spacing > MAX_EVALUATION_POINTS:
+        size //= 2
+    return size
+
+
+def to_db(power: np.ndarray, floor_db: float = DEFAULT_FLOOR_DB) -> np.ndarray:
+    return 10 * np.log10(np.maximum(power, 10 ** (floor_db / 10)))
+
+
+class LinearArrayBatch:
+    """一批均匀线阵：阵元数 (C,) × 阵元间距 (S,)，共同的扫描角、加权方式与角度网格"""
+
+    def __init__(self, elements: Sequence[int], spacings: Sequence[float],
+                 steer_deg: float = 0.0, taper: str = 'uniform',
+                 sidelobe_db: float = DEFAULT_SIDELOBE_DB, resolution: float = 1.0,
+                 floor_db: float = DEFAULT_FLOOR_DB):
+        self.elements = tuple(check_elements(count) for count in elements)
+        self.spacings = tuple(check_spacing(spacing) for spacing in spacings)
+        if len(self.elements) * len(self.spacings) > MAX_CONFIGURATIONS:
+            raise ValueError(f'at most {MAX_CONFIGURATIONS} element/spacing combinations')
+        self.steer_deg = float(steer_deg)
+        if not -90 <= self.steer_deg <= 90:
+            raise ValueError('steer must be in [-90, 90] degrees')
+        self.taper = resolve_taper(taper)
+        self.sidelobe_db = float(sidelobe_db)
+        self.resolution = float(resolution)
+        self.floor_db = float(floor_db)
+        self.angles = angle_axis(-90, 90, self.resolution)
+        points = len(self.spacings) * max(self.elements) * self.angles.size
+        if points > MAX_EVALUATION_POINTS:
+            raise ValueError(f'array factor needs {points} points, '
+                             f'limit is {MAX_EVALUATION_POINTS}')
+
+    def key(self) -> Tuple:
+        return ('linear', self.elements, self.spacings, self.steer_deg, self.taper,
+                self.sidelobe_db if self.taper == 'chebyshev' else None,
+                self.resolution, self.floor_db)
+
+    def weights(self) -> np.ndarray:
+        """(C, 最大阵元数) 的加权矩阵，阵元数不足的行补零"""
+        matrix = np.zeros((len(self.elements), max(self.elements)))
+        for row, count in enumerate(self.elements):
+            matrix[row, :count] = taper_weights(self.taper, count, self.sidelobe_db)
+        return matrix
+
+    def evaluate(self) -> Dict[str, np.ndarray]:
+        weights = self.weights()
+        spacings = np.asarray(self.spacings)
+        offset = np.sin(np.radians(self.angles)) - np.sin(np.radians(self.steer_deg))
+        # 相位因子 (S, N, A)：exp(j·2π·d·n·(sinθ - sinθ0))
+        phase = (2 * np.pi * spacings[:, None, None] * np.arange(weights.shape[1])[:, None]
+                 * offset)
+        factor = np.matmul(weights.astype(np.complex128), np.exp(1j * phase))   # (S, C, A)
+        power = np.abs(factor.transpose(1, 0, 2)) ** 2
+        power /= (weights.sum(axis=1) ** 2)[:, None, None]
+
+        values = self.metrics(weights)
+        values['directivity_dbi'] = 10 * np.log10(
+            linear_directivity(weights, spacings, self.steer_deg))
+        values['pattern_db'] = to_db(power, self.floor_db)
+        return values
+
+    def metrics(self, weights: np.ndarray) -> Dict[str, np.ndarray]:
+        """在 u = sinθ 的细网格上计算波束指标，精度与显示用的角度分辨率无关
+
+        AF 是 ψ = 2π·d·(u - u0) 的 2π 周期函数，加权补零后的一次 FFT 给出 ψ = 2πk/K 处的
+        全部取值；每种间距只是把同一组样本映射到不同的 u = u0 + k/(K·d)，不再逐间距求和。
+        """
+        rows, count = weights.shape
+        u0 = np.sin(np.radians(self.steer_deg))
+        size = metric_fft_size(count, rows, max(self.spacings))
+        power = np.abs(np.fft.fft(weights, size, axis=1)) ** 2
+        power /= (weights.sum(axis=1) ** 2)[:, None]
+
+        values = {name: np.empty((rows, len(self.spacings)))
+                  for name in ('peak_deg', 'hpbw_deg', 'sidelobe_db')}
+        for column, spacing in enumerate(self.spacings):
+            scale = size * spacing
+            k = np.arange(np.ceil(-(1 + u0) * scale), np.floor((1 - u0) * scale) + 1)
+            angles = np.degrees(np.arcsin(np.clip(u0 + k / scale, -1, 1)))
+            # 实数加权的 |AF(ψ)| = |AF(-ψ)|，FFT 的符号约定不影响功率
+            metrics = beam_metrics(power[:, k.astype(np.intp) % size], angles, self.steer_deg)
+            for name, value in metrics.items():
+                values[name][:, column] = value
+        return values
+
+    def pattern(self, cache: TileCache = None) -> Dict[str, np.ndarray]:
+        if cache is None:
+            return self.evaluate()
+        return cache.get_or_compute(self.key(), self.evaluate)
+
+    def describe(self) -> Dict:
+        return {
+            'geometry': 'linear',
+            'elements': list(self.elements),
+            'spacing': list(self.spacings),
+            'steer_deg': self.steer_deg,
+            'taper': self.taper,
+            'sidelobe_target_db': self.sidelobe_db if self.taper == 'chebyshev' else None,
+            'angles_deg': self.angles,
+            'floor_db': self.floor_db,
+        }
+
+
+class PlanarArray:
+    """均匀矩形面阵（Mx × My 个阵元，位于 xy 平面），加权按两个方向可分离"""
+
+    def __init__(self, elements_x: int, elements_y: int, spacing_x: float, spacing_y: float,
+                 steer_theta: float = 0.0, steer_phi: float = 0.0, taper: str = 'uniform',
+                 sidelobe_db: float = DEFAULT_SIDELOBE_DB, resolution: float = 1.0,
+                 floor_db: float = DEFAULT_FLOOR_DB):
+        self.elements = (check_elements(elements_x), check_elements(elements_y))
+        self.spacings = (check_spacing(spacing_x), check_spacing(spacing_y))
+        self.steer_theta = float(steer_theta)
+        self.steer_phi = float(steer_phi) % 360
+        if not 0 <= self.steer_theta <= 90:
+            raise ValueError('steer_theta must be in [0, 90] degrees')
+        self.taper = resolve_taper(taper)
+        self.sidelobe_db = float(sidelobe_db)
+        self.resolution = float(resolution)
+        self.floor_db = float(floor_db)
+        self.theta = angle_axis(0, 90, self.resolution)
+        self.phi = angle_axis(0, 360, self.resolution, endpoint=False)
+        points = sum(self.elements) * self.theta.size * self.phi.size
+        if points > MAX_EVALUATION_POINTS:
+            raise ValueError(f'array factor needs {points} points, '
+                             f'limit is {MAX_EVALUATION_POINTS}')
+
+    def key(self) -> Tuple:
+        return ('planar', self.elements, self.spacings, self.steer_theta, self.steer_phi,
+                self.taper, self.sidelobe_db if self.taper == 'chebyshev' else None,
+                self.resolution, self.floor_db)
+
+    def _direction_cosines(self, theta, phi) -> Tuple[np.ndarray, np.ndarray]:
+        theta, phi = np.radians(theta), np.radians(phi)
+        return np.sin(theta) * np.cos(phi), np.sin(theta) * np.sin(phi)
+
+    def evaluate(self) -> Dict[str, np.ndarray]:
+        u, v = self._direction_cosines(self.theta[:, None], self.phi[None, :])
+        u0, v0 = self._direction_cosines(self.steer_theta, self.steer_phi)
+        power = np.ones(u.shape)
+        weights = []
+        for count, spacing, cosine, steer in zip(self.elements, self.spacings, (u, v), (u0, v0)):
+            taper = taper_weights(self.taper, count, self.sidelobe_db)
+            # 秦九韶（Horner）求值 Σ w_n·z^n，z = exp(j·2π·d·(u - u0))：
+            # 只对 (θ, φ) 网格求一次复指数，不展开 (阵元, θ, φ) 的相位张量
+            z = np.exp(2j * np.pi * spacing * (cosine - steer))
+            factor = np.full(z.shape, taper[-1], dtype=np.complex128)
+            for weight in taper[-2::-1]:
+                factor *= z
+                factor += weight
+            power *= np.abs(factor) ** 2 / taper.sum() ** 2
+            weights.append(taper)
+
+        peak = np.unravel_index(np.argmax(power), power.shape)
+        # 边射线阵方向性系数的近似组合：D ≈ π·cosθ0·Dx·Dy
+        linear = [linear_directivity(taper[None, :], np.array([spacing]), 0.0)[0, 0]
+                  for taper, spacing in zip(weights, self.spacings)]
+        directivity = np.pi * np.cos(np.radians(self.steer_theta)) * linear[0] * linear[1]
+        return {
+            'pattern_db': to_db(power, self.floor_db),
+            'peak_deg': np.array([self.theta[peak[0]], self.phi[peak[1]]]),
+            'directivity_dbi': np.array(10 * np.log10(max(directivity, 1.0))),
+        }
+
+    def pattern(self, cache: TileCache = None) -> Dict[str, np.ndarray]:
+        if cache is None:
+            return self.evaluate()
+        return cache.get_or_compute(self.key(), self.evaluate)
+
+    def describe(self) -> Dict:
+        return {
+            'geometry': 'planar',
+            'elements': list(self.elements),
+            'spacing': list(self.spacings),
+            'steer_deg': [self.steer_theta, self.steer_phi],
+            'taper': self.taper,
+            'sidelobe_target_db': self.sidelobe_db if self.taper == 'chebyshev' else None,
+            'theta_deg': self.theta,
+            'phi_deg': self.phi,
+            'floor_db': self.floor_db,
+        }
+
+
+class PatternCache(TileCache):
+    """阵列方向图的 LRU 缓存（按条目数与字节数限制，线程安全）"""
+
+    @classmethod
+    def from_env(cls) -> 'PatternCache':
+        """根据环境变量 RFVISION_PATTERN_CACHE_MAX_ENTRIES / RFVISION_PATTERN_CACHE_MAX_MB 创建"""
+        return cls(int(os.environ.get('RFVISION_PATTERN_CACHE_MAX_ENTRIES', 512)),
+                   int(os.environ.get('RFVISION_PATTERN_CACHE_MAX_MB', 64)) * 1024 * 1024)
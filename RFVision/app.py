@@ -78,55 +78,135 @@ RF Vision - 射频载波、调制、发射过程可视化演示系统
 基于物理原理的动态可视化演示
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import (Flask, Response, render_template, jsonify, request, send_file,
+                   stream_with_context)
 import numpy as np
 import json
+import os
+import re
 from typing import Dict, List, Tuple
 
+import metrics
+from antenna import (DEFAULT_FLOOR_DB, DEFAULT_SIDELOBE_DB, LinearArrayBatch, PatternCache,
+                     PlanarArray, parse_values)
+from archive import WaveformArchive
+import spectrum
+from baseband import (BitsLike, bits_to_array, bits_to_string, bits_to_text, fsk_frequency_track,
+                      moving_average, render_baseband, render_fsk, text_to_bits)
+from ber import ber_curve
+from channel import apply_fading
+from compression import ResponseCompression
+from demodulation import SUPPORTED_RECEIVERS, coherent_demodulate
+from executor import ComputeExecutor, offload
+from link_budget import (DEFAULT_TILE_SHAPE, OUTPUTS as COVERAGE_OUTPUTS, CoverageGrid,
+                         LinkBudget, TileCache, axis_values)
+import iq
+from nco import NCO, is_uniform
+import pulse_shaping
+from pulse_shaping import DEFAULT_ROLLOFF, DEFAULT_SPAN, filter_bank, resolve_shape
+from precision import DEFAULT_PRECISION, precision_from_env, resolve_precision, wrapped_cos
+from oscillator import (SSE_MIMETYPE, MAX_INTERVAL, MIN_INTERVAL, PhaseOscillator,
+                        TooManyStreams, WaveformStreams, sse_frames)
+from response_cache import ResponseCache, cached, record_signal_id
+from signal_store import SignalStore
+from streaming import NDJSON_MIMETYPE, ndjson_lines, transmission_frames
+from transport import signal_response
+from waveforms import WaveformMemo
+
 app = Flask(__name__)
+# 请求体大小上限（含 /api/archive/import 上传），超限时返回 413
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('RFVISION_MAX_UPLOAD_MB', 256)) * 1024 * 1024
+
+# 批量参数扫描：调制方式 → 扫描参数名（与 /api/generate_* 的查询参数一致）
+SWEEP_PARAMETERS = {'CARRIER': None, 'AM': 'mod_depth', 'FM': 'freq_dev', 'PM': 'phase_dev'}
+SWEEP_DEFAULTS = {'CARRIER': 0.0, 'AM': 0.5, 'FM': 10.0, 'PM': np.pi / 4}
+MAX_SWEEP_VARIANTS = 256
+
+# /api/text-to-binary 逐字符映射表的最大字符数（完整比特串不受此限制）
+MAX_CHAR_MAPPINGS = 1024
+
+# 复基带模式通带显示波形的最大采样数
+MAX_PASSBAND_SAMPLES = 1_000_000
+
+# /api/coverage-grid 单次请求最多返回的分块数
+MAX_COVERAGE_TILES = 16
+
+# /api/iq-transmission 默认返回用于显示的符号数
+IQ_DISPLAY_SYMBOLS = 1024
 
 class RFSignalProcessor:
     """RF信号处理器 - 符合物理原理的信号生成和处理"""
     
-    def __init__(self):
+    def __init__(self, precision: str = DEFAULT_PRECISION):
         self.sampling_rate = 1000  # 采样率 Hz
         self.time_duration = 2.0   # 时间长度 秒
         self.bit_rate = 10  # 比特率 bps
+        # 时间轴/载波/调制音等中间数组的只读缓存
+        self.waveforms = WaveformMemo.from_env()
+        self.set_precision(precision)
+    
+    @classmethod
+    def from_env(cls) -> 'RFSignalProcessor':
+        """根据环境变量 RFVISION_PRECISION（float64 / float32）创建"""
+        return cls(precision_from_env())
     
+    def set_precision(self, precision: str) -> None:
+        """设置计算精度：float32 模式下信号/频谱为 float32，复数中间量为 complex64"""
+        self.dtype, self.complex_dtype = resolve_precision(precision)
+        self.precision = self.dtype.name
+    
+    def time_base(self) -> np.ndarray:
+        """当前采样率与时长下的时间轴（只读）"""
+        return self.waveforms.time_base(self.sampling_rate, self.time_duration, self.dtype)
+    
+    def carrier(self, frequency: float, time, phase: float = 0.0) -> np.ndarray:
+        """cos(2πf·t + phase)：等间隔时间轴由查表 NCO 合成，否则回退到 np.cos"""
+        time = np.asarray(time)
+        if not is_uniform(time):
+            cycles = frequency * np.asarray(time, dtype=float) + phase / (2 * np.pi)
+            return wrapped_cos(cycles, self.dtype)
+        return NCO.for_time_axis(frequency, time, phase, dtype=self.dtype).cos(time.size)
+
+    @metrics.instrumented
     def generate_carrier_wave(self, frequency: float, amplitude: float = 1.0) -> Dict:
         """生成载波信号"""
-        t = np.linspace(0, self.time_duration, int(self.sampling_rate * self.time_duration))
-        carrier = amplitude * np.cos(2 * np.pi * frequency * t)
+        t = self.time_base()
+        carrier = amplitude * self.waveforms.cosine(self.sampling_rate, self.time_duration,
+                                                    frequency, self.dtype)
         
         return {
-            'time': t.tolist(),
-            'amplitude': carrier.tolist(),
+            'time': t,
+            'amplitude': carrier,
             'frequency': frequency,
             'type': 'carrier'
         }
     
+    @metrics.instrumented
     def generate_modulation_signal(self, frequency: float, amplitude: float = 1.0) -> Dict:
         """生成调制信号（基带信号）"""
-        t = np.linspace(0, self.time_duration, int(self.sampling_rate * self.time_duration))
-        modulation = amplitude * np.sin(2 * np.pi * frequency * t)
+        t = self.time_base()
+        modulation = amplitude * self.waveforms.sine(self.sampling_rate, self.time_duration,
+                                                     frequency, self.dtype)
         
         return {
-            'time': t.tolist(),
-            'amplitude': modulation.tolist(),
+            'time': t,
+            'amplitude': modulation,
             'frequency': frequency,
             'type': 'modulation'
         }
     
+    @metrics.instrumented
     def amplitude_modulation(self, carrier_freq: float, mod_freq: float, 
                            mod_depth: float = 0.5) -> Dict:
         """幅度调制 (AM) - 符合物理原理"""
-        t = np.linspace(0, self.time_duration, int(self.sampling_rate * self.time_duration))
+        fs, duration = self.sampling_rate, self.time_duration
+        t = self.time_base()
         
         # 载波信号
-        carrier = np.cos(2 * np.pi * carrier_freq * t)
+        carrier = self.waveforms.cosine(fs, duration, carrier_freq, self.dtype)
         
         # 调制信号
-        modulation = np.cos(2 * np.pi * mod_freq * t)
+        modulation = self.waveforms.cosine(fs, duration, mod_freq, self.dtype)
         
         # AM调制: y(t) = A[1 + m*cos(2πfm*t)]*cos(2πfc*t)
         # 其中 m 是调制深度
@@ -137,40 +217,42 @@ class RFSignalProcessor:
         envelope_lower = -(1 + mod_depth * modulation)
         
         return {
-            'time': t.tolist(),
-            'carrier': carrier.tolist(),
-            'modulation': modulation.tolist(),
-            'am_signal': am_signal.tolist(),
-            'envelope_upper': envelope_upper.tolist(),
-            'envelope_lower': envelope_lower.tolist(),
+            'time': t,
+            'carrier': carrier,
+            'modulation': modulation,
+            'am_signal': am_signal,
+            'envelope_upper': envelope_upper,
+            'envelope_lower': envelope_lower,
             'carrier_freq': carrier_freq,
             'mod_freq': mod_freq,
             'mod_depth': mod_depth,
             'type': 'AM'
         }
     
+    @metrics.instrumented
     def frequency_modulation(self, carrier_freq: float, mod_freq: float, 
                            frequency_deviation: float = 10) -> Dict:
         """频率调制 (FM) - 符合物理原理"""
-        t = np.linspace(0, self.time_duration, int(self.sampling_rate * self.time_duration))
+        fs, duration = self.sampling_rate, self.time_duration
+        t = self.time_base()
         
         # 调制信号
-        modulation = np.cos(2 * np.pi * mod_freq * t)
+        modulation = self.waveforms.cosine(fs, duration, mod_freq, self.dtype)
         
         # FM调制: y(t) = A*cos(2π*fc*t + (Δf/fm)*sin(2π*fm*t))
         # 其中 Δf 是频率偏移
         modulation_index = frequency_deviation / mod_freq
-        fm_signal = np.cos(2 * np.pi * carrier_freq * t + 
-                          modulation_index * np.sin(2 * np.pi * mod_freq * t))
+        fm_signal = np.cos(self.waveforms.phase_ramp(fs, duration, carrier_freq, self.dtype) + 
+                          modulation_index * self.waveforms.sine(fs, duration, mod_freq, self.dtype))
         
         # 瞬时频率
         instantaneous_freq = carrier_freq + frequency_deviation * modulation
         
         return {
-            'time': t.tolist(),
-            'modulation': modulation.tolist(),
-            'fm_signal': fm_signal.tolist(),
-            'instantaneous_freq': instantaneous_freq.tolist(),
+            'time': t,
+            'modulation': modulation,
+            'fm_signal': fm_signal,
+            'instantaneous_freq': instantaneous_freq,
             'carrier_freq': carrier_freq,
             'mod_freq': mod_freq,
             'frequency_deviation': frequency_deviation,
@@ -178,167 +260,201 @@ class RFSignalProcessor:
             'type': 'FM'
         }
     
+    @metrics.instrumented
     def phase_modulation(self, carrier_freq: float, mod_freq: float, 
                         phase_deviation: float = np.pi/4) -> Dict:
         """相位调制 (PM) - 符合物理原理"""
-        t = np.linspace(0, self.time_duration, int(self.sampling_rate * self.time_duration))
+        fs, duration = self.sampling_rate, self.time_duration
+        t = self.time_base()
         
         # 调制信号
-        modulation = np.cos(2 * np.pi * mod_freq * t)
+        modulation = self.waveforms.cosine(fs, duration, mod_freq, self.dtype)
         
         # PM调制: y(t) = A*cos(2π*fc*t + Δφ*cos(2π*fm*t))
         # 其中 Δφ 是相位偏移
-        pm_signal = np.cos(2 * np.pi * carrier_freq * t + 
+        pm_signal = np.cos(self.waveforms.phase_ramp(fs, duration, carrier_freq, self.dtype) + 
                           phase_deviation * modulation)
         
         # 瞬时相位
         instantaneous_phase = phase_deviation * modulation
         
         return {
-            'time': t.tolist(),
-            'modulation': modulation.tolist(),
-            'pm_signal': pm_signal.tolist(),
-            'instantaneous_phase': instantaneous_phase.tolist(),
+            'time': t,
+            'modulation': modulation,
+            'pm_signal': pm_signal,
+            'instantaneous_phase': instantaneous_phase,
             'carrier_freq': carrier_freq,
             'mod_freq': mod_freq,
             'phase_deviation': phase_deviation,
             'type': 'PM'
         }
     
-    def get_spectrum(self, signal: List[float]) -> Dict:
-        """计算信号频谱 - FFT分析"""
-        signal_array = np.array(signal)
-        
-        # 执行FFT
-        fft_result = np.fft.fft(signal_array)
-        frequencies = np.fft.fftfreq(len(signal_array), 1/self.sampling_rate)
-        
-        # 只保留正频率部分
-        positive_freq_idx = frequencies >= 0
-        frequencies = frequencies[positive_freq_idx]
-        magnitude = np.abs(fft_result[positive_freq_idx])
-        phase = np.angle(fft_result[positive_freq_idx])
+    @metrics.instrumented
+    def modulation_sweep(self, modulation_type: str, carrier_freq, mod_freq,
+                         parameter, amplitude=1.0) -> Dict:
+        """批量参数扫描 - 一次广播计算一组调制信号
+
+        carrier_freq / mod_freq / parameter / amplitude 可以是标量或一维向量，
+        广播为同一长度 N 后与时间轴组合成 (N, samples) 二维数组。
+        parameter 的含义随调制方式而定：AM 为调制深度，FM 为频率偏移，PM 为相位偏移，
+        载波（carrier）时不使用。
+        """
+        modulation_type = modulation_type.upper()
+        if modulation_type not in SWEEP_PARAMETERS:
+            raise ValueError(f'Unsupported modulation type: {modulation_type}')
+
+        carrier_freq, mod_freq, parameter, amplitude = (
+            np.atleast_1d(np.asarray(values, dtype=float))
+            for values in np.broadcast_arrays(carrier_freq, mod_freq, parameter, amplitude))
+        if carrier_freq.ndim != 1:
+            raise ValueError('Sweep parameters must be scalars or 1-D vectors')
+        if carrier_freq.size > MAX_SWEEP_VARIANTS:
+            raise ValueError(f'At most {MAX_SWEEP_VARIANTS} variants per sweep')
+
+        # 相位在 float64 中计算，结果转换为当前精度
+        t = self.waveforms.time_base(self.sampling_rate, self.time_duration)
+        # (N, 1) × (samples,) → (N, samples)
+        carrier_phase = 2 * np.pi * carrier_freq[:, None] * t
+        message_phase = 2 * np.pi * mod_freq[:, None] * t
+
+        if modulation_type == 'CARRIER':
+            signals = np.cos(carrier_phase)
+        elif modulation_type == 'AM':
+            signals = (1 + parameter[:, None] * np.cos(message_phase)) * np.cos(carrier_phase)
+        elif modulation_type == 'FM':
+            if np.any(mod_freq == 0):
+                raise ValueError('mod_freq must be non-zero for FM')
+            modulation_index = parameter / mod_freq
+            signals = np.cos(carrier_phase + modulation_index[:, None] * np.sin(message_phase))
+        else:
+            signals = np.cos(carrier_phase + parameter[:, None] * np.cos(message_phase))
+        signals *= amplitude[:, None]
+        signals = signals.astype(self.dtype, copy=False)
         
+        parameters = {'carrier_freq': carrier_freq, 'mod_freq': mod_freq, 'amplitude': amplitude}
+        if SWEEP_PARAMETERS[modulation_type]:
+            parameters[SWEEP_PARAMETERS[modulation_type]] = parameter
+
         return {
-            'frequencies': frequencies.tolist(),
-            'magnitude': magnitude.tolist(),
-            'phase': phase.tolist(),
-            'type': 'spectrum'
+            'time': self.time_base(),
+            'signals': signals,
+            'parameters': parameters,
+            'variants': int(signals.shape[0]),
+            'type': modulation_type
         }
     
+    @metrics.instrumented
+    def get_spectrum(self, signal: List[float], window: str = 'rectangular',
+                     nfft='fast') -> Dict:
+        """计算信号频谱 - FFT分析
+
+        使用 rfft 直接计算正频率部分，FFT长度补零到快速长度；
+        传入 (signals, samples) 二维数组时一次完成批量变换。
+        """
+        signal = np.asarray(signal, dtype=self.dtype)
+        return spectrum.analyze(signal, self.sampling_rate, 'fft', window, nfft)
+    
+    @metrics.instrumented
+    def calculate_spectrum(self, signal: List[float], sampling_rate: float = None,
+                           method: str = 'fft', window: str = None, nfft='fast',
+                           segment_length: int = 256, overlap: float = 0.5) -> Dict:
+        """频谱分析：FFT幅度谱或Welch平均功率谱密度（支持批量）"""
+        sampling_rate = self.sampling_rate if sampling_rate is None else sampling_rate
+        signal = np.asarray(signal, dtype=self.dtype)
+        return spectrum.analyze(signal, sampling_rate, method, window, nfft,
+                                segment_length, overlap)
+    
+    @metrics.instrumented
     def text_to_binary(self, text: str) -> str:
-        """将文本转换为二进制字符串"""
-        binary_string = ''.join(format(ord(char), '08b') for char in text)
-        return binary_string
-    
-    def binary_to_text(self, binary: str) -> str:
-        """将二进制字符串转换为文本"""
-        try:
-            # 确保二进制字符串长度是8的倍数
-            if len(binary) % 8 != 0:
-                binary = binary[:-(len(binary) % 8)]
-            
-            text = ''
-            for i in range(0, len(binary), 8):
-                byte = binary[i:i+8]
-                if len(byte) == 8:
-                    text += chr(int(byte, 2))
-            return text
-        except:
-            return "解码错误"
-    
-    def generate_digital_baseband(self, binary_data: str, bit_rate: float = 10, 
-                                encoding: str = 'NRZ') -> Dict:
-        """生成数字基带信号"""
+        """将文本转换为二进制字符串（UTF-8 字节，供接口返回；内部使用 text_to_bits）"""
+        return bits_to_string(text_to_bits(text))
+    
+    @metrics.instrumented
+    def binary_to_text(self, binary) -> str:
+        """将二进制字符串或比特数组按 UTF-8 转换为文本"""
+        return bits_to_text(binary)
+    
+    @metrics.instrumented
+    def generate_digital_baseband(self, binary_data: BitsLike, bit_rate: float = 10, 
+                                encoding: str = 'NRZ', pulse_shape: str = 'rect',
+                                rolloff: float = DEFAULT_ROLLOFF,
+                                span: int = DEFAULT_SPAN) -> Dict:
+        """生成数字基带信号（binary_data 为 '0'/'1' 字符串或比特数组）
+
+        pulse_shape 为 'rc' / 'rrc' 时，NRZ 电平经多相升余弦 / 根升余弦滤波器成形，
+        得到带限基带信号（仅适用于 NRZ 编码）。
+        """
+        pulse_shape = resolve_shape(pulse_shape)
+        bits = bits_to_array(binary_data)
         bit_duration = 1.0 / bit_rate
-        total_duration = len(binary_data) * bit_duration
+        total_duration = bits.size * bit_duration
         
         # 调整采样参数以适应数字信号
         samples_per_bit = int(self.sampling_rate * bit_duration)
-        total_samples = samples_per_bit * len(binary_data)
-        
-        t = np.linspace(0, total_duration, total_samples)
-        signal = np.zeros(total_samples)
-        
-        for i, bit in enumerate(binary_data):
-            start_idx = i * samples_per_bit
-            end_idx = (i + 1) * samples_per_bit
-            
-            if encoding == 'NRZ':  # Non-Return-to-Zero
-                signal[start_idx:end_idx] = 1 if bit == '1' else -1
-            elif encoding == 'RZ':  # Return-to-Zero
-                if bit == '1':
-                    signal[start_idx:start_idx + samples_per_bit//2] = 1
-                    signal[start_idx + samples_per_bit//2:end_idx] = 0
-                else:
-                    signal[start_idx:end_idx] = 0
-            elif encoding == 'Manchester':  # Manchester编码
-                if bit == '1':
-                    signal[start_idx:start_idx + samples_per_bit//2] = -1
-                    signal[start_idx + samples_per_bit//2:end_idx] = 1
-                else:
-                    signal[start_idx:start_idx + samples_per_bit//2] = 1
-                    signal[start_idx + samples_per_bit//2:end_idx] = -1
+        total_samples = samples_per_bit * bits.size
+        
+        t = np.linspace(0, total_duration, total_samples, dtype=self.dtype)
+        if pulse_shape == 'rect':
+            # 查表生成：每个比特映射为对应编码的脉冲模板
+            signal = render_baseband(bits, encoding, samples_per_bit, self.dtype)
+        elif encoding != 'NRZ':
+            raise ValueError('Pulse shaping is only supported for NRZ encoding')
+        else:
+            levels = 2 * bits.astype(self.dtype) - 1
+            signal = filter_bank(pulse_shape, rolloff, span, samples_per_bit).interpolate(levels)
         
         return {
-            'time': t.tolist(),
-            'amplitude': signal.tolist(),
+            'time': t,
+            'amplitude': signal,
             'binary_data': binary_data,
             'bit_rate': bit_rate,
             'encoding': encoding,
+            'pulse_shape': pulse_shape,
             'type': 'digital_baseband'
         }
     
+    @metrics.instrumented
     def ask_modulation(self, baseband_signal: List[float], carrier_freq: float, 
                       time: List[float]) -> Dict:
         """幅移键控调制 (ASK)"""
-        t = np.array(time)
-        baseband = np.array(baseband_signal)
+        t = np.asarray(time, dtype=self.dtype)
+        baseband = np.asarray(baseband_signal, dtype=self.dtype)
         
         # ASK: 载波幅度根据数字信号变化
-        carrier = np.cos(2 * np.pi * carrier_freq * t)
+        carrier = self.carrier(carrier_freq, t)
         # 将基带信号标准化到0-1范围，然后调制载波
         normalized_baseband = (baseband + 1) / 2  # 从[-1,1]转换到[0,1]
         ask_signal = normalized_baseband * carrier
         
         return {
             'time': time,
-            'ask_signal': ask_signal.tolist(),
-            'carrier': carrier.tolist(),
+            'ask_signal': ask_signal,
+            'carrier': carrier,
             'baseband': baseband_signal,
             'carrier_freq': carrier_freq,
             'type': 'ASK'
         }
     
-    def fsk_modulation(self, binary_data: str, freq_0: float, freq_1: float, 
+    @metrics.instrumented
+    def fsk_modulation(self, binary_data: BitsLike, freq_0: float, freq_1: float, 
                       bit_rate: float = 10) -> Dict:
         """频移键控调制 (FSK)"""
+        bits = bits_to_array(binary_data)
         bit_duration = 1.0 / bit_rate
-        total_duration = len(binary_data) * bit_duration
+        total_duration = bits.size * bit_duration
         
         samples_per_bit = int(self.sampling_rate * bit_duration)
-        total_samples = samples_per_bit * len(binary_data)
+        total_samples = samples_per_bit * bits.size
         
         t = np.linspace(0, total_duration, total_samples)
-        fsk_signal = np.zeros(total_samples)
-        frequency_trace = np.zeros(total_samples)
-        
-        for i, bit in enumerate(binary_data):
-            start_idx = i * samples_per_bit
-            end_idx = (i + 1) * samples_per_bit
-            t_bit = t[start_idx:end_idx]
-            
-            if bit == '1':
-                fsk_signal[start_idx:end_idx] = np.cos(2 * np.pi * freq_1 * t_bit)
-                frequency_trace[start_idx:end_idx] = freq_1
-            else:
-                fsk_signal[start_idx:end_idx] = np.cos(2 * np.pi * freq_0 * t_bit)
-                frequency_trace[start_idx:end_idx] = freq_0
+        # 逐采样频率轨迹，一次完成整段FSK信号合成（相位由 float64 时间轴计算）
+        frequency_trace = fsk_frequency_track(bits, freq_0, freq_1, samples_per_bit)
+        fsk_signal = render_fsk(t, frequency_trace, self.dtype)
         
         return {
-            'time': t.tolist(),
-            'fsk_signal': fsk_signal.tolist(),
-            'frequency_trace': frequency_trace.tolist(),
+            'time': t.astype(self.dtype, copy=False),
+            'fsk_signal': fsk_signal,
+            'frequency_trace': frequency_trace,
             'binary_data': binary_data,
             'freq_0': freq_0,
             'freq_1': freq_1,
@@ -346,87 +462,171 @@ class RFSignalProcessor:
             'type': 'FSK'
         }
     
+    @metrics.instrumented
     def psk_modulation(self, baseband_signal: List[float], carrier_freq: float, 
                       time: List[float]) -> Dict:
         """相移键控调制 (PSK)"""
-        t = np.array(time)
-        baseband = np.array(baseband_signal)
+        t = np.asarray(time, dtype=self.dtype)
+        baseband = np.asarray(baseband_signal, dtype=self.dtype)
         
         # PSK: 载波相位根据数字信号变化
-        carrier = np.cos(2 * np.pi * carrier_freq * t)
+        carrier = self.carrier(carrier_freq, t)
         # 基带信号为1时相位为0，为-1时相位为π
         psk_signal = baseband * carrier
         
         return {
             'time': time,
-            'psk_signal': psk_signal.tolist(),
-            'carrier': carrier.tolist(),
+            'psk_signal': psk_signal,
+            'carrier': carrier,
             'baseband': baseband_signal,
             'carrier_freq': carrier_freq,
             'type': 'PSK'
         }
     
-    def add_noise(self, signal: List[float], snr_db: float = 20) -> List[float]:
-        """向信号添加高斯白噪声"""
-        signal_array = np.array(signal)
-        signal_power = np.mean(signal_array ** 2)
+    @metrics.instrumented
+    def add_noise(self, signal: List[float], snr_db: float = 20, rng=None,
+                  signal_power=None) -> np.ndarray:
+        """向信号添加高斯白噪声
+
+        支持 (trials, samples) 批量输入，每一行按自身功率计算噪声；
+        rng 可传入 np.random.Generator 以获得可复现/相互独立的噪声流。
+        signal_power 给定时以该功率为SNR参考（衰落信道中使用发射信号功率）。
+        """
+        rng = np.random if rng is None else rng
+        signal_array = np.asarray(signal, dtype=self.dtype)
+        if signal_power is None:
+            signal_power = np.mean(signal_array ** 2, axis=-1, keepdims=True, dtype=np.float64)
         noise_power = signal_power / (10 ** (snr_db / 10))
-        noise = np.random.normal(0, np.sqrt(noise_power), len(signal_array))
+        noise_std = np.asarray(np.sqrt(noise_power), dtype=self.dtype)
+        if isinstance(rng, np.random.Generator):
+            # Generator 可直接生成 float32 正态样本，不产生 float64 中间数组
+            noise = rng.standard_normal(signal_array.shape, dtype=self.dtype)
+        else:
+            noise = rng.standard_normal(signal_array.shape).astype(self.dtype, copy=False)
+        noise *= noise_std
         noisy_signal = signal_array + noise
-        return noisy_signal.tolist()
+        return noisy_signal
     
+    @metrics.instrumented
+    def apply_channel(self, signal: List[float], snr_db: float = 20, fading_type: str = 'none',
+                      profile: str = 'flat', doppler_hz: float = 0.0, k_factor: float = 4.0,
+                      delay_scale: float = 1.0, delays: List[float] = None,
+                      gains_db: List[float] = None, rng=None) -> Dict:
+        """信道仿真：多径衰落（瑞利/莱斯，抽头延迟线 + Jakes 多普勒）后叠加高斯白噪声
+
+        SNR 以发射信号的平均功率为参考，因此深衰落时接收SNR会相应下降。
+        """
+        signal_array = np.asarray(signal, dtype=self.dtype)
+        channel_rng = np.random.default_rng() if rng is None else rng
+        faded = apply_fading(signal_array, self.sampling_rate, fading_type, profile, doppler_hz,
+                             k_factor, delay_scale, delays, gains_db, channel_rng)
+        transmit_power = np.mean(signal_array ** 2, axis=-1, keepdims=True, dtype=np.float64)
+        noisy_signal = self.add_noise(faded['faded'], snr_db, rng, signal_power=transmit_power)
+        
+        return {
+            'noisy_signal': noisy_signal,
+            'faded_signal': faded['faded'],
+            'fading_envelope': faded['envelope'],
+            'tap_delays': faded['delays'],
+            'tap_powers': faded['powers'],
+            'fading_type': fading_type,
+            'profile': profile,
+            'doppler_hz': doppler_hz
+        }
+    
+    @metrics.instrumented
+    def ask_decisions(self, filtered: np.ndarray, bit_rate: float,
+                      threshold: float = 0.5) -> np.ndarray:
+        """在每个比特中点对滤波后的包络采样判决，返回 uint8 比特数组（支持批量）"""
+        bit_duration = 1.0 / bit_rate
+        samples_per_bit = int(self.sampling_rate * bit_duration)
+        
+        sample_idx = np.arange(0, filtered.shape[-1], samples_per_bit) + samples_per_bit // 2
+        sample_idx = sample_idx[sample_idx < filtered.shape[-1]]
+        return (filtered[..., sample_idx] > threshold).astype(np.uint8)
+    
+    @metrics.instrumented
     def ask_demodulation(self, ask_signal: List[float], time: List[float], 
                         carrier_freq: float, bit_rate: float) -> Dict:
         """ASK解调"""
-        signal = np.array(ask_signal)
-        t = np.array(time)
+        signal = np.asarray(ask_signal, dtype=self.dtype)
         
         # 包络检波
         envelope = np.abs(signal)
         
-        # 低通滤波（简单的移动平均）
+        # 低通滤波（简单的移动平均，累积和实现，支持批量）
         window_size = max(1, int(self.sampling_rate / (5 * bit_rate)))
-        filtered = np.convolve(envelope, np.ones(window_size)/window_size, mode='same')
+        filtered = moving_average(envelope, window_size)
         
         # 采样判决
-        bit_duration = 1.0 / bit_rate
-        samples_per_bit = int(self.sampling_rate * bit_duration)
-        
-        recovered_bits = []
-        for i in range(0, len(filtered), samples_per_bit):
-            if i + samples_per_bit//2 < len(filtered):
-                sample_value = filtered[i + samples_per_bit//2]
-                threshold = 0.5  # 判决门限
-                recovered_bits.append('1' if sample_value > threshold else '0')
-        
-        recovered_binary = ''.join(recovered_bits)
+        recovered_bits = self.ask_decisions(filtered, bit_rate)
+        recovered_binary = bits_to_string(recovered_bits) if recovered_bits.ndim == 1 else recovered_bits
         
         return {
-            'envelope': envelope.tolist(),
-            'filtered': filtered.tolist(),
+            'envelope': envelope,
+            'filtered': filtered,
             'recovered_binary': recovered_binary,
             'type': 'ASK_demodulation'
         }
     
-    def calculate_ber(self, original_bits: str, recovered_bits: str) -> float:
-        """计算误码率 (BER)"""
-        min_length = min(len(original_bits), len(recovered_bits))
+    @metrics.instrumented
+    def coherent_demodulation(self, signal: List[float], time: List[float],
+                              carrier_freq: float, bit_rate: float,
+                              modulation_type: str = 'ASK', freq_0: float = None,
+                              freq_1: float = None, include_waveform: bool = True,
+                              as_string: bool = True) -> Dict:
+        """相干相关解调 (ASK / FSK / PSK)
+
+        按比特周期重排为 (比特数, 每比特采样数) 矩阵，与本地参考载波一次相关判决；
+        FSK 默认使用 fc±20Hz 两路参考。支持 (trials, samples) 批量输入，
+        此时 recovered_binary 为 (trials, bits) 比特数组。
+        as_string=False 时单路结果同样保持为比特数组（供内部流水线使用）。
+        """
+        samples_per_bit = int(self.sampling_rate / bit_rate)
+        signal = np.asarray(signal, dtype=self.dtype)
+        demodulated = coherent_demodulate(signal, time, modulation_type, carrier_freq,
+                                          samples_per_bit, freq_0, freq_1, include_waveform)
+        bits = demodulated.pop('bits')
+        
+        result = {
+            'decision_statistics': demodulated['statistics'],
+            'recovered_binary': bits_to_string(bits) if as_string and bits.ndim == 1 else bits,
+            'receiver': 'coherent',
+            'type': f'{modulation_type}_demodulation'
+        }
+        if include_waveform:
+            result['filtered'] = demodulated['filtered']
+        return result
+    
+    @metrics.instrumented
+    def calculate_ber(self, original_bits, recovered_bits):
+        """计算误码率 (BER)
+
+        接受 '0'/'1' 字符串或比特数组；批量 (trials, bits) 输入时返回逐行误码率数组。
+        """
+        original = bits_to_array(original_bits)
+        recovered = bits_to_array(recovered_bits)
+        min_length = min(original.shape[-1], recovered.shape[-1])
         if min_length == 0:
             return 1.0
         
-        errors = sum(1 for i in range(min_length) 
-                    if original_bits[i] != recovered_bits[i])
-        return errors / min_length
+        errors = np.count_nonzero(original[..., :min_length] != recovered[..., :min_length],
+                                  axis=-1)
+        ber = errors / min_length
+        return float(ber) if np.ndim(ber) == 0 else ber
     
+    @metrics.instrumented
     def simulate_complete_transmission(self, text: str, carrier_freq: float = 100, 
                                      bit_rate: float = 10, snr_db: float = 20, 
                                      modulation_type: str = 'ASK') -> Dict:
         """完整的数字通信系统仿真"""
-        # 步骤1: 文本转二进制
-        binary_data = self.text_to_binary(text)
+        # 步骤1: 文本转比特数组（UTF-8，一次向量化展开；字符串形式只在返回结果中生成）
+        bits = text_to_bits(text)
+        binary_data = bits_to_string(bits)
         
         # 步骤2: 生成数字基带信号
-        baseband = self.generate_digital_baseband(binary_data, bit_rate, 'NRZ')
+        baseband = self.generate_digital_baseband(bits, bit_rate, 'NRZ')
+        baseband['binary_data'] = binary_data
         
         # 步骤3: 数字调制
         if modulation_type == 'ASK':
@@ -435,7 +635,7 @@ class RFSignalProcessor:
         elif modulation_type == 'FSK':
             freq_0 = carrier_freq - 20
             freq_1 = carrier_freq + 20
-            modulated = self.fsk_modulation(binary_data, freq_0, freq_1, bit_rate)
+            modulated = self.fsk_modulation(bits, freq_0, freq_1, bit_rate)
             modulated_signal = modulated['fsk_signal']
             baseband['time'] = modulated['time']  # 更新时间轴
         else:  # PSK
@@ -445,22 +645,17 @@ class RFSignalProcessor:
         # 步骤4: 信道传输（添加噪声）
         received_signal = self.add_noise(modulated_signal, snr_db)
         
-        # 步骤5: 解调（这里简化为ASK解调）
-        if modulation_type == 'ASK':
-            demodulated = self.ask_demodulation(received_signal, baseband['time'], 
-                                              carrier_freq, bit_rate)
-            recovered_binary = demodulated['recovered_binary']
-        else:
-            # 简化的解调过程
-            demodulated = self.ask_demodulation(received_signal, baseband['time'], 
-                                              carrier_freq, bit_rate)
-            recovered_binary = demodulated['recovered_binary']
+        # 步骤5: 相干解调（按调制方式选择参考载波）
+        demodulated = self.coherent_demodulation(received_signal, baseband['time'],
+                                                 carrier_freq, bit_rate, modulation_type,
+                                                 include_waveform=False, as_string=False)
+        recovered_bits = demodulated['recovered_binary']
         
-        # 步骤6: 二进制转文本
-        recovered_text = self.binary_to_text(recovered_binary)
+        # 步骤6: 比特数组转文本
+        recovered_text = self.binary_to_text(recovered_bits)
         
         # 步骤7: 计算误码率
-        ber = self.calculate_ber(binary_data, recovered_binary)
+        ber = self.calculate_ber(bits, recovered_bits)
         
         return {
             'original_text': text,
@@ -468,7 +663,7 @@ class RFSignalProcessor:
             'baseband': baseband,
             'modulated_signal': modulated_signal,
             'received_signal': received_signal,
-            'recovered_binary': recovered_binary,
+            'recovered_binary': bits_to_string(recovered_bits),
             'recovered_text': recovered_text,
             'ber': ber,
             'parameters': {
@@ -478,8 +673,258 @@ class RFSignalProcessor:
                 'modulation_type': modulation_type
             }
         }
-# 全局信号处理器实例
-rf_processor = RFSignalProcessor()
+    
+    @metrics.instrumented
+    def iq_modulation(self, binary_data: BitsLike, scheme: str = 'QPSK',
+                      symbol_rate: float = 10,
+                      samples_per_symbol: int = iq.DEFAULT_SAMPLES_PER_SYMBOL,
+                      pulse_shape: str = 'rect', rolloff: float = DEFAULT_ROLLOFF,
+                      span: int = DEFAULT_SPAN) -> Dict:
+        """复基带调制：星座查表映射 + 脉冲成形（矩形 / RC / RRC），输出 complex_dtype 的 IQ 采样
+
+        采样率为 symbol_rate × samples_per_symbol，与载波频率无关；支持 (trials, bits) 批量输入。
+        RC / RRC 成形时首尾各有 span/2 个保护符号的脉冲拖尾。
+        """
+        scheme = iq.resolve_scheme(scheme)
+        pulse_shape = resolve_shape(pulse_shape)
+        samples_per_symbol = iq.check_samples_per_symbol(samples_per_symbol)
+        bits = bits_to_array(binary_data)
+        symbols = iq.map_bits(bits, scheme, self.complex_dtype)
+        
+        return {
+            'symbols': symbols,
+            'iq': filter_bank(pulse_shape, rolloff, span,
+                              samples_per_symbol).interpolate(symbols, guard=True),
+            'num_bits': bits.shape[-1],
+            'scheme': scheme,
+            'bits_per_symbol': iq.bits_per_symbol(scheme),
+            'symbol_rate': symbol_rate,
+            'samples_per_symbol': samples_per_symbol,
+            'sample_rate': symbol_rate * samples_per_symbol,
+            'pulse_shape': pulse_shape,
+            'type': 'IQ'
+        }
+    
+    def add_iq_noise(self, iq_signal, snr_db: float = 10,
+                     samples_per_symbol: int = iq.DEFAULT_SAMPLES_PER_SYMBOL,
+                     rng=None) -> np.ndarray:
+        """向复基带信号添加复高斯白噪声，snr_db 为符号信噪比 Es/N0
+
+        符号能量为单采样平均功率 × samples_per_symbol，噪声功率在 I、Q 两路平均分配；
+        支持 (trials, samples) 批量输入，每一行按自身功率计算噪声。
+        """
+        rng = np.random if rng is None else rng
+        signal = np.asarray(iq_signal, dtype=self.complex_dtype)
+        signal_power = np.mean(signal.real ** 2 + signal.imag ** 2, axis=-1, keepdims=True,
+                               dtype=np.float64)
+        noise_power = signal_power * samples_per_symbol / (10 ** (snr_db / 10))
+        noise_std = np.asarray(np.sqrt(noise_power / 2), dtype=self.dtype)[..., None]
+        shape = signal.shape + (2,)
+        if isinstance(rng, np.random.Generator):
+            noise = rng.standard_normal(shape, dtype=self.dtype)
+        else:
+            noise = rng.standard_normal(shape).astype(self.dtype, copy=False)
+        noise *= noise_std
+        # (..., samples, 2) 的实数对按内存布局直接视为复数
+        return signal + noise.view(self.complex_dtype)[..., 0]
+    
+    @metrics.instrumented
+    def iq_demodulation(self, iq_signal, scheme: str = 'QPSK',
+                        samples_per_symbol: int = iq.DEFAULT_SAMPLES_PER_SYMBOL,
+                        num_bits: int = None, as_string: bool = True,
+                        pulse_shape: str = 'rect', rolloff: float = DEFAULT_ROLLOFF,
+                        span: int = DEFAULT_SPAN) -> Dict:
+        """复基带解调：匹配滤波后在符号时刻抽取，I/Q 两路独立 PAM 判决后查表得到比特
+
+        矩形脉冲为积分清洗，RRC 为匹配的根升余弦滤波；pulse_shape 等参数应与调制端一致。
+        num_bits 给定时截去调制时补齐的比特；批量输入时 recovered_binary 为 (trials, bits) 比特数组。
+        """
+        scheme = iq.resolve_scheme(scheme)
+        samples_per_symbol = iq.check_samples_per_symbol(samples_per_symbol)
+        signal = np.asarray(iq_signal, dtype=self.complex_dtype)
+        symbols = filter_bank(pulse_shape, rolloff, span,
+                              samples_per_symbol).decimate(signal, guard=True)
+        bits = iq.detect_symbols(symbols, scheme)
+        if num_bits is not None:
+            bits = bits[..., :num_bits]
+        
+        return {
+            'symbols': symbols,
+            'recovered_binary': bits_to_string(bits) if as_string and bits.ndim == 1 else bits,
+            'scheme': scheme,
+            'type': f'{scheme}_demodulation'
+        }
+    
+    @metrics.instrumented
+    def iq_passband(self, iq_signal, carrier_freq: float, sample_rate: float,
+                    duration: float = None) -> Dict:
+        """仅用于显示的通带波形 Re{s(t)·e^{j2πf_c·t}}
+
+        以处理器采样率对 IQ 采样做零阶保持后上变频；duration 限制显示的时长（默认整段）。
+        """
+        iq_signal = np.asarray(iq_signal)
+        total = iq_signal.shape[-1] / sample_rate
+        duration = total if duration is None else min(float(duration), total)
+        count = min(int(duration * self.sampling_rate), MAX_PASSBAND_SAMPLES)
+        t = np.arange(count) / self.sampling_rate
+        held = iq_signal[np.minimum((t * sample_rate).astype(np.intp), iq_signal.shape[-1] - 1)]
+        # cos(x - π/2) = sin(x)
+        passband = (held.real * self.carrier(carrier_freq, t)
+                    - held.imag * self.carrier(carrier_freq, t, -np.pi / 2))
+        
+        return {
+            'time': t.astype(self.dtype, copy=False),
+            'passband_signal': passband,
+            'carrier_freq': carrier_freq,
+            'type': 'IQ_passband'
+        }
+    
+    @metrics.instrumented
+    def simulate_iq_transmission(self, text: str, scheme: str = 'QPSK',
+                                 symbol_rate: float = 10, snr_db: float = 10,
+                                 samples_per_symbol: int = iq.DEFAULT_SAMPLES_PER_SYMBOL,
+                                 carrier_freq: float = 100,
+                                 passband_duration: float = 0, pulse_shape: str = 'rect',
+                                 rolloff: float = DEFAULT_ROLLOFF,
+                                 span: int = DEFAULT_SPAN) -> Dict:
+        """复基带模式的完整数字通信系统仿真（snr_db 为 Es/N0）
+
+        链路全程处理复基带采样，载波只在 passband_duration > 0 时为显示而施加。
+        """
+        # 步骤1: 文本转比特数组
+        bits = text_to_bits(text)
+        
+        # 步骤2: 星座映射与脉冲成形
+        modulated = self.iq_modulation(bits, scheme, symbol_rate, samples_per_symbol,
+                                       pulse_shape, rolloff, span)
+        scheme = modulated['scheme']
+        samples_per_symbol = modulated['samples_per_symbol']
+        
+        # 步骤3: 复高斯白噪声信道
+        received = self.add_iq_noise(modulated['iq'], snr_db, samples_per_symbol)
+        
+        # 步骤4: 积分清洗与判决
+        demodulated = self.iq_demodulation(received, scheme, samples_per_symbol, bits.size,
+                                           as_string=False, pulse_shape=pulse_shape,
+                                           rolloff=rolloff, span=span)
+        recovered_bits = demodulated['recovered_binary']
+        
+        result = {
+            'original_text': text,
+            'binary_data': bits_to_string(bits),
+            'symbols': modulated['symbols'],
+            'iq_signal': modulated['iq'],
+            'received_iq': received,
+            'received_symbols': demodulated['symbols'],
+            'constellation': iq.constellation(scheme, self.complex_dtype),
+            'recovered_binary': bits_to_string(recovered_bits),
+            'recovered_text': self.binary_to_text(recovered_bits),
+            'ber': self.calculate_ber(bits, recovered_bits),
+            'parameters': {
+                'scheme': scheme,
+                'bits_per_symbol': modulated['bits_per_symbol'],
+                'symbol_rate': symbol_rate,
+                'samples_per_symbol': samples_per_symbol,
+                'sample_rate': modulated['sample_rate'],
+                'pulse_shape': pulse_shape,
+                'snr_db': snr_db,
+                'eb_n0_db': float(snr_db - 10 * np.log10(modulated['bits_per_symbol'])),
+                'carrier_freq': carrier_freq
+            }
+        }
+        if passband_duration > 0:
+            result['passband'] = self.iq_passband(modulated['iq'], carrier_freq,
+                                                  modulated['sample_rate'], passband_duration)
+        return result
+
+# 全局信号处理器实例（精度由 RFVISION_PRECISION 指定）
+rf_processor = RFSignalProcessor.from_env()
+
+# 服务端信号存储（流水线各步骤之间以 signal_id 传递信号）
+signal_store = SignalStore.from_env()
+
+# 重计算路由的有界执行器（并发上限、排队背压、超时）
+compute_executor = ComputeExecutor.from_env()
+heavy_route = offload(compute_executor)
+
+# 请求埋点与 /metrics
+metrics.init_app(app)
+metrics.REGISTRY.register_gauges('executor', compute_executor.stats)
+metrics.REGISTRY.register_gauges('signal_store', signal_store.stats)
+metrics.REGISTRY.register_gauges('waveform_memo', rf_processor.waveforms.stats)
+metrics.REGISTRY.register_gauges('filter_banks', pulse_shaping.cache_stats)
+
+# 响应压缩（br / gzip 协商、流式压缩）与预压缩静态资源
+response_compression = ResponseCompression.from_env()
+response_compression.init_app(app)
+metrics.REGISTRY.register_gauges('compression', response_compression.stats)
+
+# 确定性路由的响应缓存（ETag / 304 / Cache-Control）
+response_cache = ResponseCache.from_env()
+cached_route = cached(response_cache, signal_store.__contains__)
+metrics.REGISTRY.register_gauges('cache', response_cache.stats)
+
+# 波形归档（.npy + 元数据，内存映射读取）
+waveform_archive = WaveformArchive.from_env()
+
+# 覆盖网格分块缓存
+coverage_tiles = TileCache.from_env()
+metrics.REGISTRY.register_gauges('coverage_tiles', coverage_tiles.stats)
+
+# 天线阵列方向图缓存
+array_patterns = PatternCache.from_env()
+metrics.REGISTRY.register_gauges('array_patterns', array_patterns.stats)
+
+# 相位连续的实时波形流（SSE）
+waveform_streams = WaveformStreams.from_env()
+metrics.REGISTRY.register_gauges('waveform_streams', waveform_streams.stats)
+
+
+def store_signal(signal, time=None, stable_key: Tuple = None, **meta) -> str:
+    """保存信号并登记到当前响应，返回 signal_id
+
+    stable_key 给出生成参数时使用确定性ID，使相同参数的响应体（及ETag）保持一致。
+    """
+    signal_id = None
+    if stable_key is not None:
+        signal_id = SignalStore.stable_id(rf_processor.sampling_rate,
+                                          rf_processor.time_duration, *stable_key)
+    signal_id = signal_store.put(signal, time, signal_id=signal_id, **meta)
+    record_signal_id(signal_id)
+    return signal_id
+
+
+def resolve_signal(data: Dict) -> Tuple[np.ndarray, np.ndarray, Dict]:
+    """从请求中取得信号：优先使用 signal_id 引用的存储信号，其次使用上传的数组
+
+    返回 (signal, time, meta)；time 与 meta 在上传模式下可能为空。
+    """
+    signal_id = data.get('signal_id')
+    if signal_id:
+        entry = signal_store.get(signal_id)
+        return entry['signal'], entry['time'], entry['meta']
+    signal = data.get('signal', [])
+    time = data.get('time')
+    return (np.asarray(signal, dtype=float),
+            None if time is None else np.asarray(time, dtype=float), {})
+
+
+def pulse_shaping_args(data: Dict) -> Dict:
+    """从请求中读取脉冲成形参数（pulse_shape / rolloff / span）"""
+    return {
+        'pulse_shape': data.get('pulse_shape', 'rect'),
+        'rolloff': float(data.get('rolloff', DEFAULT_ROLLOFF)),
+        'span': int(data.get('span', DEFAULT_SPAN)),
+    }
+
+
+def spectrum_window(value) -> str:
+    """校验请求中的窗函数名称（缺省为矩形窗），不支持的名称抛出 ValueError"""
+    window = 'rectangular' if value in (None, '') else str(value).lower()
+    if window not in spectrum.WINDOWS:
+        raise ValueError(f'Unsupported window: {value} (expected one of '
+                         f'{", ".join(spectrum.WINDOWS)})')
+    return window
 
 @app.route('/')
 def index():
@@ -507,65 +952,141 @@ def digital():
     return render_template('digital.html')
 
 @app.route('/api/generate_carrier')
+@cached_route
+@heavy_route
 def api_generate_carrier():
     """API: 生成载波信号"""
-    frequency = float(request.args.get('frequency', 10))
-    amplitude = float(request.args.get('amplitude', 1.0))
+    try:
+        window = spectrum_window(request.args.get('window'))
+        frequency = float(request.args.get('frequency', 10))
+        amplitude = float(request.args.get('amplitude', 1.0))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     carrier_data = rf_processor.generate_carrier_wave(frequency, amplitude)
-    spectrum_data = rf_processor.get_spectrum(carrier_data['amplitude'])
+    spectrum_data = rf_processor.get_spectrum(carrier_data['amplitude'], window)
+    
+    signal_id = store_signal(carrier_data['amplitude'], carrier_data['time'],
+                             stable_key=('carrier', frequency, amplitude),
+                             sampling_rate=rf_processor.sampling_rate, source='carrier')
     
-    return jsonify({
+    return signal_response({
         'carrier': carrier_data,
-        'spectrum': spectrum_data
+        'spectrum': spectrum_data,
+        'signal_id': signal_id
     })
 
 @app.route('/api/generate_am')
+@cached_route
+@heavy_route
 def api_generate_am():
     """API: 生成AM调制信号"""
-    carrier_freq = float(request.args.get('carrier_freq', 50))
-    mod_freq = float(request.args.get('mod_freq', 5))
-    mod_depth = float(request.args.get('mod_depth', 0.5))
+    try:
+        window = spectrum_window(request.args.get('window'))
+        carrier_freq = float(request.args.get('carrier_freq', 50))
+        mod_freq = float(request.args.get('mod_freq', 5))
+        mod_depth = float(request.args.get('mod_depth', 0.5))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     am_data = rf_processor.amplitude_modulation(carrier_freq, mod_freq, mod_depth)
-    spectrum_data = rf_processor.get_spectrum(am_data['am_signal'])
+    spectrum_data = rf_processor.get_spectrum(am_data['am_signal'], window)
+    
+    signal_id = store_signal(am_data['am_signal'], am_data['time'],
+                             stable_key=('AM', carrier_freq, mod_freq, mod_depth),
+                             sampling_rate=rf_processor.sampling_rate, source='AM')
     
-    return jsonify({
+    return signal_response({
         'am': am_data,
-        'spectrum': spectrum_data
+        'spectrum': spectrum_data,
+        'signal_id': signal_id
     })
 
 @app.route('/api/generate_fm')
+@cached_route
+@heavy_route
 def api_generate_fm():
     """API: 生成FM调制信号"""
-    carrier_freq = float(request.args.get('carrier_freq', 50))
-    mod_freq = float(request.args.get('mod_freq', 5))
-    freq_dev = float(request.args.get('freq_dev', 10))
+    try:
+        window = spectrum_window(request.args.get('window'))
+        carrier_freq = float(request.args.get('carrier_freq', 50))
+        mod_freq = float(request.args.get('mod_freq', 5))
+        freq_dev = float(request.args.get('freq_dev', 10))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     fm_data = rf_processor.frequency_modulation(carrier_freq, mod_freq, freq_dev)
-    spectrum_data = rf_processor.get_spectrum(fm_data['fm_signal'])
+    spectrum_data = rf_processor.get_spectrum(fm_data['fm_signal'], window)
+    
+    signal_id = store_signal(fm_data['fm_signal'], fm_data['time'],
+                             stable_key=('FM', carrier_freq, mod_freq, freq_dev),
+                             sampling_rate=rf_processor.sampling_rate, source='FM')
     
-    return jsonify({
+    return signal_response({
         'fm': fm_data,
-        'spectrum': spectrum_data
+        'spectrum': spectrum_data,
+        'signal_id': signal_id
     })
 
 @app.route('/api/generate_pm')
+@cached_route
+@heavy_route
 def api_generate_pm():
     """API: 生成PM调制信号"""
-    carrier_freq = float(request.args.get('carrier_freq', 50))
-    mod_freq = float(request.args.get('mod_freq', 5))
-    phase_dev = float(request.args.get('phase_dev', np.pi/4))
+    try:
+        window = spectrum_window(request.args.get('window'))
+        carrier_freq = float(request.args.get('carrier_freq', 50))
+        mod_freq = float(request.args.get('mod_freq', 5))
+        phase_dev = float(request.args.get('phase_dev', np.pi/4))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     pm_data = rf_processor.phase_modulation(carrier_freq, mod_freq, phase_dev)
-    spectrum_data = rf_processor.get_spectrum(pm_data['pm_signal'])
+    spectrum_data = rf_processor.get_spectrum(pm_data['pm_signal'], window)
     
-    return jsonify({
+    signal_id = store_signal(pm_data['pm_signal'], pm_data['time'],
+                             stable_key=('PM', carrier_freq, mod_freq, phase_dev),
+                             sampling_rate=rf_processor.sampling_rate, source='PM')
+    
+    return signal_response({
         'pm': pm_data,
-        'spectrum': spectrum_data
+        'spectrum': spectrum_data,
+        'signal_id': signal_id
     })
 
+@app.route('/api/batch', methods=['POST'])
+@heavy_route
+def api_batch():
+    """API: 批量参数扫描 - 一次请求返回一组曲线及其批量频谱
+
+    请求示例: {"modulation_type": "AM", "carrier_freq": 50, "mod_freq": 5,
+               "mod_depth": [0.1, 0.2, 0.5, 0.9], "window": "hann"}
+    """
+    try:
+        data = request.json or {}
+        modulation_type = str(data.get('modulation_type', 'AM')).upper()
+        if modulation_type not in SWEEP_PARAMETERS:
+            return jsonify({'error': 'Unsupported modulation type'}), 400
+        parameter_name = SWEEP_PARAMETERS[modulation_type]
+        
+        sweep = rf_processor.modulation_sweep(
+            modulation_type,
+            data.get('carrier_freq', 50),
+            data.get('mod_freq', 5),
+            data.get(parameter_name, SWEEP_DEFAULTS[modulation_type]) if parameter_name else 0.0,
+            data.get('amplitude', 1.0))
+        
+        result = {'sweep': sweep}
+        if data.get('include_spectrum', True):
+            # 一次 rfft 完成所有曲线的频谱
+            result['spectrum'] = rf_processor.get_spectrum(sweep['signals'],
+                                                           spectrum_window(data.get('window')))
+        return signal_response(result)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
 @app.route('/api/simulate_transmission', methods=['POST'])
+@heavy_route
 def api_simulate_transmission():
     """API: 仿真完整的信号传输过程"""
     data = request.json
@@ -577,9 +1098,10 @@ def api_simulate_transmission():
     
     result = rf_processor.simulate_complete_transmission(message, modulation_type, carrier_freq, snr_db)
     
-    return jsonify(result)
+    return signal_response(result)
 
 @app.route('/api/complete-transmission', methods=['POST'])
+@heavy_route
 def complete_transmission():
     """完整的数字通信系统仿真"""
     try:
@@ -593,12 +1115,259 @@ def complete_transmission():
         result = rf_processor.simulate_complete_transmission(
             text, carrier_freq, bit_rate, snr_db, modulation_type
         )
+        result['signal_id'] = signal_store.put(
+            result['received_signal'], result['baseband']['time'],
+            sampling_rate=rf_processor.sampling_rate, source='received',
+            carrier_freq=carrier_freq, bit_rate=bit_rate, modulation_type=modulation_type,
+            binary_data=result['binary_data'])
+        
+        return signal_response(result)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/complete-transmission/stream', methods=['POST'])
+def complete_transmission_stream():
+    """分帧流式的数字通信系统仿真 (NDJSON)"""
+    try:
+        data = request.json or {}
+        text = data.get('text', 'Hello')
+        carrier_freq = float(data.get('carrier_freq', 100))
+        bit_rate = float(data.get('bit_rate', 10))
+        snr_db = float(data.get('snr_db', 20))
+        modulation_type = data.get('modulation_type', 'ASK')
+        frame_bits = int(data.get('frame_bits', 256))
+        include_signals = bool(data.get('include_signals', False))
+        
+        frames = transmission_frames(rf_processor, text, carrier_freq, bit_rate, snr_db,
+                                     modulation_type, frame_bits, include_signals)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+    
+    response = Response(stream_with_context(ndjson_lines(frames)), mimetype=NDJSON_MIMETYPE)
+    response.headers['X-Accel-Buffering'] = 'no'  # 禁止反向代理缓冲
+    return response
+
+@app.route('/api/iq-transmission', methods=['POST'])
+@heavy_route
+def iq_transmission():
+    """复基带模式的数字通信系统仿真（BPSK / QPSK / 16-QAM / 64-QAM，snr_db 为 Es/N0）"""
+    try:
+        data = request.json or {}
+        text = data.get('text', 'Hello')
+        scheme = data.get('scheme', 'QPSK')
+        symbol_rate = float(data.get('symbol_rate', 10))
+        snr_db = float(data.get('snr_db', 10))
+        samples_per_symbol = int(data.get('samples_per_symbol', iq.DEFAULT_SAMPLES_PER_SYMBOL))
+        carrier_freq = float(data.get('carrier_freq', 100))
+        passband_duration = float(data.get('passband_duration', 0))
+        max_symbols = int(data.get('max_symbols', IQ_DISPLAY_SYMBOLS))
+        
+        result = rf_processor.simulate_iq_transmission(
+            text, scheme, symbol_rate, snr_db, samples_per_symbol, carrier_freq, passband_duration,
+            **pulse_shaping_args(data)
+        )
+        
+        # 星座图与IQ波形只返回前 max_symbols 个符号，复数组拆为 I/Q 两路
+        parameters = result['parameters']
+        shown = max(0, max_symbols) * parameters['samples_per_symbol']
+        time_axis = (np.arange(min(shown, result['iq_signal'].size))
+                     / parameters['sample_rate']).astype(rf_processor.dtype)
+        for key in ('symbols', 'received_symbols'):
+            result[key] = iq.split_iq(result[key][:max_symbols])
+        for key in ('iq_signal', 'received_iq'):
+            result[key] = {'time': time_axis, **iq.split_iq(result[key][:shown])}
+        result['constellation'] = iq.split_iq(result['constellation'])
+        
+        return signal_response(result)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/constellation')
+@cached_route
+def api_constellation():
+    """星座查找表（复符号与对应的比特标签）"""
+    try:
+        scheme = iq.resolve_scheme(request.args.get('scheme', 'QPSK'))
+        k = iq.bits_per_symbol(scheme)
+        points = iq.constellation(scheme)
+        return signal_response({
+            'scheme': scheme,
+            'bits_per_symbol': k,
+            'points': iq.split_iq(points),
+            'labels': [format(label, f'0{k}b') for label in range(points.size)]
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/waveform-stream')
+def waveform_stream():
+    """实时波形流 (SSE)：逐帧推送相位连续的载波/AM/FM/PM采样块
+
+    查询参数: type, frame_size, interval（秒，默认为一帧的实时时长）, frames（0表示不限），
+    以及 carrier_freq / mod_freq / mod_depth / freq_dev / phase_dev / amplitude。
+    首个 session 事件携带 stream_id，用于中途更新参数。
+    长连接只做轻量计算，不占用计算执行器的名额。
+    """
+    try:
+        args = request.args.to_dict()
+        waveform_type = args.pop('type', 'CARRIER')
+        frame_size = int(args.pop('frame_size', 256))
+        max_frames = max(0, int(args.pop('frames', 0)))
+        interval = min(MAX_INTERVAL, max(MIN_INTERVAL, float(
+            args.pop('interval', frame_size / rf_processor.sampling_rate))))
+        oscillator = PhaseOscillator(waveform_type, rf_processor.sampling_rate, frame_size, **args)
+        stream_id = waveform_streams.open(oscillator)
+    except TooManyStreams:
+        response = jsonify({'error': 'Too many active waveform streams'})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(waveform_streams.retry_after)
+        return response
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    response = Response(stream_with_context(sse_frames(waveform_streams, stream_id, interval,
+                                                       max_frames)),
+                        mimetype=SSE_MIMETYPE)
+    # 生成器未被迭代（HEAD 请求、响应未被读取）时 finally 不会执行，由响应关闭时注销
+    response.call_on_close(lambda: waveform_streams.close(stream_id))
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # 禁止反向代理缓冲
+    return response
+
+@app.route('/api/waveform-stream/<stream_id>', methods=['POST', 'DELETE'])
+def waveform_stream_control(stream_id):
+    """更新（POST）或结束（DELETE）一个活动的波形流"""
+    try:
+        oscillator = waveform_streams.get(stream_id)
+        if request.method == 'DELETE':
+            waveform_streams.close(stream_id)
+            return jsonify({'stream_id': stream_id, 'closed': True})
+        parameters = oscillator.update(**(request.json or {}))
+        return signal_response({'stream_id': stream_id, 'parameters': parameters})
+    except KeyError:
+        return jsonify({'error': 'Unknown or finished stream_id'}), 404
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/ber-curve', methods=['POST'])
+@heavy_route
+def api_ber_curve():
+    """蒙特卡洛 BER-SNR 曲线"""
+    try:
+        data = request.json or {}
+        snr_list = data.get('snr_db', list(range(0, 21, 2)))
+        trials = data.get('trials', 20)
+        modulation_types = data.get('modulation_types', ['ASK', 'FSK', 'PSK'])
+        num_bits = int(data.get('num_bits', 200))
+        carrier_freq = float(data.get('carrier_freq', 100))
+        bit_rate = float(data.get('bit_rate', 10))
+        confidence = float(data.get('confidence', 0.95))
+        seed = data.get('seed')
+        
+        # 与请求超时一致：超时后取消尚未开始的批次，不再占用进程池
+        result = ber_curve(rf_processor, snr_list, trials, modulation_types,
+                           num_bits, carrier_freq, bit_rate, confidence,
+                           None if seed is None else int(seed), compute_executor.timeout)
+        return signal_response(result)
+    except TimeoutError:
+        return jsonify({'error': 'Computation timed out'}), 504
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/coverage-grid', methods=['POST'])
+@cached_route
+@heavy_route
+def api_coverage_grid():
+    """链路预算覆盖网格：距离 × 频率 × 发射天线增益，按分块计算与返回"""
+    try:
+        data = request.json or {}
+        sensitivity = data.get('sensitivity_dbm')
+        budget = LinkBudget(
+            data.get('model', 'free_space'),
+            float(data.get('tx_power_dbm', 20)),
+            float(data.get('rx_gain_dbi', 0)),
+            float(data.get('losses_db', 0)),
+            float(data.get('bandwidth_hz', 1e6)),
+            float(data.get('noise_figure_db', 5)),
+            None if sensitivity is None else float(sensitivity),
+            float(data.get('path_loss_exponent', 3.0)),
+            float(data.get('tx_height_m', 30)),
+            float(data.get('rx_height_m', 1.5)),
+        )
+        grid = CoverageGrid(
+            budget,
+            axis_values(data.get('distance_km', {'start': 0.1, 'stop': 100, 'num': 256,
+                                                 'scale': 'log'}), 'distance_km'),
+            axis_values(data.get('frequency_mhz', {'start': 100, 'stop': 6000, 'num': 128,
+                                                   'scale': 'log'}), 'frequency_mhz'),
+            axis_values(data.get('tx_gain_dbi', [0, 3, 6, 9]), 'tx_gain_dbi', positive=False),
+            data.get('tile_shape', DEFAULT_TILE_SHAPE),
+        )
+        outputs = data.get('outputs', list(COVERAGE_OUTPUTS))
+        unknown = set(outputs) - set(COVERAGE_OUTPUTS)
+        if unknown:
+            raise ValueError(f'Unknown outputs: {sorted(unknown)}')
+        indices = data.get('tiles', [data.get('tile', [0, 0, 0])])
+        if not 1 <= len(indices) <= MAX_COVERAGE_TILES:
+            raise ValueError(f'tiles must contain 1..{MAX_COVERAGE_TILES} tile indices')
+        
+        tiles = []
+        for index in indices:
+            tile = grid.tile(index, coverage_tiles)
+            tiles.append({key: value for key, value in tile.items()
+                          if key not in COVERAGE_OUTPUTS or key in outputs})
+        
+        return signal_response({
+            'grid': grid.describe(),
+            'tiles': tiles,
+            'noise_floor_dbm': budget.noise_floor_dbm(),
+            'parameters': dict(zip(('model', 'tx_power_dbm', 'rx_gain_dbi', 'losses_db',
+                                    'bandwidth_hz', 'noise_figure_db', 'sensitivity_dbm',
+                                    'path_loss_exponent', 'tx_height_m', 'rx_height_m'),
+                                   budget.key())),
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/array-factor', methods=['GET', 'POST'])
+@cached_route
+@heavy_route
+def api_array_factor():
+    """天线阵列因子：线阵（阵元数 × 间距批量）或面阵的方向图，支持波束扫描与幅度加权
+
+    GET 使用查询参数（供波束扫描滑块使用，列表以逗号分隔），POST 使用同名的 JSON 字段。
+    """
+    try:
+        data = request.args if request.method == 'GET' else (request.json or {})
+        geometry = data.get('geometry', 'linear')
+        options = {
+            'taper': data.get('taper', 'uniform'),
+            'sidelobe_db': float(data.get('sidelobe_db', DEFAULT_SIDELOBE_DB)),
+            'resolution': float(data.get('resolution', 1.0)),
+            'floor_db': float(data.get('floor_db', DEFAULT_FLOOR_DB)),
+        }
+        if geometry == 'linear':
+            array = LinearArrayBatch(parse_values(data.get('elements', 16), int),
+                                     parse_values(data.get('spacing', 0.5), float),
+                                     float(data.get('steer', 0)), **options)
+        elif geometry == 'planar':
+            # 单个值表示两个方向相同
+            elements = parse_values(data.get('elements', 16), int)
+            spacing = parse_values(data.get('spacing', 0.5), float)
+            if len(elements) > 2 or len(spacing) > 2:
+                raise ValueError('planar elements and spacing take at most two values (x, y)')
+            array = PlanarArray(elements[0], elements[-1], spacing[0], spacing[-1],
+                                float(data.get('steer_theta', 0)),
+                                float(data.get('steer_phi', 0)), **options)
+        else:
+            raise ValueError(f'Unsupported geometry: {geometry}')
         
-        return jsonify(result)
+        return signal_response({'array': array.describe(), **array.pattern(array_patterns)})
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
 @app.route('/api/digital-baseband', methods=['POST'])
+@heavy_route
 def digital_baseband():
     """生成数字基带信号"""
     try:
@@ -611,14 +1380,16 @@ def digital_baseband():
         binary_data = rf_processor.text_to_binary(text)
         
         # 生成基带信号
-        result = rf_processor.generate_digital_baseband(binary_data, bit_rate, encoding)
+        result = rf_processor.generate_digital_baseband(binary_data, bit_rate, encoding,
+                                                        **pulse_shaping_args(data))
         result['original_text'] = text
         
-        return jsonify(result)
+        return signal_response(result)
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
 @app.route('/api/digital-modulation', methods=['POST'])
+@heavy_route
 def digital_modulation():
     """数字调制"""
     try:
@@ -628,8 +1399,9 @@ def digital_modulation():
         bit_rate = float(data.get('bit_rate', 10))
         modulation_type = data.get('modulation_type', 'ASK')
         
-        # 先生成基带信号
-        baseband = rf_processor.generate_digital_baseband(binary_data, bit_rate, 'NRZ')
+        # 先生成基带信号（可选 RC / RRC 成形，ASK / PSK 随之成为带限信号）
+        baseband = rf_processor.generate_digital_baseband(binary_data, bit_rate, 'NRZ',
+                                                          **pulse_shaping_args(data))
         
         if modulation_type == 'ASK':
             result = rf_processor.ask_modulation(baseband['amplitude'], carrier_freq, baseband['time'])
@@ -643,11 +1415,17 @@ def digital_modulation():
             return jsonify({'error': 'Unsupported modulation type'}), 400
         
         result['baseband'] = baseband
-        return jsonify(result)
+        result['signal_id'] = signal_store.put(
+            result[modulation_type.lower() + '_signal'], result['time'],
+            sampling_rate=rf_processor.sampling_rate, source=modulation_type,
+            carrier_freq=carrier_freq, bit_rate=bit_rate, modulation_type=modulation_type,
+            binary_data=binary_data)
+        return signal_response(result)
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
 @app.route('/api/generate-baseband', methods=['POST'])
+@heavy_route
 def generate_baseband():
     """生成数字基带信号API"""
     try:
@@ -656,12 +1434,14 @@ def generate_baseband():
         bit_rate = float(data.get('bit_rate', 10))
         encoding = data.get('encoding', 'NRZ')
         
-        result = rf_processor.generate_digital_baseband(binary_data, bit_rate, encoding)
-        return jsonify(result)
+        result = rf_processor.generate_digital_baseband(binary_data, bit_rate, encoding,
+                                                        **pulse_shaping_args(data))
+        return signal_response(result)
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
 @app.route('/api/text-to-binary', methods=['POST'])
+@cached_route
 def text_to_binary():
     """文本到二进制转换API"""
     try:
@@ -670,27 +1450,30 @@ def text_to_binary():
         
         binary_data = rf_processor.text_to_binary(text)
         
-        # 创建字符映射信息
+        # 创建字符映射信息（每个字符对应其 UTF-8 字节；长文本只列出前 MAX_CHAR_MAPPINGS 个字符）
         char_mappings = []
-        for char in text:
-            ascii_code = ord(char)
-            binary_repr = format(ascii_code, '08b')
+        for char in text[:MAX_CHAR_MAPPINGS]:
+            code_point = ord(char)
             char_mappings.append({
                 'character': char,
-                'ascii': ascii_code,
-                'binary': binary_repr
+                'ascii': code_point,
+                'code_point': code_point,
+                'binary': bits_to_string(text_to_bits(char))
             })
         
-        return jsonify({
+        return signal_response({
             'original_text': text,
             'binary_data': binary_data,
             'char_mappings': char_mappings,
+            'char_mappings_truncated': len(text) > MAX_CHAR_MAPPINGS,
             'total_bits': len(binary_data)
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
 @app.route('/api/modulation-demo', methods=['POST'])
+@cached_route
+@heavy_route
 def modulation_demo_api():
     """调制演示API - 返回单个比特的调制结果"""
     try:
@@ -701,8 +1484,9 @@ def modulation_demo_api():
         bit_duration = float(data.get('bit_duration', 0.1))
         
         # 生成单个比特周期的信号
-        t = np.linspace(0, bit_duration, int(rf_processor.sampling_rate * bit_duration))
-        carrier = np.cos(2 * np.pi * carrier_freq * t)
+        t = np.linspace(0, bit_duration, int(rf_processor.sampling_rate * bit_duration),
+                        dtype=rf_processor.dtype)
+        carrier = rf_processor.carrier(carrier_freq, t)
         
         if modulation_type == 'ASK':
             amplitude = 1.0 if bit_value == '1' else 0.3
@@ -711,21 +1495,21 @@ def modulation_demo_api():
             
         elif modulation_type == 'FSK':
             frequency = carrier_freq + 20 if bit_value == '1' else carrier_freq - 20
-            modulated = np.cos(2 * np.pi * frequency * t)
+            modulated = rf_processor.carrier(frequency, t)
             description = f"比特'{bit_value}' → 频率 = {frequency} Hz"
             
         elif modulation_type == 'PSK':
             phase = np.pi if bit_value == '1' else 0
-            modulated = np.cos(2 * np.pi * carrier_freq * t + phase)
+            modulated = rf_processor.carrier(carrier_freq, t, phase)
             description = f"比特'{bit_value}' → 相位 = {phase/np.pi:.0f}π"
             
         else:
             return jsonify({'error': 'Unsupported modulation type'}), 400
         
-        return jsonify({
-            'time': t.tolist(),
-            'carrier': carrier.tolist(),
-            'modulated': modulated.tolist(),
+        return signal_response({
+            'time': t,
+            'carrier': carrier,
+            'modulated': modulated,
             'bit_value': bit_value,
             'modulation_type': modulation_type,
             'description': description
@@ -734,75 +1518,275 @@ def modulation_demo_api():
         return jsonify({'error': str(e)}), 400
 
 @app.route('/api/spectrum-analysis', methods=['POST'])
+@heavy_route
 def spectrum_analysis():
     """频谱分析API"""
     try:
         data = request.json
-        signal_data = data.get('signal', [])
-        sampling_rate = float(data.get('sampling_rate', 1000))
-        
-        if not signal_data:
+        signal, _, meta = resolve_signal(data)
+        sampling_rate = float(data.get('sampling_rate', meta.get('sampling_rate', 1000)))
+        method = data.get('method', 'fft')
+        window = data.get('window')
+        nfft = data.get('nfft', 'fast')
+        segment_length = int(data.get('segment_length', 256))
+        overlap = float(data.get('overlap', 0.5))
+        
+        if signal.size == 0:
             return jsonify({'error': 'No signal data provided'}), 400
         
-        signal = np.array(signal_data)
-        spectrum = rf_processor.calculate_spectrum(signal, sampling_rate)
+        # 一维为单个信号，二维 (signals, samples) 为批量分析
+        spectrum_data = rf_processor.calculate_spectrum(signal, sampling_rate, method, window,
+                                                        nfft, segment_length, overlap)
         
-        return jsonify(spectrum)
+        return signal_response(spectrum_data)
+    except KeyError:
+        return jsonify({'error': 'Unknown or expired signal_id'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
 @app.route('/api/channel-simulation', methods=['POST'])
+@heavy_route
 def channel_simulation():
     """信道仿真API"""
     try:
         data = request.json
-        signal_data = data.get('signal', [])
+        signal, time, meta = resolve_signal(data)
         snr_db = float(data.get('snr_db', 20))
         fading_type = data.get('fading_type', 'none')
         
-        if not signal_data:
+        if signal.size == 0:
             return jsonify({'error': 'No signal data provided'}), 400
         
-        # 添加噪声
-        noisy_signal = rf_processor.add_noise(signal_data, snr_db)
-        
-        # 可以添加更多信道效应（如衰落）
-        if fading_type == 'rayleigh':
-            # 简单的瑞利衰落模拟
-            fading_amplitude = np.random.rayleigh(0.5, len(noisy_signal))
-            noisy_signal = [s * f for s, f in zip(noisy_signal, fading_amplitude)]
-        
-        return jsonify({
-            'original_signal': signal_data,
-            'noisy_signal': noisy_signal,
-            'snr_db': snr_db,
-            'fading_type': fading_type
-        })
+        # 多径衰落 + 高斯白噪声
+        seed = data.get('seed')
+        result = rf_processor.apply_channel(
+            signal, snr_db, fading_type,
+            profile=data.get('profile', 'flat'),
+            doppler_hz=float(data.get('doppler_hz', 0)),
+            k_factor=float(data.get('k_factor', 4)),
+            delay_scale=float(data.get('delay_scale', 1)),
+            delays=data.get('delays'),
+            gains_db=data.get('gains_db'),
+            rng=None if seed is None else np.random.default_rng(int(seed)))
+        noisy_signal = result['noisy_signal']
+        result['snr_db'] = snr_db
+        result['signal_id'] = signal_store.put(noisy_signal, time, **dict(meta, source='channel'))
+        if data.get('signal_id'):
+            result['original_signal_id'] = data['signal_id']
+        else:
+            result['original_signal'] = signal
+        return signal_response(result)
+    except KeyError:
+        return jsonify({'error': 'Unknown or expired signal_id'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
 @app.route('/api/demodulation', methods=['POST'])
+@heavy_route
 def demodulation():
     """解调API"""
     try:
         data = request.json
-        signal_data = data.get('signal', [])
-        time_data = data.get('time', [])
-        modulation_type = data.get('modulation_type', 'ASK')
-        carrier_freq = float(data.get('carrier_freq', 100))
-        bit_rate = float(data.get('bit_rate', 10))
+        signal, time, meta = resolve_signal(data)
+        modulation_type = data.get('modulation_type', meta.get('modulation_type', 'ASK'))
+        carrier_freq = float(data.get('carrier_freq', meta.get('carrier_freq', 100)))
+        bit_rate = float(data.get('bit_rate', meta.get('bit_rate', 10)))
         
-        if not signal_data or not time_data:
+        if signal.size == 0 or time is None or time.size == 0:
             return jsonify({'error': 'Signal or time data missing'}), 400
         
-        if modulation_type == 'ASK':
-            result = rf_processor.ask_demodulation(signal_data, time_data, carrier_freq, bit_rate)
-        else:
-            return jsonify({'error': f'{modulation_type} demodulation not implemented'}), 400
+        receiver = data.get('receiver', 'coherent')
         
-        return jsonify(result)
+        if modulation_type not in SUPPORTED_RECEIVERS:
+            return jsonify({'error': f'{modulation_type} demodulation not implemented'}), 400
+        if receiver == 'envelope' and modulation_type == 'ASK':
+            # 非相干包络检波
+            result = rf_processor.ask_demodulation(signal, time, carrier_freq, bit_rate)
+        elif receiver == 'coherent':
+            freq_0, freq_1 = data.get('freq_0'), data.get('freq_1')
+            result = rf_processor.coherent_demodulation(
+                signal, time, carrier_freq, bit_rate, modulation_type,
+                None if freq_0 is None else float(freq_0),
+                None if freq_1 is None else float(freq_1))
+        else:
+            return jsonify({'error': f'Unsupported receiver for {modulation_type}: {receiver}'}), 400
+        
+        if 'binary_data' in meta:
+            result['ber'] = rf_processor.calculate_ber(meta['binary_data'],
+                                                       result['recovered_binary'])
+        return signal_response(result)
+    except KeyError:
+        return jsonify({'error': 'Unknown or expired signal_id'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/signals/<signal_id>')
+def api_get_signal(signal_id):
+    """读取存储的信号（支持 format / max_points）"""
+    try:
+        entry = signal_store.get(signal_id)
+    except KeyError:
+        return jsonify({'error': 'Unknown or expired signal_id'}), 404
+    return signal_response({
+        'signal_id': signal_id,
+        'time': entry['time'],
+        'signal': entry['signal'],
+        'meta': entry['meta']
+    })
+
+def parse_sample_range(header: str):
+    """解析 Range: samples=a-b（含两端）或 samples=-n（最后n个采样），返回 (start, count)"""
+    match = re.match(r'^samples=(\d*)-(\d*)$', header.replace(' ', ''))
+    if not match or match.groups() == ('', ''):
+        raise ValueError(f'Unsupported Range: {header}')
+    first, last = match.groups()
+    if first == '':
+        return -int(last), int(last)
+    if last == '':
+        return int(first), None
+    if int(last) < int(first):
+        raise ValueError(f'Unsupported Range: {header}')
+    return int(first), int(last) - int(first) + 1
+
+@app.route('/api/archive', methods=['GET'])
+def api_archive_list():
+    """列出归档的运行（按创建时间倒序）"""
+    return jsonify({'runs': waveform_archive.list_runs()})
+
+@app.route('/api/archive', methods=['POST'])
+@heavy_route
+def api_archive_save():
+    """归档一次运行
+
+    请求体为 {"signal_id": ...} 时归档信号存储中的信号，
+    否则按 complete-transmission 的参数运行仿真并归档全部信号。
+    """
+    try:
+        data = request.json or {}
+        if data.get('signal_id'):
+            entry = signal_store.get(data['signal_id'])
+            arrays = {'signal': entry['signal']}
+            if entry['time'] is not None:
+                arrays['time'] = entry['time']
+            meta = dict(entry['meta'], signal_id=data['signal_id'])
+        else:
+            result = rf_processor.simulate_complete_transmission(
+                data.get('text', 'Hello'),
+                float(data.get('carrier_freq', 100)),
+                float(data.get('bit_rate', 10)),
+                float(data.get('snr_db', 20)),
+                data.get('modulation_type', 'ASK'))
+            arrays = {
+                'time': result['baseband']['time'],
+                'baseband': result['baseband']['amplitude'],
+                'modulated_signal': result['modulated_signal'],
+                'received_signal': result['received_signal'],
+            }
+            meta = {key: result[key] for key in ('original_text', 'binary_data', 'recovered_binary',
+                                                 'recovered_text', 'ber', 'parameters')}
+        meta['sampling_rate'] = meta.get('sampling_rate', rf_processor.sampling_rate)
+        run_id = waveform_archive.save(arrays, json.loads(json.dumps(meta, default=float)))
+        return jsonify(waveform_archive.manifest(run_id))
+    except KeyError:
+        return jsonify({'error': 'Unknown or expired signal_id'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+@app.route('/api/archive/import', methods=['POST'])
+def api_archive_import():
+    """导入 .npz / .npy 文件（multipart 字段 file，可选 JSON 字段 meta）"""
+    upload = request.files.get('file')
+    if upload is None:
+        return jsonify({'error': 'No file uploaded'}), 400
+    try:
+        meta = json.loads(request.form.get('meta') or '{}')
+        meta.setdefault('source', upload.filename)
+        run_id = waveform_archive.import_npz(upload.stream, meta)
+        return jsonify(waveform_archive.manifest(run_id))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/archive/<run_id>', methods=['GET', 'DELETE'])
+def api_archive_manifest(run_id):
+    """读取（GET）或删除（DELETE）一次运行的元数据与数组清单"""
+    try:
+        if request.method == 'DELETE':
+            waveform_archive.delete(run_id)
+            return jsonify({'run_id': run_id, 'deleted': True})
+        return jsonify(waveform_archive.manifest(run_id))
+    except KeyError:
+        return jsonify({'error': 'Unknown archive run'}), 404
+
+@app.route('/api/archive/<run_id>/arrays/<name>')
+def api_archive_array(run_id, name):
+    """按采样区间读取归档数组（内存映射，只读入请求的区间）
+
+    区间由 start/count 查询参数或 Range: samples=a-b 请求头指定，
+    后者返回 206 与 Content-Range；同样支持 format / max_points。
+    """
+    try:
+        range_header = request.headers.get('Range')
+        if range_header:
+            start, count = parse_sample_range(range_header)
+        else:
+            start = int(request.args.get('start', 0))
+            count = request.args.get('count')
+            count = None if count is None else int(count)
+        window = waveform_archive.read(run_id, name, start, count)
+        # 运行可能在读取后被删除，元数据读取同样按 404 处理
+        manifest = waveform_archive.manifest(run_id)
+    except (KeyError, FileNotFoundError):
+        return jsonify({'error': 'Unknown archive run or array'}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 416 if request.headers.get('Range') else 400
+
+    sampling_rate = manifest['meta'].get('sampling_rate')
+    payload = dict(window, run_id=run_id, name=name, sampling_rate=sampling_rate)
+    response = signal_response(payload)
+    response.headers['Accept-Ranges'] = 'samples'
+    if range_header:
+        response.status_code = 206
+        last = window['start'] + window['count'] - 1
+        response.headers['Content-Range'] = f"samples {window['start']}-{last}/{window['total']}"
+    return response
+
+@app.route('/api/archive/<run_id>/raw/<name>.npy')
+def api_archive_raw(run_id, name):
+    """原始 .npy 文件，支持字节 Range 请求（数据区偏移见清单中的 data_offset）"""
+    try:
+        path = waveform_archive.array_path(run_id, name)
+    except (KeyError, ValueError):
+        return jsonify({'error': 'Unknown archive run or array'}), 404
+    return send_file(path, mimetype='application/octet-stream', conditional=True,
+                     download_name=f'{name}.npy')
+
+@app.route('/api/archive/<run_id>/export.npz')
+def api_archive_export(run_id):
+    """整包导出为 .npz"""
+    try:
+        path = waveform_archive.export_path(run_id)
+    except KeyError:
+        return jsonify({'error': 'Unknown archive run'}), 404
+    return send_file(path, mimetype='application/octet-stream', conditional=True,
+                     as_attachment=True, download_name=f'{run_id}.npz')
+
+def serve(host: str = '0.0.0.0', port: int = 5001):
+    """生产模式运行：优先使用 waitress（如已安装），否则使用多线程的 Werkzeug 服务器
+
+    每个 SSE 波形流在整个连接期间占用一个服务线程，线程数按计算任务与流的上限之和确定，
+    流占满名额时页面、API 与 /metrics 仍有空闲线程。
+    """
+    threads = (compute_executor.max_workers + compute_executor.max_queue
+               + waveform_streams.max_streams + 4)
+    try:
+        from waitress import serve as waitress_serve
+    except ImportError:
+        app.run(debug=False, host=host, port=port, threaded=True)
+    else:
+        waitress_serve(app, host=host, port=port, threads=threads)
+
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5001)
+    if os.environ.get('RFVISION_MODE') == 'production':
+        serve(port=int(os.environ.get('PORT', 5001)))
+    else:
+        app.run(debug=True, host='0.0.0.0', port=5001)
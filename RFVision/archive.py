@@ -0,0 +1,242 @@
+"""
+RFVision - 波形归档（.npy / .npz + 元数据）
+
+仿真结果按运行保存到归档目录，每次运行一个子目录：
+    <run_id>/meta.json      元数据（参数、文本、误码率……）与数组清单
+    <run_id>/<name>.npy     每个数组一个 .npy 文件
+    <run_id>/run.npz        按需生成的整包导出文件
+
+读取时用 np.load(mmap_mode='r') 打开 .npy，只有请求的采样区间被实际读入内存，
+因此即使是小时级的长采集，也可以按 start/count 或 HTTP Range 逐段浏览。
+.npz 用于整包导出与导入（压缩包内的数组无法内存映射，导入时会拆分为 .npy）。
+"""
+
+import json
+import math
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+META_FILE = 'meta.json'
+EXPORT_FILE = 'run.npz'
+
+# run_id 与数组名的合法字符，同时防止路径穿越
+_RUN_ID = re.compile(r'^[0-9a-f]{32}$')
+_ARRAY_NAME = re.compile(r'^[A-Za-z][A-Za-z0-9_]{0,63}$')
+
+# 单次区间读取允许的最大采样数
+MAX_READ_COUNT = 10_000_000
+
+# 导入时单个数组 / 整个文件解压后允许的最大字节数（按 .npy 头部声明的形状计算）
+DEFAULT_MAX_ARRAY_BYTES = 1024 * 1024 * 1024
+DEFAULT_MAX_IMPORT_BYTES = 4 * 1024 * 1024 * 1024
+
+
+def _check_name(name: str) -> str:
+    if not _ARRAY_NAME.match(name or ''):
+        raise ValueError(f'Invalid array name: {name!r}')
+    return name
+
+
+def npy_data_offset(path: str) -> int:
+    """.npy 文件中数据区的起始字节偏移（即头部长度）"""
+    return int(np.load(path, mmap_mode='r', allow_pickle=False).offset)
+
+
+class WaveformArchive:
+    """基于目录的波形归档（线程安全的写入与元数据读取）"""
+
+    def __init__(self, root: str, max_array_bytes: int = DEFAULT_MAX_ARRAY_BYTES,
+                 max_import_bytes: int = DEFAULT_MAX_IMPORT_BYTES):
+        self.root = root
+        self.max_array_bytes = max_array_bytes
+        self.max_import_bytes = max_import_bytes
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'WaveformArchive':
+        """根据环境变量 RFVISION_ARCHIVE_DIR（默认为应用目录下的 archive/）、
+        RFVISION_ARCHIVE_MAX_ARRAY_MB / RFVISION_ARCHIVE_MAX_IMPORT_MB 创建"""
+        default = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'archive')
+        return cls(os.environ.get('RFVISION_ARCHIVE_DIR', default),
+                   int(os.environ.get('RFVISION_ARCHIVE_MAX_ARRAY_MB', 1024)) * 1024 * 1024,
+                   int(os.environ.get('RFVISION_ARCHIVE_MAX_IMPORT_MB', 4096)) * 1024 * 1024)
+
+    def _run_dir(self, run_id: str) -> str:
+        """返回运行目录；ID不合法或不存在时抛出 KeyError"""
+        if not _RUN_ID.match(run_id or ''):
+            raise KeyError(run_id)
+        path = os.path.join(self.root, run_id)
+        if not os.path.isfile(os.path.join(path, META_FILE)):
+            raise KeyError(run_id)
+        return path
+
+    def save(self, arrays: Dict[str, np.ndarray], meta: Optional[Dict] = None) -> str:
+        """保存一次运行，返回 run_id
+
+        先写入临时目录，完成后整体重命名，读者不会看到写了一半的运行。
+        """
+        return self._write_run(arrays.items(), meta)
+
+    def _write_run(self, arrays: Iterable[Tuple[str, np.ndarray]],
+                   meta: Optional[Dict] = None) -> str:
+        """逐个写入 (名称, 数组)；arrays 可以是生成器，写完一个再取下一个"""
+        os.makedirs(self.root, exist_ok=True)
+        run_id = uuid.uuid4().hex
+        staging = tempfile.mkdtemp(prefix='.staging-', dir=self.root)
+        try:
+            manifest = {}
+            for name, values in arrays:
+                values = np.asarray(values)
+                if values.dtype == object:
+                    raise ValueError(f'Array {name!r} has an unsupported dtype')
+                path = os.path.join(staging, _check_name(name) + '.npy')
+                np.save(path, np.ascontiguousarray(values), allow_pickle=False)
+                manifest[name] = {
+                    'dtype': values.dtype.str,
+                    'shape': list(values.shape),
+                    'itemsize': values.dtype.itemsize,
+                    'data_offset': npy_data_offset(path),
+                }
+            document = {
+                'run_id': run_id,
+                'created': time.time(),
+                'arrays': manifest,
+                'meta': meta or {},
+            }
+            with open(os.path.join(staging, META_FILE), 'w', encoding='utf-8') as handle:
+                json.dump(document, handle, ensure_ascii=False, indent=2)
+            os.rename(staging, os.path.join(self.root, run_id))
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return run_id
+
+    def import_npz(self, source, meta: Optional[Dict] = None) -> str:
+        """导入 .npz（或单个 .npy）文件，逐个数组拆分保存，返回 run_id
+
+        解压前先按 .npy 头部声明的形状检查数组大小（防止压缩炸弹），
+        再逐个成员读取并写入，内存中同时只保留一个数组。source 需可 seek。
+        """
+        start = source.tell()
+        is_npz = zipfile.is_zipfile(source)
+        source.seek(start)
+        if not is_npz:
+            self._check_header(source, 'signal')
+            source.seek(start)
+            return self.save({'signal': np.load(source, allow_pickle=False)}, meta)
+        with np.load(source, allow_pickle=False) as loaded:
+            return self._write_run(self._npz_members(loaded), meta)
+
+    def _npz_members(self, loaded) -> Iterator[Tuple[str, np.ndarray]]:
+        """逐个产出 .npz 成员；读取每个成员前检查其大小与累计大小"""
+        members = set(loaded.zip.namelist())
+        total = 0
+        for name in loaded.files:
+            member = name + '.npy' if name + '.npy' in members else name
+            with loaded.zip.open(member) as handle:
+                total += self._check_header(handle, name)
+            if total > self.max_import_bytes:
+                raise ValueError(f'Import exceeds {self.max_import_bytes} bytes')
+            yield name, loaded[name]
+
+    def _check_header(self, handle, name: str) -> int:
+        """读取 .npy 头部，返回数组的字节数；非 .npy 成员、对象数组或超限时抛出 ValueError"""
+        try:
+            version = np.lib.format.read_magic(handle)
+            if version == (1, 0):
+                shape, _, dtype = np.lib.format.read_array_header_1_0(handle)
+            else:
+                shape, _, dtype = np.lib.format.read_array_header_2_0(handle)
+        except ValueError as e:
+            raise ValueError(f'Array {name!r} is not a valid .npy array: {e}') from None
+        if dtype.hasobject:
+            raise ValueError(f'Array {name!r} has an unsupported dtype')
+        nbytes = math.prod(shape) * dtype.itemsize
+        if nbytes > self.max_array_bytes:
+            raise ValueError(f'Array {name!r} is too large ({nbytes} bytes, '
+                             f'limit {self.max_array_bytes})')
+        return nbytes
+
+    def manifest(self, run_id: str) -> Dict:
+        """读取运行的元数据与数组清单"""
+        with open(os.path.join(self._run_dir(run_id), META_FILE), encoding='utf-8') as handle:
+            return json.load(handle)
+
+    def list_runs(self) -> List[Dict]:
+        """按创建时间倒序列出所有运行（不含数组清单）"""
+        runs = []
+        if not os.path.isdir(self.root):
+            return runs
+        for run_id in os.listdir(self.root):
+            try:
+                document = self.manifest(run_id)
+            except (KeyError, OSError, ValueError):
+                continue
+            runs.append({
+                'run_id': run_id,
+                'created': document['created'],
+                'arrays': sorted(document['arrays']),
+                'meta': document['meta'],
+            })
+        return sorted(runs, key=lambda run: run['created'], reverse=True)
+
+    def array_path(self, run_id: str, name: str) -> str:
+        """数组 .npy 文件路径；不存在时抛出 KeyError"""
+        path = os.path.join(self._run_dir(run_id), _check_name(name) + '.npy')
+        if not os.path.isfile(path):
+            raise KeyError(name)
+        return path
+
+    def open_array(self, run_id: str, name: str) -> np.memmap:
+        """以只读内存映射方式打开数组（不读取数据）"""
+        return np.load(self.array_path(run_id, name), mmap_mode='r', allow_pickle=False)
+
+    def read(self, run_id: str, name: str, start: int = 0,
+             count: Optional[int] = None) -> Dict:
+        """读取最后一维上 [start, start + count) 的采样区间（只读入该区间）
+
+        未指定 count 时读到末尾，但最多 MAX_READ_COUNT 个采样，此时结果的 truncated 为 True。
+        """
+        values = self.open_array(run_id, name)
+        total = values.shape[-1] if values.ndim else 1
+        start = int(start)
+        if start < 0:
+            start = max(0, total + start)
+        truncated = False
+        if count is None:
+            count = max(0, total - start)
+            truncated = count > MAX_READ_COUNT
+            count = min(count, MAX_READ_COUNT)
+        count = int(count)
+        if count < 0 or count > MAX_READ_COUNT:
+            raise ValueError(f'count must be in 0..{MAX_READ_COUNT}')
+        stop = min(total, start + count)
+        start = min(start, stop)
+        window = np.array(values[..., start:stop]) if values.ndim else np.array(values)
+        return {'values': window, 'start': start, 'count': stop - start, 'total': total,
+                'truncated': truncated}
+
+    def export_path(self, run_id: str) -> str:
+        """整包 .npz 导出文件路径（首次请求时由内存映射数组生成并缓存）"""
+        run_dir = self._run_dir(run_id)
+        path = os.path.join(run_dir, EXPORT_FILE)
+        with self._lock:
+            if not os.path.isfile(path):
+                names = self.manifest(run_id)['arrays']
+                staging = path + '.tmp'
+                with open(staging, 'wb') as handle:
+                    np.savez(handle, **{name: self.open_array(run_id, name) for name in names})
+                os.replace(staging, path)
+        return path
+
+    def delete(self, run_id: str) -> None:
+        shutil.rmtree(self._run_dir(run_id))
@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+RFVision - 性能基准测试
+
+覆盖两部分：
+1. RFSignalProcessor 各方法：按采样点数、比特长度、编码方式分档计时
+2. 所有 API 路由：通过 Flask 测试客户端驱动，拆分为计算耗时与序列化耗时
+
+每个用例记录中位数/最小耗时（time.perf_counter）和峰值内存（tracemalloc）。
+结果可保存为基线；与基线比较时，中位数耗时或峰值内存超过阈值即判定为回归，
+进程以非零状态退出，便于在CI中使用。
+
+用法:
+    python benchmark.py                          # 运行并打印结果
+    python benchmark.py --save-baseline          # 运行并保存基线
+    python benchmark.py --compare --threshold 0.25
+    python benchmark.py --filter route: --repeat 10
+    python benchmark.py --precision float32      # 以 float32 精度模式运行
+    python benchmark.py --check-precision        # 检查 float32 相对 float64 的误差
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+import app as rfapp
+from antenna import LinearArrayBatch, PlanarArray
+from baseband import bits_to_text, text_to_bits
+from compression import available_encodings, compress, compress_stream
+from ber import ber_curve
+from nco import NCO
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                'benchmark_baseline.json')
+
+
+def _random_bits(length: int, seed: int = 0) -> str:
+    rng = np.random.default_rng(seed)
+    return ''.join('1' if bit else '0' for bit in rng.integers(0, 2, length))
+
+
+# float32 精度模式相对 float64 的误差上限（--check-precision）
+PRECISION_TOLERANCES = {
+    'waveform': 1e-5,      # 生成的波形：最大绝对误差（幅度约为 1）
+    'spectrum': 1e-5,      # 幅度谱 / Welch PSD：相对峰值的最大误差
+    'demodulation': 1e-4,  # 无噪声时的判决统计量：最大绝对误差
+    'ber_sigma': 4.0,      # 误码率之差：不超过二项分布标准差的倍数
+}
+
+# 处理器用例使用的精度模式（--precision）
+PRECISION = 'float64'
+
+
+def _processor(duration: float = 2.0, precision: str = None) -> 'rfapp.RFSignalProcessor':
+    processor = rfapp.RFSignalProcessor(precision or PRECISION)
+    processor.time_duration = duration
+    return processor
+
+
+def processor_cases(quick: bool) -> List[Tuple[str, Callable]]:
+    """RFSignalProcessor 方法用例"""
+    cases = []
+    durations = [2.0, 20.0] if quick else [2.0, 20.0, 200.0]
+    bit_lengths = [64, 1024] if quick else [64, 1024, 16384]
+
+    for duration in durations:
+        samples = int(1000 * duration)
+        processor = _processor(duration)
+        cases += [
+            (f'processor:generate_carrier_wave[n={samples}]',
+             lambda p=processor: p.generate_carrier_wave(50, 1.0)),
+            (f'processor:amplitude_modulation[n={samples}]',
+             lambda p=processor: p.amplitude_modulation(50, 5, 0.5)),
+            (f'processor:frequency_modulation[n={samples}]',
+             lambda p=processor: p.frequency_modulation(50, 5, 10)),
+            (f'processor:phase_modulation[n={samples}]',
+             lambda p=processor: p.phase_modulation(50, 5, np.pi / 4)),
+            (f'processor:carrier[n={samples}]',
+             lambda p=processor: p.carrier(50, p.time_base())),
+            (f'nco:cos[n={samples},f32,out]',
+             lambda o=NCO(50, 1000, dtype=np.float32), b=np.empty(samples, np.float32):
+             o.cos(b.size, out=b)),
+        ]
+        signal = processor.amplitude_modulation(50, 5, 0.5)['am_signal']
+        cases += [
+            (f'processor:get_spectrum[n={samples}]',
+             lambda p=processor, x=signal: p.get_spectrum(x)),
+            (f'processor:add_noise[n={samples}]',
+             lambda p=processor, x=signal: p.add_noise(x, 10)),
+            (f'processor:apply_channel[n={samples},eva,doppler]',
+             lambda p=processor, x=signal: p.apply_channel(x, 10, 'rayleigh', 'eva', 2.0,
+                                                           delay_scale=1e5)),
+        ]
+
+    processor = _processor()
+    for length in bit_lengths:
+        bits = _random_bits(length)
+        for encoding in ('NRZ', 'RZ', 'Manchester'):
+            cases.append((f'processor:generate_digital_baseband[bits={length},{encoding}]',
+                          lambda b=bits, e=encoding: processor.generate_digital_baseband(b, 10, e)))
+        for shape in ('rc', 'rrc'):
+            cases.append((f'processor:generate_digital_baseband[bits={length},NRZ,{shape}]',
+                          lambda b=bits, p=shape: processor.generate_digital_baseband(b, 10, 'NRZ',
+                                                                                      p)))
+        baseband = processor.generate_digital_baseband(bits, 10, 'NRZ')
+        ask = processor.ask_modulation(baseband['amplitude'], 100, baseband['time'])
+        received = processor.add_noise(ask['ask_signal'], 15)
+        recovered = processor.ask_demodulation(received, baseband['time'], 100, 10)['recovered_binary']
+        text = 'RFVision benchmark ' * max(1, length // 152)
+        cases += [
+            (f'processor:ask_modulation[bits={length}]',
+             lambda b=baseband: processor.ask_modulation(b['amplitude'], 100, b['time'])),
+            (f'processor:psk_modulation[bits={length}]',
+             lambda b=baseband: processor.psk_modulation(b['amplitude'], 100, b['time'])),
+            (f'processor:fsk_modulation[bits={length}]',
+             lambda b=bits: processor.fsk_modulation(b, 80, 120, 10)),
+            (f'processor:ask_demodulation[bits={length}]',
+             lambda r=received, b=baseband: processor.ask_demodulation(r, b['time'], 100, 10)),
+            (f'processor:coherent_demodulation[bits={length},ASK]',
+             lambda r=received, b=baseband: processor.coherent_demodulation(r, b['time'], 100, 10)),
+            (f'processor:coherent_demodulation[bits={length},FSK]',
+             lambda r=received, b=baseband: processor.coherent_demodulation(r, b['time'], 100, 10,
+                                                                           'FSK')),
+            (f'processor:coherent_demodulation[bits={length},PSK]',
+             lambda r=received, b=baseband: processor.coherent_demodulation(r, b['time'], 100, 10,
+                                                                           'PSK')),
+            (f'processor:calculate_ber[bits={length}]',
+             lambda b=bits, r=recovered: processor.calculate_ber(b, r)),
+            (f'processor:text_to_binary[chars={len(text)}]',
+             lambda t=text: processor.text_to_binary(t)),
+            (f'processor:binary_to_text[bits={length}]',
+             lambda b=bits: processor.binary_to_text(b)),
+        ]
+        for scheme in ('QPSK', '64QAM'):
+            modulated = processor.iq_modulation(bits, scheme)
+            received_iq = processor.add_iq_noise(modulated['iq'], 15)
+            cases += [
+                (f'processor:iq_modulation[bits={length},{scheme}]',
+                 lambda b=bits, s=scheme: processor.iq_modulation(b, s)),
+                (f'processor:iq_demodulation[bits={length},{scheme}]',
+                 lambda r=received_iq, s=scheme: processor.iq_demodulation(r, s, num_bits=length)),
+            ]
+        shaped = processor.iq_modulation(bits, 'QPSK', pulse_shape='rrc')
+        cases += [
+            (f'processor:iq_modulation[bits={length},QPSK,rrc]',
+             lambda b=bits: processor.iq_modulation(b, 'QPSK', pulse_shape='rrc')),
+            (f'processor:iq_demodulation[bits={length},QPSK,rrc]',
+             lambda r=shaped['iq']: processor.iq_demodulation(r, 'QPSK', num_bits=length,
+                                                              pulse_shape='rrc')),
+        ]
+
+    # 天线阵列因子：64 阵元 1° 分辨率的单个方向图，以及阵元数 × 间距的整批评估
+    single = LinearArrayBatch([64], [0.5], steer_deg=20, taper='chebyshev')
+    batch = LinearArrayBatch([8, 16, 32, 64, 128, 256], [0.25, 0.5, 0.75, 1.0],
+                             steer_deg=20, taper='hamming')
+    planar = PlanarArray(64, 64, 0.5, 0.5, steer_theta=30, steer_phi=45, taper='hamming')
+    cases += [
+        ('antenna:linear[elements=64,1deg]', single.evaluate),
+        ('antenna:linear_batch[6x4,1deg]', batch.evaluate),
+        ('antenna:planar[64x64,1deg]', planar.evaluate),
+    ]
+
+    # 响应压缩：大 JSON 响应体的一次性压缩与分帧流式压缩
+    client = rfapp.app.test_client()
+    body = client.post('/api/digital-modulation', json={'binary_data': _random_bits(256)}).data
+    frames = [body[start:start + 16384] for start in range(0, len(body), 16384)]
+    size = f'bytes={len(body)}'
+    for encoding in available_encodings():
+        level = rfapp.response_compression.levels[encoding]
+        cases += [
+            (f'compression:{encoding}[{size}]',
+             lambda e=encoding, l=level: compress(body, e, l)),
+            (f'compression:{encoding}_stream[{size},chunk=16384]',
+             lambda e=encoding, l=level: sum(map(len, compress_stream(iter(frames), e, l)))),
+        ]
+
+    # 多字节 UTF-8 长消息：内部比特数组形式与接口字符串形式
+    message = '射频可视化 RFVision ✓ ' * (4096 if quick else 65536)
+    message_bits = text_to_bits(message)
+    size = f'bytes={message_bits.size // 8}'
+    cases += [
+        (f'baseband:text_to_bits[{size}]', lambda m=message: text_to_bits(m)),
+        (f'baseband:bits_to_text[{size}]', lambda b=message_bits: bits_to_text(b)),
+        (f'processor:text_to_binary[{size}]', lambda m=message: processor.text_to_binary(m)),
+        (f'processor:binary_to_text[{size}]',
+         lambda b=processor.text_to_binary(message): processor.binary_to_text(b)),
+    ]
+    return cases
+
+
+def route_cases(quick: bool) -> List[Tuple]:
+    """API路由用例: (名称, 方法, URL, JSON请求体[, 请求头])"""
+    text = 'Hello RFVision' * (1 if quick else 4)
+    signal = np.cos(2 * np.pi * 50 * np.arange(2000) / 1000).tolist()
+    time_axis = (np.arange(2000) / 1000).tolist()
+    cases = [
+        ('route:generate_carrier', 'GET', '/api/generate_carrier?frequency=50', None),
+        ('route:generate_am', 'GET', '/api/generate_am', None),
+        ('route:generate_fm', 'GET', '/api/generate_fm', None),
+        ('route:generate_pm', 'GET', '/api/generate_pm', None),
+        ('route:generate_am[f32]', 'GET', '/api/generate_am?format=f32', None),
+        ('route:generate_am[max_points=600]', 'GET', '/api/generate_am?max_points=600', None),
+        ('route:complete_transmission', 'POST', '/api/complete-transmission', {'text': text}),
+        ('route:complete_transmission_stream', 'POST', '/api/complete-transmission/stream',
+         {'text': text}),
+        ('route:digital_baseband', 'POST', '/api/digital-baseband', {'text': text}),
+        ('route:digital_modulation', 'POST', '/api/digital-modulation',
+         {'binary_data': _random_bits(256)}),
+        ('route:digital_modulation[gzip]', 'POST', '/api/digital-modulation',
+         {'binary_data': _random_bits(256)}, {'Accept-Encoding': 'gzip'}),
+        ('route:generate_baseband', 'POST', '/api/generate-baseband',
+         {'binary_data': _random_bits(256), 'encoding': 'Manchester'}),
+        ('route:text_to_binary', 'POST', '/api/text-to-binary', {'text': text}),
+        ('route:iq_transmission', 'POST', '/api/iq-transmission',
+         {'text': text, 'scheme': '16QAM'}),
+        ('route:coverage_grid[f32]', 'POST', '/api/coverage-grid?format=f32',
+         {'model': 'hata_urban', 'sensitivity_dbm': -100, 'tile_shape': [4, 256, 1024],
+          'outputs': ['margin'],
+          'distance_km': {'start': 0.1, 'stop': 50, 'num': 1024, 'scale': 'log'},
+          'frequency_mhz': {'start': 150, 'stop': 1500, 'num': 256}}),
+        ('route:array_factor', 'GET',
+         '/api/array-factor?elements=64&spacing=0.5&steer=20&taper=chebyshev', None),
+        ('route:modulation_demo', 'POST', '/api/modulation-demo', {'modulation_type': 'FSK'}),
+        ('route:spectrum_analysis', 'POST', '/api/spectrum-analysis', {'signal': signal}),
+        ('route:spectrum_analysis[welch]', 'POST', '/api/spectrum-analysis',
+         {'signal': signal, 'method': 'welch'}),
+        ('route:channel_simulation', 'POST', '/api/channel-simulation', {'signal': signal}),
+        ('route:channel_simulation[eva,doppler]', 'POST', '/api/channel-simulation',
+         {'signal': signal, 'fading_type': 'rayleigh', 'profile': 'eva', 'delay_scale': 1e5,
+          'doppler_hz': 2, 'seed': 1}),
+        ('route:demodulation', 'POST', '/api/demodulation', {'signal': signal, 'time': time_axis}),
+        ('route:ber_curve', 'POST', '/api/ber-curve',
+         {'snr_db': [0, 5, 10], 'trials': 5, 'num_bits': 100, 'seed': 1}),
+    ]
+    return cases
+
+
+class SerializationTimer:
+    """包装 app.signal_response，累计序列化阶段耗时"""
+
+    def __init__(self):
+        self._original = rfapp.signal_response
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        def timed(payload):
+            start = time.perf_counter()
+            try:
+                return self._original(payload)
+            finally:
+                with self._lock:
+                    self.elapsed += time.perf_counter() - start
+        rfapp.signal_response = timed
+        return self
+
+    def __exit__(self, *exc):
+        rfapp.signal_response = self._original
+        return False
+
+
+def time_calls(fn: Callable, repeat: int) -> List[float]:
+    """预热一次后重复计时"""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def peak_memory(fn: Callable) -> int:
+    """单次调用期间的 tracemalloc 峰值内存（字节）"""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def measure(fn: Callable, repeat: int) -> Dict:
+    """计时并记录峰值内存"""
+    samples = time_calls(fn, repeat)
+    return {
+        'median': statistics.median(samples),
+        'min': min(samples),
+        'peak_bytes': peak_memory(fn),
+    }
+
+
+def run_routes(cases, repeat: int) -> Dict[str, Dict]:
+    """驱动API路由并拆分计算/序列化耗时"""
+    client = rfapp.app.test_client()
+    results = {}
+    for name, method, url, body, *headers in cases:
+        def call():
+            response = client.open(url, method=method, json=body,
+                                   headers=headers[0] if headers else None)
+            data = response.get_data()
+            if response.status_code != 200:
+                raise RuntimeError(f'{name}: HTTP {response.status_code} {data[:200]!r}')
+            return len(data)
+
+        payload_bytes = call()  # 预热
+        samples = []
+        with SerializationTimer() as timer:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                call()
+                samples.append(time.perf_counter() - start)
+        median = statistics.median(samples)
+        serialize = timer.elapsed / repeat
+        results[name] = {
+            'median': median,
+            'min': min(samples),
+            'peak_bytes': peak_memory(call),
+            'compute': max(0.0, median - serialize),
+            'serialize': serialize,
+            'payload_bytes': payload_bytes,
+        }
+    return results
+
+
+def precision_check(duration: float = 20.0) -> List[Tuple[str, float, float]]:
+    """比较 float32 与 float64 处理器的输出，返回 (检查项, 误差, 上限) 列表"""
+    exact, compact = _processor(duration, 'float64'), _processor(duration, 'float32')
+    checks = []
+
+    def check(name: str, kind: str, fn: Callable, relative: bool = False) -> None:
+        reference = np.asarray(fn(exact), dtype=np.float64)
+        values = np.asarray(fn(compact), dtype=np.float64)
+        error = float(np.max(np.abs(values - reference)))
+        if relative:
+            error /= max(float(np.max(np.abs(reference))), 1e-300)
+        checks.append((name, error, PRECISION_TOLERANCES[kind]))
+
+    check('carrier', 'waveform', lambda p: p.generate_carrier_wave(50)['amplitude'])
+    check('am', 'waveform', lambda p: p.amplitude_modulation(50, 5, 0.5)['am_signal'])
+    check('fm', 'waveform', lambda p: p.frequency_modulation(50, 5, 10)['fm_signal'])
+    check('pm', 'waveform', lambda p: p.phase_modulation(50, 5, np.pi / 4)['pm_signal'])
+    check('sweep[FM]', 'waveform', lambda p: p.modulation_sweep('FM', 50, 5, [5, 10, 20])['signals'])
+    bits = _random_bits(256)
+    check('fsk', 'waveform', lambda p: p.fsk_modulation(bits, 80, 120, 10)['fsk_signal'])
+    check('spectrum[fft]', 'spectrum',
+          lambda p: p.get_spectrum(p.amplitude_modulation(50, 5, 0.5)['am_signal'])['magnitude'],
+          relative=True)
+    check('spectrum[welch]', 'spectrum',
+          lambda p: p.calculate_spectrum(p.amplitude_modulation(50, 5, 0.5)['am_signal'],
+                                         method='welch')['psd'], relative=True)
+    for modulation_type in ('ASK', 'FSK', 'PSK'):
+        def demod_statistics(p, modulation_type=modulation_type):
+            baseband = p.generate_digital_baseband(bits, 10, 'NRZ')
+            if modulation_type == 'FSK':
+                signal = p.fsk_modulation(bits, 80, 120, 10)['fsk_signal']
+            elif modulation_type == 'ASK':
+                signal = p.ask_modulation(baseband['amplitude'], 100, baseband['time'])['ask_signal']
+            else:
+                signal = p.psk_modulation(baseband['amplitude'], 100, baseband['time'])['psk_signal']
+            return p.coherent_demodulation(signal, baseband['time'], 100, 10, modulation_type,
+                                           include_waveform=False)['decision_statistics']
+        check(f'demodulation[{modulation_type}]', 'demodulation', demod_statistics)
+
+    # 误码率：相同种子下两种精度的差异应在统计误差之内
+    snr_list, trials, num_bits = [-24, -20, -16], 20, 500
+    curves = {precision: ber_curve(processor, snr_list, trials, num_bits=num_bits, seed=1)['curves']
+              for precision, processor in (('float64', exact), ('float32', compact))}
+    for modulation_type, curve in curves['float64'].items():
+        reference = np.asarray(curve['ber'])
+        values = np.asarray(curves['float32'][modulation_type]['ber'])
+        sigma = np.sqrt(2 * np.maximum(reference * (1 - reference), 1e-4) / (trials * num_bits))
+        checks.append((f'ber[{modulation_type}]', float(np.max(np.abs(values - reference) / sigma)),
+                       PRECISION_TOLERANCES['ber_sigma']))
+    return checks
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """与基线比较，返回回归描述列表"""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        if result['median'] > reference['median'] * (1 + threshold):
+            regressions.append(f"{name}: time {reference['median'] * 1e3:.3f} ms -> "
+                               f"{result['median'] * 1e3:.3f} ms")
+        if result['peak_bytes'] > reference['peak_bytes'] * (1 + threshold) + 4096:
+            regressions.append(f"{name}: peak memory {reference['peak_bytes']} -> "
+                               f"{result['peak_bytes']} bytes")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='RFVision 性能基准测试')
+    parser.add_argument('--repeat', type=int, default=5, help='每个用例的计时次数')
+    parser.add_argument('--quick', action='store_true', help='只运行较小规模的用例')
+    parser.add_argument('--filter', default='', help='只运行名称包含该字符串的用例')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='基线文件路径')
+    parser.add_argument('--save-baseline', action='store_true', help='将结果保存为基线')
+    parser.add_argument('--compare', action='store_true', help='与基线比较，回归时返回非零状态')
+    parser.add_argument('--threshold', type=float, default=0.25, help='允许的相对回归幅度')
+    parser.add_argument('--json', action='store_true', help='以JSON格式输出结果')
+    parser.add_argument('--precision', default='float64', choices=('float64', 'float32'),
+                        help='处理器与路由使用的精度模式')
+    parser.add_argument('--check-precision', action='store_true',
+                        help='检查 float32 模式相对 float64 的误差，超出上限时返回非零状态')
+    args = parser.parse_args(argv)
+
+    if args.check_precision:
+        failures = 0
+        print(f"{'check':<24} {'error':>12} {'tolerance':>12}")
+        for name, error, tolerance in precision_check():
+            failed = not error <= tolerance
+            failures += failed
+            print(f"{name:<24} {error:>12.3e} {tolerance:>12.3e}{'  FAIL' if failed else ''}")
+        return 1 if failures else 0
+
+    global PRECISION
+    PRECISION = args.precision
+    rfapp.rf_processor.set_precision(args.precision)
+
+    results: Dict[str, Dict] = {}
+    for name, fn in processor_cases(args.quick):
+        if args.filter in name:
+            results[name] = measure(fn, args.repeat)
+    results.update(run_routes([case for case in route_cases(args.quick) if args.filter in case[0]],
+                              args.repeat))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'case':<58} {'median ms':>10} {'min ms':>9} {'peak KiB':>9} "
+              f"{'compute':>9} {'serialize':>9} {'bytes':>9}")
+        for name, result in results.items():
+            extra = ''
+            if 'serialize' in result:
+                extra = (f" {result['compute'] * 1e3:>9.3f} {result['serialize'] * 1e3:>9.3f} "
+                         f"{result['payload_bytes']:>9}")
+            print(f"{name:<58} {result['median'] * 1e3:>10.3f} {result['min'] * 1e3:>9.3f} "
+                  f"{result['peak_bytes'] / 1024:>9.1f}{extra}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as handle:
+            json.dump(results, handle, indent=2, sort_keys=True)
+        print(f'基线已保存: {args.baseline}')
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f'基线文件不存在: {args.baseline}', file=sys.stderr)
+            return 2
+        with open(args.baseline, encoding='utf-8') as handle:
+            regressions = compare(results, json.load(handle), args.threshold)
+        if regressions:
+            print('性能回归:', file=sys.stderr)
+            for line in regressions:
+                print('  ' + line, file=sys.stderr)
+            return 1
+        print('未发现性能回归')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
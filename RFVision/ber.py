@@ -0,0 +1,232 @@
+"""
+RFVision - 蒙特卡洛 BER-SNR 曲线引擎
+
+对每种调制方式、每个SNR点进行多次随机试验：
+- 试验以 (trials, samples) 二维数组批量处理，依次经过
+  调制 -> add_noise -> 解调判决 -> calculate_ber
+- 各 (调制方式, SNR, 试验批次) 任务分发到进程池并行执行；进程以 spawn 方式启动
+  （不 fork 持有线程与锁的服务进程），超过时限时取消尚未开始的批次
+- 汇总误码数与总比特数，给出BER及Wilson置信区间
+
+除通带的 ASK / FSK / PSK 外，还支持复基带模式的 BPSK / QPSK / 16QAM / 64QAM：
+每符号只有 iq.DEFAULT_SAMPLES_PER_SYMBOL 个复采样，相同规模下可以仿真多得多的比特。
+复基带方式的 SNR 为符号信噪比 Es/N0。
+"""
+
+import multiprocessing
+import os
+import statistics
+import time
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+import iq
+from baseband import fsk_frequency_track, render_baseband, render_fsk
+
+PASSBAND_MODULATIONS = ('ASK', 'FSK', 'PSK')
+SUPPORTED_MODULATIONS = PASSBAND_MODULATIONS + tuple(iq.SCHEMES)
+
+# 单个批次允许的最大采样数 (trials × samples)，控制单任务内存占用
+MAX_BATCH_SAMPLES = 2_000_000
+
+# 总工作量低于该采样数时直接在当前进程计算，避免进程池开销
+INLINE_SAMPLES = 500_000
+
+# 单次曲线请求允许的总采样数上限（单核约 1500 万采样/秒，保证在请求超时内完成）
+MAX_TOTAL_SAMPLES = 200_000_000
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """惰性创建模块级进程池
+
+    服务进程中有线程池与锁，fork 出的子进程可能继承被占用的锁而死锁，
+    因此默认以 spawn 启动（RFVISION_BER_START_METHOD 可改为 forkserver）。
+    """
+    global _pool
+    if _pool is None:
+        workers = int(os.environ.get('RFVISION_BER_WORKERS', os.cpu_count() or 1))
+        context = multiprocessing.get_context(os.environ.get('RFVISION_BER_START_METHOD', 'spawn'))
+        _pool = ProcessPoolExecutor(max_workers=max(1, workers), mp_context=context)
+    return _pool
+
+
+def check_confidence(confidence: float) -> float:
+    """校验置信度，不在 (0, 1) 内时抛出 ValueError"""
+    confidence = float(confidence)
+    if not 0 < confidence < 1:
+        raise ValueError('confidence must be between 0 and 1 (exclusive)')
+    return confidence
+
+
+def wilson_interval(errors: np.ndarray, total: np.ndarray,
+                    confidence: float = 0.95) -> Tuple[np.ndarray, np.ndarray]:
+    """二项比例的Wilson置信区间（向量化），confidence 须在 (0, 1) 内"""
+    z = statistics.NormalDist().inv_cdf((1 + check_confidence(confidence)) / 2)
+    total = np.maximum(np.asarray(total, dtype=float), 1)
+    p = np.asarray(errors, dtype=float) / total
+    denominator = 1 + z ** 2 / total
+    center = (p + z ** 2 / (2 * total)) / denominator
+    half_width = z * np.sqrt(p * (1 - p) / total + z ** 2 / (4 * total ** 2)) / denominator
+    return np.clip(center - half_width, 0, 1), np.clip(center + half_width, 0, 1)
+
+
+def simulate_batch(processor, modulation_type: str, snr_db: float, trials: int,
+                   num_bits: int, carrier_freq: float, bit_rate: float,
+                   seed: int) -> Tuple[int, int]:
+    """运行一批试验，返回 (误码总数, 比较的比特总数)
+
+    调制与 simulate_complete_transmission 保持一致（NRZ基带，FSK为 fc±20Hz）。
+    """
+    rng = np.random.default_rng(seed)
+    bits = rng.integers(0, 2, size=(trials, num_bits), dtype=np.uint8)
+
+    if modulation_type in iq.SCHEMES:
+        # 复基带：符号率取 bit_rate，不涉及载波
+        modulated = processor.iq_modulation(bits, modulation_type, bit_rate)
+        received = processor.add_iq_noise(modulated['iq'], snr_db,
+                                          modulated['samples_per_symbol'], rng=rng)
+        recovered = processor.iq_demodulation(received, modulation_type,
+                                              modulated['samples_per_symbol'],
+                                              num_bits)['recovered_binary']
+        return _count_errors(processor, bits, recovered)
+
+    bit_duration = 1.0 / bit_rate
+    samples_per_bit = int(processor.sampling_rate * bit_duration)
+    total_samples = samples_per_bit * num_bits
+    t = np.linspace(0, num_bits * bit_duration, total_samples)
+
+    # 步骤1: 批量调制 (trials × samples)，精度与处理器一致
+    if modulation_type == 'FSK':
+        frequency_trace = fsk_frequency_track(bits, carrier_freq - 20, carrier_freq + 20,
+                                              samples_per_bit)
+        modulated = render_fsk(t, frequency_trace, processor.dtype)
+    else:
+        baseband = render_baseband(bits, 'NRZ', samples_per_bit, processor.dtype)
+        carrier = processor.carrier(carrier_freq, t)
+        if modulation_type == 'ASK':
+            modulated = (baseband + 1) / 2 * carrier
+        else:  # PSK
+            modulated = baseband * carrier
+
+    # 步骤2: 信道加噪
+    received = processor.add_noise(modulated, snr_db, rng=rng)
+
+    # 步骤3: 相干解调判决（与 simulate_complete_transmission 使用同一接收机）
+    demodulated = processor.coherent_demodulation(received, t, carrier_freq, bit_rate,
+                                                  modulation_type, include_waveform=False)
+    recovered = demodulated['recovered_binary']
+
+    # 步骤4: 逐试验误码率 -> 误码数
+    return _count_errors(processor, bits, recovered)
+
+
+def _count_errors(processor, bits: np.ndarray, recovered: np.ndarray) -> Tuple[int, int]:
+    compared = min(bits.shape[-1], recovered.shape[-1])
+    ber = np.atleast_1d(processor.calculate_ber(bits, recovered))
+    return int(np.rint(ber * compared).sum()), bits.shape[0] * compared
+
+
+def samples_per_trial(processor, modulation_type: str, num_bits: int, bit_rate: float) -> int:
+    """单次试验的采样数（复基带方式按符号数计算）"""
+    if modulation_type in iq.SCHEMES:
+        symbols = -(-num_bits // iq.bits_per_symbol(modulation_type))
+        return symbols * iq.DEFAULT_SAMPLES_PER_SYMBOL
+    return int(processor.sampling_rate * (1.0 / bit_rate)) * num_bits
+
+
+def ber_curve(processor, snr_list: Sequence[float], trials: Union[int, Sequence[int]],
+              modulation_types: Sequence[str] = PASSBAND_MODULATIONS,
+              num_bits: int = 200, carrier_freq: float = 100, bit_rate: float = 10,
+              confidence: float = 0.95, seed: Optional[int] = None,
+              timeout: Optional[float] = None) -> Dict:
+    """计算各调制方式的 BER-SNR 曲线
+
+    timeout（秒）给定时，超时抛出 TimeoutError，并取消进程池中尚未开始的批次。
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    confidence = check_confidence(confidence)
+    snr_values = [float(snr) for snr in snr_list]
+    if isinstance(trials, (int, np.integer)):
+        trial_counts = [int(trials)] * len(snr_values)
+    else:
+        trial_counts = [int(n) for n in trials]
+        if len(trial_counts) != len(snr_values):
+            raise ValueError('trials 长度必须与 snr_db 列表一致')
+
+    for modulation_type in modulation_types:
+        if modulation_type not in SUPPORTED_MODULATIONS:
+            raise ValueError(f'Unsupported modulation type: {modulation_type}')
+
+    trial_samples = {mod: samples_per_trial(processor, mod, num_bits, bit_rate)
+                     for mod in modulation_types}
+    if sum(trial_samples.values()) * sum(trial_counts) > MAX_TOTAL_SAMPLES:
+        raise ValueError('仿真规模过大，请减少 trials / num_bits / SNR 点数')
+
+    # 任务拆分: (调制方式, SNR索引, 试验批次)
+    tasks = []
+    for modulation_type in modulation_types:
+        batch_trials = max(1, MAX_BATCH_SAMPLES // max(1, trial_samples[modulation_type]))
+        for index, (snr_db, count) in enumerate(zip(snr_values, trial_counts)):
+            for start in range(0, count, batch_trials):
+                tasks.append((modulation_type, index, snr_db, min(batch_trials, count - start)))
+
+    seeds = np.random.SeedSequence(seed).generate_state(len(tasks))
+    total_samples = sum(task[3] * trial_samples[task[0]] for task in tasks)
+
+    if total_samples <= INLINE_SAMPLES or len(tasks) == 1:
+        results = []
+        for (mod, _, snr, n), s in zip(tasks, seeds):
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError('BER simulation timed out')
+            results.append(simulate_batch(processor, mod, snr, n, num_bits,
+                                          carrier_freq, bit_rate, int(s)))
+    else:
+        pool = _get_pool()
+        futures = [pool.submit(simulate_batch, processor, mod, snr, n, num_bits,
+                               carrier_freq, bit_rate, int(s))
+                   for (mod, _, snr, n), s in zip(tasks, seeds)]
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        _, pending = wait(futures, timeout=remaining, return_when=FIRST_EXCEPTION)
+        if pending:
+            # 超时或某个批次失败：不再为本请求占用进程池
+            for future in pending:
+                future.cancel()
+            for future in futures:
+                if future.done() and not future.cancelled() and future.exception():
+                    raise future.exception()
+            raise TimeoutError('BER simulation timed out')
+        results = [future.result() for future in futures]
+
+    curves = {}
+    for modulation_type in modulation_types:
+        errors = np.zeros(len(snr_values), dtype=np.int64)
+        total_bits = np.zeros(len(snr_values), dtype=np.int64)
+        for (mod, index, _, _), (error_count, bit_count) in zip(tasks, results):
+            if mod == modulation_type:
+                errors[index] += error_count
+                total_bits[index] += bit_count
+        ci_lower, ci_upper = wilson_interval(errors, total_bits, confidence)
+        curves[modulation_type] = {
+            'ber': errors / np.maximum(total_bits, 1),
+            'ci_lower': ci_lower,
+            'ci_upper': ci_upper,
+            'errors': errors.tolist(),
+            'total_bits': total_bits.tolist(),
+        }
+
+    return {
+        'snr_db': snr_values,
+        'curves': curves,
+        'parameters': {
+            'trials': trial_counts,
+            'num_bits': num_bits,
+            'carrier_freq': carrier_freq,
+            'bit_rate': bit_rate,
+            'confidence': confidence,
+            'seed': seed,
+        },
+    }
@@ -0,0 +1,326 @@
+"""
+RFVision - 响应压缩与预压缩静态资源
+
+完整传输仿真、数字调制等接口的JSON响应体很大且冗余度高（数字调制的响应中基带比特
+出现了两次），静态脚本也一直未压缩传输。这里按 Accept-Encoding 协商 br / gzip：
+- API 响应：小于阈值（默认 1 KiB）的响应、已编码的响应、二进制数组格式、部分内容响应不压缩；
+  带 ETag 的响应（确定性路由的缓存响应）按 (ETag, 编码) 缓存压缩结果，缓存命中时不再重复压缩，
+  压缩后的表示使用 "<etag>-<编码>" 作为 ETag，If-None-Match 命中时直接返回 304
+- 动态响应默认使用低压缩级别（gzip 1 级、brotli 4 级）：数值JSON在 1 级下已压缩到约 40%，
+  6 级只再减少约 5 个百分点，耗时却是 1 级的 4~5 倍，会超过路由本身的计算时间
+- 流式响应（NDJSON 分帧、SSE 波形流）使用增量压缩器，每个数据块后同步刷新，
+  客户端仍能逐帧收到数据；压缩上下文跨帧保持，重复的字段名只在第一帧计入
+- 静态资源在启动时预压缩一次（gzip 9 级、brotli 11 级），或使用构建时
+  `python compression.py` 生成的 .gz / .br 文件；url_for('static') 自动附加内容指纹
+  ?v=<hash>，带指纹的请求返回一年有效的 immutable 缓存头，不带指纹时按 ETag 重新验证
+
+brotli 为可选依赖，未安装时只协商 gzip。
+"""
+
+import argparse
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # 可选依赖
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/javascript', 'application/x-ndjson',
+                          'application/xml', 'image/svg+xml', 'text/css', 'text/csv',
+                          'text/event-stream', 'text/html', 'text/javascript', 'text/plain')
+
+# 构建时预压缩的静态资源扩展名
+STATIC_EXTENSIONS = ('.css', '.csv', '.html', '.js', '.json', '.map', '.svg', '.txt')
+
+# 带内容指纹的静态资源缓存时间（一年）
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+PRECOMPRESSED_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """服务端支持的编码（按优先顺序）"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    """一次性压缩；gzip 头中的时间戳固定为 0，相同输入得到相同输出"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    raise ValueError(f'Unsupported encoding: {encoding}')
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str, level: int) -> Iterator[bytes]:
+    """增量压缩：每个输入块处理后同步刷新，输出块与输入块一一对应"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=level)
+        process, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        process, finish = compressor.compress, compressor.flush
+        flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)  # noqa: E731
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            if chunk:
+                yield process(chunk) + flush()
+        yield finish()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+def _is_compressible(mimetype: Optional[str]) -> bool:
+    return mimetype in COMPRESSIBLE_MIMETYPES
+
+
+class StaticAsset:
+    """一个静态文件的原始内容、内容指纹与预压缩版本（只保留比原文件小的版本）"""
+
+    def __init__(self, path: str, data: bytes, variants: Dict[str, bytes]):
+        self.path = path
+        self.data = data
+        self.version = hashlib.sha1(data).hexdigest()[:12]
+        self.mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        if self.mimetype.startswith('text/') or self.mimetype == 'application/javascript':
+            self.mimetype += '; charset=utf-8'
+        self.variants = {encoding: body for encoding, body in variants.items()
+                         if len(body) < len(data)}
+
+    @classmethod
+    def load(cls, path: str, encodings: Iterable[str]) -> 'StaticAsset':
+        """读取文件；有比源文件新的 .gz / .br 时直接使用，否则在内存中压缩"""
+        with open(path, 'rb') as handle:
+            data = handle.read()
+        variants = {}
+        for encoding in encodings:
+            precompressed = path + PRECOMPRESSED_SUFFIXES[encoding]
+            if (os.path.exists(precompressed)
+                    and os.path.getmtime(precompressed) >= os.path.getmtime(path)):
+                with open(precompressed, 'rb') as handle:
+                    variants[encoding] = handle.read()
+            else:
+                variants[encoding] = compress(data, encoding, 11 if encoding == 'br' else 9)
+        return cls(path, data, variants)
+
+
+def static_files(folder: str) -> Iterator[Tuple[str, str]]:
+    """静态目录下需要预压缩的文件：(URL 中的相对路径, 文件路径)"""
+    for root, _, names in os.walk(folder):
+        for name in sorted(names):
+            if os.path.splitext(name)[1] in STATIC_EXTENSIONS:
+                path = os.path.join(root, name)
+                yield os.path.relpath(path, folder).replace(os.sep, '/'), path
+
+
+class ResponseCompression:
+    """按 Accept-Encoding 压缩响应，并以预压缩版本提供静态资源"""
+
+    def __init__(self, min_bytes: int = 1024, gzip_level: int = 1, brotli_quality: int = 4,
+                 max_cached_bytes: int = 32 * 1024 * 1024, enabled: bool = True):
+        self.min_bytes = min_bytes
+        self.levels = {'gzip': gzip_level, 'br': brotli_quality}
+        self.max_cached_bytes = max_cached_bytes
+        self.enabled = enabled
+        self.encodings = available_encodings()
+        self.assets: Dict[str, StaticAsset] = {}
+        self._cached: 'OrderedDict[Tuple[str, str], bytes]' = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+        self.compressed = 0
+        self.streamed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cache_hits = 0
+
+    @classmethod
+    def from_env(cls) -> 'ResponseCompression':
+        """根据环境变量 RFVISION_COMPRESSION（0 关闭）/ RFVISION_COMPRESS_MIN_BYTES /
+        RFVISION_GZIP_LEVEL / RFVISION_BROTLI_QUALITY / RFVISION_COMPRESS_CACHE_MAX_MB 创建"""
+        return cls(int(os.environ.get('RFVISION_COMPRESS_MIN_BYTES', 1024)),
+                   int(os.environ.get('RFVISION_GZIP_LEVEL', 1)),
+                   int(os.environ.get('RFVISION_BROTLI_QUALITY', 4)),
+                   int(os.environ.get('RFVISION_COMPRESS_CACHE_MAX_MB', 32)) * 1024 * 1024,
+                   os.environ.get('RFVISION_COMPRESSION', '1') != '0')
+
+    def init_app(self, app) -> None:
+        """注册压缩中间件，预压缩静态资源并接管 static 端点"""
+        if app.static_folder and os.path.isdir(app.static_folder):
+            for name, path in static_files(app.static_folder):
+                self.assets[name] = StaticAsset.load(path, self.encodings)
+
+        serve_default = app.view_functions['static']
+
+        def static(filename):
+            asset = self.assets.get(filename)
+            if asset is None:
+                return serve_default(filename=filename)
+            return self.static_response(app, asset)
+
+        app.view_functions['static'] = static
+
+        @app.url_defaults
+        def _asset_version(endpoint, values):
+            if endpoint == 'static' and 'v' not in values:
+                asset = self.assets.get(values.get('filename'))
+                if asset is not None:
+                    values['v'] = asset.version
+
+        @app.after_request
+        def _compress(response):
+            return self.process(response)
+
+    def negotiate(self) -> Optional[str]:
+        """按 Accept-Encoding 的 q 值选择编码，相同时优先 br"""
+        if not self.enabled:
+            return None
+        return request.accept_encodings.best_match(self.encodings)
+
+    def static_response(self, app, asset: StaticAsset):
+        encoding = self.negotiate()
+        body = asset.variants.get(encoding)
+        response = app.response_class(asset.data if body is None else body,
+                                      content_type=asset.mimetype)
+        response.vary.add('Accept-Encoding')
+        if body is not None:
+            response.headers['Content-Encoding'] = encoding
+            response.set_etag(f'{asset.version}-{encoding}')
+        else:
+            response.set_etag(asset.version)
+        if request.args.get('v') == asset.version:
+            # 内容变化时指纹随之变化，带指纹的 URL 可以永久缓存
+            response.cache_control.public = True
+            response.cache_control.max_age = IMMUTABLE_MAX_AGE
+            response.cache_control.immutable = True
+        else:
+            response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    def process(self, response):
+        """after_request：满足条件时压缩响应（响应头已编码、非 200、HEAD 请求等保持原样）"""
+        if (request.endpoint == 'static' or request.method == 'HEAD'
+                or response.status_code != 200 or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or 'Content-Range' in response.headers
+                or response.cache_control.no_transform
+                or not _is_compressible(response.mimetype)):
+            return response
+        if not response.is_streamed and response.calculate_content_length() < self.min_bytes:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self.negotiate()
+        if encoding is None:
+            return response
+        level = self.levels[encoding]
+
+        if response.is_streamed:
+            response.response = compress_stream(response.response, encoding, level)
+            response.headers.pop('Content-Length', None)
+            response.headers['Content-Encoding'] = encoding
+            with self._lock:
+                self.streamed += 1
+            return response
+
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            variant = f'{etag}-{encoding}'
+            if request.if_none_match.contains(variant):
+                response.set_etag(variant)
+                response.status_code = 304
+                response.set_data(b'')
+                return response
+            body = self._compress_cached((etag, encoding), response.get_data(), level)
+            response.set_etag(variant)
+        else:
+            data = response.get_data()
+            body = compress(data, encoding, level)
+            self._count(len(data), len(body))
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def _count(self, size_in: int, size_out: int) -> None:
+        with self._lock:
+            self.compressed += 1
+            self.bytes_in += size_in
+            self.bytes_out += size_out
+
+    def _compress_cached(self, key: Tuple[str, str], data: bytes, level: int) -> bytes:
+        with self._lock:
+            body = self._cached.get(key)
+            if body is not None:
+                self._cached.move_to_end(key)
+                self.cache_hits += 1
+                return body
+        # 在锁外压缩，并发的相同请求最多重复压缩一次
+        body = compress(data, key[1], level)
+        self._count(len(data), len(body))
+        if len(body) > self.max_cached_bytes:
+            return body
+        with self._lock:
+            if key not in self._cached:
+                self._cached[key] = body
+                self._cached_bytes += len(body)
+                while self._cached_bytes > self.max_cached_bytes:
+                    _, evicted = self._cached.popitem(last=False)
+                    self._cached_bytes -= len(evicted)
+        return body
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'compressed': self.compressed,
+                'streamed': self.streamed,
+                'bytes_in': self.bytes_in,
+                'bytes_out': self.bytes_out,
+                'ratio': self.bytes_out / self.bytes_in if self.bytes_in else 1.0,
+                'cache_entries': len(self._cached),
+                'cache_bytes': self._cached_bytes,
+                'cache_hits': self.cache_hits,
+                'static_assets': len(self.assets),
+            }
+
+
+def precompress(folder: str, encodings: Iterable[str]) -> List[Tuple[str, int, Dict[str, int]]]:
+    """构建时为静态资源生成 .gz / .br 文件，返回 (相对路径, 原始字节数, {编码: 压缩字节数})"""
+    written = []
+    for name, path in static_files(folder):
+        asset = StaticAsset.load(path, ())
+        sizes = {}
+        for encoding in encodings:
+            body = compress(asset.data, encoding, 11 if encoding == 'br' else 9)
+            with open(path + PRECOMPRESSED_SUFFIXES[encoding], 'wb') as handle:
+                handle.write(body)
+            sizes[encoding] = len(body)
+        written.append((name, len(asset.data), sizes))
+    return written
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='为静态资源生成预压缩的 .gz / .br 文件')
+    parser.add_argument('folder', nargs='?',
+                        default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                             'static'))
+    args = parser.parse_args(argv)
+    for name, size, sizes in precompress(args.folder, available_encodings()):
+        variants = ' '.join(f'{encoding}={length}' for encoding, length in sizes.items())
+        print(f'{name:<40} {size:>9} {variants}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+"""
+RFVision - 图表尺寸的服务端降采样
+
+前端图表只有几百像素宽，没有必要传输全部采样点。
+这里使用最小/最大包络降采样（min/max envelope）：
+将序列等分为若干桶，每桶保留最小值和最大值所在的采样点，
+因此即使载波频率很高，波形包络和频谱峰值也能完整保留。
+
+同一响应中长度相同的数组（如 time / amplitude / carrier）
+被视为共享同一横轴，使用同一组采样下标，保证各曲线仍然对齐。
+批量接口返回的 (curves, samples) 二维数组按行视为多条曲线，沿最后一维降采样；
+曲线再多，返回的点数也不超过 max_points。
+只处理与 time / frequencies 横轴等长的浮点数组（信号、频谱）；比特序列等整数数组、
+批量扫描的参数表等不是采样序列的数组原样返回。
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, List
+
+import numpy as np
+
+# 横轴数组的键名：只作为采样下标的载体，不参与极值计算
+AXIS_KEYS = ('time', 'frequencies')
+
+# 允许的最小点数（首尾点 + 至少一个桶的极值）
+MIN_POINTS = 4
+
+
+def minmax_indices(series: List[np.ndarray], max_points: int) -> np.ndarray:
+    """计算共享横轴的多条曲线的最小/最大包络采样下标
+
+    所有曲线使用同一组等分桶。曲线较少时每个桶为每条曲线保留最小值与最大值
+    （桶数 = (max_points - 2) // (2·曲线数)）；曲线多到每条曲线连一个桶都分不到时，
+    改为每个桶只保留全部曲线合在一起的最小值与最大值所在的下标。
+    返回排序后的下标数组，长度不超过 max_points，并始终包含首尾点。
+    """
+    values = np.vstack([np.asarray(row, dtype=float).reshape(-1, row.shape[-1])
+                        for row in series])
+    length = values.shape[-1]
+    if length <= max_points:
+        return np.arange(length)
+
+    per_series = (max_points - 2) // (2 * values.shape[0])
+    buckets = max(1, per_series if per_series >= 1 else (max_points - 2) // 2)
+    bucket_size = -(-length // buckets)
+    buckets = -(-length // bucket_size)
+    padded = np.full((values.shape[0], buckets * bucket_size), np.nan)
+    padded[:, :length] = values
+    # (桶, 曲线, 桶内采样)；全为 NaN 的位置不会被选中
+    blocks = padded.reshape(values.shape[0], buckets, bucket_size).transpose(1, 0, 2)
+    if per_series < 1:
+        blocks = blocks.reshape(buckets, 1, -1)
+    offsets = np.arange(buckets)[:, None] * bucket_size
+    filled = np.where(np.isnan(blocks), np.inf, blocks)
+    lowest = np.argmin(filled, axis=-1)
+    highest = np.argmax(np.where(np.isnan(blocks), -np.inf, blocks), axis=-1)
+    if per_series < 1:
+        # 合并后的桶内位置换算回采样位置
+        lowest, highest = lowest % bucket_size, highest % bucket_size
+
+    selected = np.concatenate([[0, length - 1], (offsets + lowest).ravel(),
+                               (offsets + highest).ravel()])
+    return np.unique(np.clip(selected, 0, length - 1))
+
+
+def _is_signal(obj: np.ndarray) -> bool:
+    """只降采样浮点信号/时间轴/频谱数组；比特、符号标签等整数数组原样返回"""
+    return obj.ndim in (1, 2) and obj.dtype.kind == 'f'
+
+
+def _collect(obj: Any, groups: Dict[int, Dict[str, list]], max_points: int, key: str = '') -> None:
+    """遍历响应，按长度将需要降采样的一维/二维数组分组"""
+    if isinstance(obj, np.ndarray):
+        if _is_signal(obj) and obj.shape[-1] > max_points:
+            group = groups[obj.shape[-1]]
+            rows = [obj] if obj.ndim == 1 else list(obj)
+            (group['axes'] if key in AXIS_KEYS else group['series']).extend(rows)
+    elif isinstance(obj, dict):
+        for child_key, value in obj.items():
+            _collect(value, groups, max_points, child_key)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            _collect(value, groups, max_points, key)
+
+
+def _apply(obj: Any, selections: Dict[int, np.ndarray]) -> Any:
+    """按分组下标替换数组"""
+    if isinstance(obj, np.ndarray):
+        if _is_signal(obj) and obj.shape[-1] in selections:
+            return obj[..., selections[obj.shape[-1]]]
+        return obj
+    if isinstance(obj, dict):
+        return {key: _apply(value, selections) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_apply(value, selections) for value in obj]
+    if isinstance(obj, tuple):
+        return tuple(_apply(value, selections) for value in obj)
+    return obj
+
+
+def decimate_payload(payload: Any, max_points: int) -> Any:
+    """对响应中所有超过 max_points 的信号数组进行形状保持降采样"""
+    max_points = max(MIN_POINTS, int(max_points))
+    groups: Dict[int, Dict[str, list]] = defaultdict(lambda: {'axes': [], 'series': []})
+    _collect(payload, groups, max_points)
+    if not groups:
+        return payload
+
+    selections = {}
+    for length, group in groups.items():
+        # 只有与 time / frequencies 横轴等长的数组才是采样序列；
+        # 其余等长数组（如批量扫描的参数表）不是波形，降采样没有意义
+        if group['axes']:
+            selections[length] = minmax_indices(group['series'] or group['axes'], max_points)
+    if not selections:
+        return payload
+    return _apply(payload, selections)
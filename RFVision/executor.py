@@ -0,0 +1,114 @@
+"""
+RFVision - 计算任务执行器（并发限制 / 背压 / 超时）
+
+重计算的API（信号生成、FFT、调制解调、BER仿真）在有界线程池中执行：
+NumPy 的 FFT 与 ufunc 运算会释放 GIL，多个线程可以真正并行。
+
+- 并发上限: 线程池大小 RFVISION_WORKERS
+- 背压: 运行中 + 排队中的任务超过 workers + RFVISION_QUEUE_DEPTH 时
+  直接返回 503 与 Retry-After，而不是让请求线程堆积
+- 超时: 单个请求等待结果超过 RFVISION_REQUEST_TIMEOUT 秒返回 504
+
+页面路由不经过执行器，因此在重计算进行时依然保持响应。
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import wraps
+from typing import Callable, Dict
+
+from flask import copy_current_request_context, jsonify
+
+
+class ComputeOverloaded(Exception):
+    """执行器队列已满"""
+
+
+class ComputeTimeout(Exception):
+    """计算超时"""
+
+
+class ComputeExecutor:
+    """有界线程池执行器"""
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 16,
+                 timeout: float = 30.0, retry_after: int = 1):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                        thread_name_prefix='rfvision-compute')
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.completed = 0
+
+    @classmethod
+    def from_env(cls) -> 'ComputeExecutor':
+        """根据环境变量创建执行器"""
+        return cls(int(os.environ.get('RFVISION_WORKERS', min(8, os.cpu_count() or 1))),
+                   int(os.environ.get('RFVISION_QUEUE_DEPTH', 16)),
+                   float(os.environ.get('RFVISION_REQUEST_TIMEOUT', 30)),
+                   int(os.environ.get('RFVISION_RETRY_AFTER', 1)))
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self.completed += 1
+
+    def run(self, fn: Callable, *args, **kwargs):
+        """在线程池中执行并等待结果
+
+        队列已满抛出 ComputeOverloaded，超时抛出 ComputeTimeout
+        （尚未开始的任务会被取消；已开始的任务运行结束后自动释放名额）。
+        """
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ComputeOverloaded()
+            self._in_flight += 1
+
+        future = self._pool.submit(fn, *args, **kwargs)
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timed_out += 1
+            raise ComputeTimeout()
+
+    def stats(self) -> Dict:
+        """执行器统计信息"""
+        with self._lock:
+            return {
+                'workers': self.max_workers,
+                'queue_depth': self.max_queue,
+                'in_flight': self._in_flight,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'timed_out': self.timed_out,
+                'timeout': self.timeout,
+            }
+
+
+def offload(executor: ComputeExecutor) -> Callable:
+    """路由装饰器：将视图函数放入计算执行器运行（保留请求上下文）"""
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                return executor.run(copy_current_request_context(view), *args, **kwargs)
+            except ComputeOverloaded:
+                response = jsonify({'error': 'Server busy, please retry later'})
+                response.status_code = 503
+                response.headers['Retry-After'] = str(executor.retry_after)
+                return response
+            except ComputeTimeout:
+                return jsonify({'error': 'Computation timed out'}), 504
+        return wrapper
+    return decorator
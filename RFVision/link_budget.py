@@ -0,0 +1,289 @@
+"""
+RFVision - 链路预算与覆盖网格引擎
+
+发射演示页面在浏览器中逐点计算 Friis 自由空间损耗与接收功率。这里在服务端以
+NumPy 广播一次评估 距离 × 频率 × 发射天线增益 的整张网格：
+- 路径损耗只依赖 (频率, 距离)，按 (F, 1) 与 (1, D) 广播得到 (F, D) 矩阵，
+  再与 (G, 1, 1) 的增益广播为 (G, F, D) 的接收功率 / 信噪比 / 余量，不做任何逐点循环
+- 支持多种传播模型：自由空间、页面使用的环境附加损耗（urban / indoor / rural）、
+  对数距离、双线地面反射、Okumura-Hata（城市 / 郊区）
+- 网格可以有上亿个点，按 (G, F, D) 分块（tile）逐块计算与返回；
+  计算结果按 (模型与链路参数, 坐标轴, 分块) 缓存，重复请求同一分块不再计算
+
+单位：距离 km，频率 MHz，功率 dBm，增益与损耗 dB。
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+PROPAGATION_MODELS = ('free_space', 'urban', 'indoor', 'rural', 'log_distance', 'two_ray',
+                      'hata_urban', 'hata_suburban')
+
+OUTPUTS = ('path_loss', 'rx_power', 'snr', 'margin')
+
+# 290 K 下的热噪声功率谱密度
+THERMAL_NOISE_DBM_HZ = -174.0
+
+# 默认分块形状 (增益, 频率, 距离)：8192 个点，四种输出的 JSON 约 0.5 MB；
+# 更大的分块应使用二进制传输（?format=f32 或 Accept: application/octet-stream）
+DEFAULT_TILE_SHAPE = (1, 64, 128)
+
+# 单个分块允许的最大点数
+MAX_TILE_POINTS = 4_000_000
+
+# 单个坐标轴允许的最大点数
+MAX_AXIS_POINTS = 1_000_000
+
+# 环境附加损耗（与 transmission.html 的环境选项一致）
+_ENVIRONMENT_LOSS_DB = {'indoor': 20.0, 'rural': 5.0}
+
+
+def axis_values(spec, name: str, positive: bool = True) -> np.ndarray:
+    """解析坐标轴：数值、数值列表，或 {start, stop, num, scale: linear|log}"""
+    if isinstance(spec, dict):
+        start, stop = float(spec['start']), float(spec['stop'])
+        num = int(spec.get('num', 100))
+        if not 1 <= num <= MAX_AXIS_POINTS:
+            raise ValueError(f'{name}.num must be in 1..{MAX_AXIS_POINTS}')
+        if spec.get('scale', 'linear') == 'log':
+            if start <= 0 or stop <= 0:
+                raise ValueError(f'{name} must be positive for a log axis')
+            values = np.geomspace(start, stop, num)
+        else:
+            values = np.linspace(start, stop, num)
+    else:
+        values = np.atleast_1d(np.asarray(spec, dtype=np.float64))
+    if values.ndim != 1 or values.size == 0 or values.size > MAX_AXIS_POINTS:
+        raise ValueError(f'{name} must contain 1..{MAX_AXIS_POINTS} values')
+    if not np.all(np.isfinite(values)) or (positive and np.any(values <= 0)):
+        raise ValueError(f'{name} must be {"positive and " if positive else ""}finite')
+    return values
+
+
+def free_space_path_loss(distance_km, frequency_mhz) -> np.ndarray:
+    """自由空间路径损耗 20·lg d + 20·lg f + 32.45（d: km, f: MHz，可广播）"""
+    return 20 * np.log10(distance_km) + 20 * np.log10(frequency_mhz) + 32.45
+
+
+def path_loss(model: str, distance_km, frequency_mhz, path_loss_exponent: float = 3.0,
+              tx_height_m: float = 30.0, rx_height_m: float = 1.5) -> np.ndarray:
+    """按传播模型计算路径损耗 (dB)，distance_km 与 frequency_mhz 按广播规则组合"""
+    distance_km = np.asarray(distance_km, dtype=np.float64)
+    frequency_mhz = np.asarray(frequency_mhz, dtype=np.float64)
+
+    if model in ('free_space', 'indoor', 'rural'):
+        return (free_space_path_loss(distance_km, frequency_mhz)
+                + _ENVIRONMENT_LOSS_DB.get(model, 0.0))
+    if model == 'urban':
+        return (free_space_path_loss(distance_km, frequency_mhz)
+                + 10 + 20 * np.log10(frequency_mhz / 900))
+    if model == 'log_distance':
+        # 参考距离 1 m 处为自由空间损耗，其后按路径损耗指数 n 衰减
+        reference_km = 1e-3
+        return (free_space_path_loss(reference_km, frequency_mhz)
+                + 10 * path_loss_exponent * np.log10(distance_km / reference_km))
+    if model == 'two_ray':
+        # 交叉距离 4π·ht·hr/λ 以内按自由空间，以外按 40·lg d 的地面反射模型（两者在交叉点连续）
+        distance_m = distance_km * 1000
+        wavelength_m = 299.792458 / frequency_mhz
+        crossover_m = 4 * np.pi * tx_height_m * rx_height_m / wavelength_m
+        ground = (40 * np.log10(distance_m) - 20 * np.log10(tx_height_m)
+                  - 20 * np.log10(rx_height_m))
+        return np.where(distance_m < crossover_m,
+                        free_space_path_loss(distance_km, frequency_mhz), ground)
+    if model in ('hata_urban', 'hata_suburban'):
+        # Okumura-Hata（中小城市移动台天线修正），适用于 150-1500 MHz、1-20 km
+        log_f = np.log10(frequency_mhz)
+        mobile = (1.1 * log_f - 0.7) * rx_height_m - (1.56 * log_f - 0.8)
+        loss = (69.55 + 26.16 * log_f - 13.82 * np.log10(tx_height_m) - mobile
+                + (44.9 - 6.55 * np.log10(tx_height_m)) * np.log10(distance_km))
+        if model == 'hata_suburban':
+            loss = loss - 2 * np.log10(frequency_mhz / 28) ** 2 - 5.4
+        return loss
+    raise ValueError(f'Unsupported propagation model: {model}')
+
+
+def noise_floor_dbm(bandwidth_hz: float, noise_figure_db: float = 0.0) -> float:
+    """接收机噪声底 -174 + 10·lg B + NF (dBm)"""
+    return THERMAL_NOISE_DBM_HZ + 10 * np.log10(bandwidth_hz) + noise_figure_db
+
+
+class LinkBudget:
+    """链路参数（发射功率、接收增益、损耗、带宽、噪声系数、灵敏度）与传播模型"""
+
+    def __init__(self, model: str = 'free_space', tx_power_dbm: float = 20.0,
+                 rx_gain_dbi: float = 0.0, losses_db: float = 0.0,
+                 bandwidth_hz: float = 1e6, noise_figure_db: float = 5.0,
+                 sensitivity_dbm: Optional[float] = None, path_loss_exponent: float = 3.0,
+                 tx_height_m: float = 30.0, rx_height_m: float = 1.5):
+        if model not in PROPAGATION_MODELS:
+            raise ValueError(f'Unsupported propagation model: {model}')
+        if bandwidth_hz <= 0 or tx_height_m <= 0 or rx_height_m <= 0:
+            raise ValueError('bandwidth_hz and antenna heights must be positive')
+        self.model = model
+        self.tx_power_dbm = float(tx_power_dbm)
+        self.rx_gain_dbi = float(rx_gain_dbi)
+        self.losses_db = float(losses_db)
+        self.bandwidth_hz = float(bandwidth_hz)
+        self.noise_figure_db = float(noise_figure_db)
+        self.sensitivity_dbm = None if sensitivity_dbm is None else float(sensitivity_dbm)
+        self.path_loss_exponent = float(path_loss_exponent)
+        self.tx_height_m = float(tx_height_m)
+        self.rx_height_m = float(rx_height_m)
+
+    def key(self) -> Tuple:
+        return (self.model, self.tx_power_dbm, self.rx_gain_dbi, self.losses_db,
+                self.bandwidth_hz, self.noise_figure_db, self.sensitivity_dbm,
+                self.path_loss_exponent, self.tx_height_m, self.rx_height_m)
+
+    def noise_floor_dbm(self) -> float:
+        return noise_floor_dbm(self.bandwidth_hz, self.noise_figure_db)
+
+    def evaluate(self, distance_km: np.ndarray, frequency_mhz: np.ndarray,
+                 tx_gain_dbi: np.ndarray) -> Dict[str, np.ndarray]:
+        """评估 (增益, 频率, 距离) 网格：path_loss 为 (F, D)，其余为 (G, F, D)"""
+        loss = path_loss(self.model, distance_km[None, :], frequency_mhz[:, None],
+                         self.path_loss_exponent, self.tx_height_m, self.rx_height_m)
+        # 与增益无关的部分先合并，最后一次广播到 (G, F, D)
+        base = (self.tx_power_dbm + self.rx_gain_dbi - self.losses_db) - loss
+        rx_power = base[None, :, :] + tx_gain_dbi[:, None, None]
+        result = {
+            'path_loss': loss,
+            'rx_power': rx_power,
+            'snr': rx_power - self.noise_floor_dbm(),
+        }
+        if self.sensitivity_dbm is not None:
+            result['margin'] = rx_power - self.sensitivity_dbm
+        return result
+
+
+def _digest(values: np.ndarray) -> str:
+    return hashlib.sha1(np.ascontiguousarray(values, dtype=np.float64).tobytes()).hexdigest()
+
+
+class CoverageGrid:
+    """距离 × 频率 × 发射增益 的覆盖网格，按分块计算"""
+
+    def __init__(self, budget: LinkBudget, distance_km: np.ndarray, frequency_mhz: np.ndarray,
+                 tx_gain_dbi: np.ndarray, tile_shape: Sequence[int] = DEFAULT_TILE_SHAPE):
+        self.budget = budget
+        self.axes = (np.asarray(tx_gain_dbi, dtype=np.float64),
+                     np.asarray(frequency_mhz, dtype=np.float64),
+                     np.asarray(distance_km, dtype=np.float64))
+        self.shape = tuple(axis.size for axis in self.axes)
+        if len(tile_shape) != 3 or min(int(size) for size in tile_shape) < 1:
+            raise ValueError('tile_shape must contain three positive sizes')
+        self.tile_shape = tuple(min(int(size), total) for size, total
+                                in zip(tile_shape, self.shape))
+        if int(np.prod(self.tile_shape)) > MAX_TILE_POINTS:
+            raise ValueError(f'A tile may contain at most {MAX_TILE_POINTS} points')
+        self.tile_counts = tuple(-(-total // size) for total, size
+                                 in zip(self.shape, self.tile_shape))
+        self._axis_key = tuple(_digest(axis) for axis in self.axes)
+
+    def tile_slices(self, index: Sequence[int]) -> Tuple[slice, slice, slice]:
+        index = tuple(int(i) for i in index)
+        if len(index) != 3 or any(not 0 <= i < n for i, n in zip(index, self.tile_counts)):
+            raise ValueError(f'tile index must be within {list(self.tile_counts)}')
+        return tuple(slice(i * size, min((i + 1) * size, total))
+                     for i, size, total in zip(index, self.tile_shape, self.shape))
+
+    def tile(self, index: Sequence[int], cache: Optional['TileCache'] = None) -> Dict:
+        """计算（或从缓存读取）一个分块：坐标轴切片、各输出数组与覆盖统计"""
+        slices = self.tile_slices(index)
+        gains, frequencies, distances = (axis[s] for axis, s in zip(self.axes, slices))
+
+        def compute() -> Dict[str, np.ndarray]:
+            values = self.budget.evaluate(distances, frequencies, gains)
+            if 'margin' in values:
+                covered = values['margin'] >= 0
+                # 路径损耗随距离单调增加：覆盖范围即最后一个满足灵敏度的距离
+                last = covered.shape[-1] - 1 - np.argmax(covered[..., ::-1], axis=-1)
+                values['max_range_km'] = np.where(covered.any(axis=-1), distances[last], np.nan)
+                values['covered_fraction'] = np.asarray(covered.mean())
+            return values
+
+        key = (self.budget.key(), self._axis_key, self.tile_shape, tuple(int(i) for i in index))
+        values = compute() if cache is None else cache.get_or_compute(key, compute)
+        return {
+            'index': [int(i) for i in index],
+            'offset': [s.start for s in slices],
+            'tx_gain_dbi': gains,
+            'frequency_mhz': frequencies,
+            'distance_km': distances,
+            **values,
+        }
+
+    def describe(self) -> Dict:
+        return {
+            'shape': list(self.shape),
+            'axes': ['tx_gain_dbi', 'frequency_mhz', 'distance_km'],
+            'tile_shape': list(self.tile_shape),
+            'tile_counts': list(self.tile_counts),
+            'points': int(np.prod(self.shape, dtype=np.int64)),
+        }
+
+
+class TileCache:
+    """覆盖网格分块的LRU缓存（按条目数与字节数限制，线程安全）"""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 128 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Tuple, Dict[str, np.ndarray]]' = OrderedDict()
+        self._sizes: Dict[Tuple, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> 'TileCache':
+        """根据环境变量 RFVISION_TILE_CACHE_MAX_ENTRIES / RFVISION_TILE_CACHE_MAX_MB 创建"""
+        return cls(int(os.environ.get('RFVISION_TILE_CACHE_MAX_ENTRIES', 256)),
+                   int(os.environ.get('RFVISION_TILE_CACHE_MAX_MB', 128)) * 1024 * 1024)
+
+    def get_or_compute(self, key: Tuple, compute) -> Dict[str, np.ndarray]:
+        with self._lock:
+            values = self._entries.get(key)
+            if values is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return values
+            self.misses += 1
+
+        # 在锁外计算，并发的相同请求最多重复计算一次
+        values = compute()
+        for array in values.values():
+            array.setflags(write=False)
+        size = sum(array.nbytes for array in values.values())
+        if size > self.max_bytes:
+            return values
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = values
+                self._sizes[key] = size
+                self._total_bytes += size
+                while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._total_bytes -= self._sizes.pop(evicted)
+                    self.evictions += 1
+            return self._entries[key]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,250 @@
+"""
+RFVision - 请求性能埋点与 Prometheus 指标
+
+- 请求中间件: 每个请求的延迟、状态码、响应字节数、信号采样点数
+- 热点计时: RFSignalProcessor 方法的调用耗时与产出采样点数
+- 阶段拆分: compute（NumPy计算）/ serialize（数组转换与编码）/ other（参数解析等）
+- /metrics: Prometheus 文本格式输出
+- Server-Timing: 设置 RFVISION_SERVER_TIMING=1，或请求携带 ?timing=1 时返回
+
+阶段耗时记录在 request.environ 中，因此在执行器线程中运行的视图同样可以累计。
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from flask import has_request_context, request
+
+PROMETHEUS_MIMETYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+SAMPLES_BUCKETS = (100, 500, 1000, 2000, 5000, 10000, 50000, 100000, 1000000)
+
+_TIMINGS_KEY = 'rfvision.timings'
+_SAMPLES_KEY = 'rfvision.samples'
+_START_KEY = 'rfvision.start'
+
+
+class Histogram:
+    """按标签分组的累积直方图"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...],
+                 buckets: Iterable[float]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple, list] = {}
+
+    def observe(self, labels: Tuple, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [np.zeros(len(self.buckets), dtype=np.int64), 0.0, 0]
+        series[0][np.searchsorted(self.buckets, value, side='left'):] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> Iterable[str]:
+        yield f'# HELP {self.name} {self.help_text}'
+        yield f'# TYPE {self.name} histogram'
+        for labels, (counts, total, count) in sorted(self._series.items()):
+            base = _format_labels(self.label_names, labels)
+            bounds = [f'{bound:g}' for bound in self.buckets] + ['+Inf']
+            for bound, bucket_count in zip(bounds, list(counts) + [count]):
+                yield f'{self.name}_bucket{{{base},le="{bound}"}} {bucket_count}'
+            yield f'{self.name}_sum{{{base}}} {total:.9g}'
+            yield f'{self.name}_count{{{base}}} {count}'
+
+
+class Counter:
+    """按标签分组的计数器"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, labels: Tuple, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield f'# HELP {self.name} {self.help_text}'
+        yield f'# TYPE {self.name} counter'
+        for labels, value in sorted(self._values.items()):
+            yield f'{self.name}{{{_format_labels(self.label_names, labels)}}} {value:g}'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple) -> str:
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+class MetricsRegistry:
+    """RFVision 指标集合（线程安全）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = Counter('rfvision_requests_total', '处理的HTTP请求数',
+                                ('route', 'method', 'status'))
+        self.latency = Histogram('rfvision_request_duration_seconds', '请求总耗时',
+                                 ('route', 'method'), LATENCY_BUCKETS)
+        self.phases = Histogram('rfvision_request_phase_seconds', '请求各阶段耗时',
+                                ('route', 'phase'), LATENCY_BUCKETS)
+        self.payload = Histogram('rfvision_response_bytes', '响应体字节数',
+                                 ('route',), BYTES_BUCKETS)
+        self.samples = Histogram('rfvision_response_samples', '单个请求生成的最大信号采样点数',
+                                 ('route',), SAMPLES_BUCKETS)
+        self.method_latency = Histogram('rfvision_processor_method_seconds',
+                                        'RFSignalProcessor 方法耗时', ('method',), LATENCY_BUCKETS)
+        self.method_samples = Counter('rfvision_processor_samples_total',
+                                      'RFSignalProcessor 方法产出的采样点总数', ('method',))
+        self._gauges: Dict[str, Callable[[], Dict]] = {}
+
+    def observe_request(self, route: str, method: str, status: int, duration: float,
+                        phases: Dict[str, float], payload_bytes: Optional[int],
+                        samples: int) -> None:
+        with self._lock:
+            self.requests.inc((route, method, str(status)))
+            self.latency.observe((route, method), duration)
+            for phase, value in phases.items():
+                self.phases.observe((route, phase), value)
+            if payload_bytes is not None:
+                self.payload.observe((route,), payload_bytes)
+            if samples:
+                self.samples.observe((route,), samples)
+
+    def observe_method(self, name: str, duration: float, samples: int) -> None:
+        with self._lock:
+            self.method_latency.observe((name,), duration)
+            self.method_samples.inc((name,), samples)
+
+    def register_gauges(self, prefix: str, collect: Callable[[], Dict]) -> None:
+        """注册以字典形式提供数值的仪表（如执行器、信号存储的统计信息）"""
+        self._gauges[prefix] = collect
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for metric in (self.requests, self.latency, self.phases, self.payload,
+                           self.samples, self.method_latency, self.method_samples):
+                lines.extend(metric.render())
+        for prefix, collect in self._gauges.items():
+            for key, value in collect().items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    name = f'rfvision_{prefix}_{key}'
+                    lines.append(f'# TYPE {name} gauge')
+                    lines.append(f'{name} {value:g}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+_local = threading.local()
+
+
+def _timings() -> Optional[Dict[str, float]]:
+    if not has_request_context():
+        return None
+    return request.environ.setdefault(_TIMINGS_KEY, {})
+
+
+def record_phase(name: str, duration: float) -> None:
+    """将耗时累计到当前请求的指定阶段"""
+    timings = _timings()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + duration
+
+
+@contextmanager
+def phase(name: str):
+    """计时上下文：累计到当前请求的阶段耗时"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - start)
+
+
+def _result_samples(result) -> int:
+    """估计方法结果中的信号采样点数（最大数组长度）"""
+    if isinstance(result, np.ndarray):
+        return int(result.size)
+    if isinstance(result, dict):
+        return max((int(value.size) for value in result.values()
+                    if isinstance(value, np.ndarray)), default=0)
+    return 0
+
+
+def instrumented(method: Callable) -> Callable:
+    """RFSignalProcessor 方法计时装饰器
+
+    只有最外层调用计入请求的 compute 阶段，避免嵌套调用重复累计。
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        depth = getattr(_local, 'depth', 0)
+        _local.depth = depth + 1
+        start = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        finally:
+            _local.depth = depth
+        duration = time.perf_counter() - start
+
+        samples = _result_samples(result)
+        REGISTRY.observe_method(name, duration, samples)
+        if depth == 0:
+            record_phase('compute', duration)
+        if samples and has_request_context():
+            environ = request.environ
+            environ[_SAMPLES_KEY] = max(environ.get(_SAMPLES_KEY, 0), samples)
+        return result
+    return wrapper
+
+
+def server_timing_enabled() -> bool:
+    return os.environ.get('RFVISION_SERVER_TIMING') == '1' or request.args.get('timing') == '1'
+
+
+def init_app(app) -> None:
+    """注册请求中间件与 /metrics 路由"""
+
+    @app.before_request
+    def _start_timer():
+        request.environ[_START_KEY] = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        start = request.environ.get(_START_KEY)
+        if start is None or request.endpoint == 'static':
+            return response
+        duration = time.perf_counter() - start
+        phases = dict(request.environ.get(_TIMINGS_KEY, {}))
+        phases['other'] = max(0.0, duration - sum(phases.values()))
+
+        payload_bytes = None if response.is_streamed else response.calculate_content_length()
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        REGISTRY.observe_request(route, request.method, response.status_code, duration,
+                                 phases, payload_bytes, request.environ.get(_SAMPLES_KEY, 0))
+
+        if server_timing_enabled():
+            entries = [f'{name};dur={value * 1000:.3f}' for name, value in phases.items()]
+            entries.append(f'total;dur={duration * 1000:.3f}')
+            response.headers['Server-Timing'] = ', '.join(entries)
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        return app.response_class(REGISTRY.render(), content_type=PROMETHEUS_MIMETYPE)
@@ -0,0 +1,154 @@
+"""
+RFVision - 数控振荡器（NCO，相位累加器 + 正弦查找表）
+
+生成器原先每次都新建 float64 时间轴再计算 np.cos(2πft)。这里改用直接数字频率合成：
+- 32 位无符号相位累加器，每个采样加一个调谐字 round(f/fs·2^32)，溢出即按 2π 自然回绕；
+  每块的起始相位由未取整的调谐字精确推算，调谐字取整误差不会在块间累积，
+  任意长度或分段连续生成都不会损失相位精度
+- 累加器高 table_bits 位（四舍五入）索引量化的余弦查找表，不再逐采样计算三角函数；
+  默认 16 位查找表的幅度误差不超过 π/2^16 ≈ 5e-5
+- 查找表按 (位数, dtype) 全局共享且只读，可选 float32 输出
+- 按固定长度的块生成，累加器暂存区在块间与调用间复用；调用方可通过 out= 传入预分配的输出缓冲区
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+ACCUMULATOR_BITS = 32
+ACCUMULATOR_SIZE = 1 << ACCUMULATOR_BITS
+
+DEFAULT_TABLE_BITS = 16
+
+# 每块的采样数：暂存区与共享的采样序号都只有这么长，保持在缓存内
+BLOCK_SIZE = 1 << 16
+
+QUARTER_TURN = ACCUMULATOR_SIZE // 4
+
+SUPPORTED_DTYPES = (np.float32, np.float64)
+
+_RAMP = np.arange(BLOCK_SIZE, dtype=np.uint32)
+_RAMP.setflags(write=False)
+
+_tables: Dict[Tuple[int, str], np.ndarray] = {}
+_tables_lock = threading.Lock()
+
+
+def cosine_table(table_bits: int = DEFAULT_TABLE_BITS, dtype=np.float64) -> np.ndarray:
+    """一个完整周期的余弦查找表（2^table_bits 项，只读，按位数和 dtype 共享）"""
+    dtype = np.dtype(dtype)
+    if not 2 <= table_bits <= 20:
+        raise ValueError('table_bits must be in 2..20')
+    key = (table_bits, dtype.str)
+    with _tables_lock:
+        table = _tables.get(key)
+        if table is None:
+            size = 1 << table_bits
+            table = np.cos(2 * np.pi * np.arange(size) / size).astype(dtype)
+            table.setflags(write=False)
+            _tables[key] = table
+        return table
+
+
+def tuning_word(frequency: float, sampling_rate: float) -> float:
+    """频率对应的每采样相位增量（累加器单位，未取整，按 2^32 取模，负频率同样适用）"""
+    return (frequency / sampling_rate * ACCUMULATOR_SIZE) % ACCUMULATOR_SIZE
+
+
+def is_uniform(time: np.ndarray, rtol: float = 1e-6) -> bool:
+    """时间轴是否等间隔（NCO 只能合成等间隔采样）
+
+    float32 时间轴的每个采样本身带有约 1 ulp 的舍入，容差相应放宽。
+    """
+    time = np.asarray(time)
+    if time.ndim != 1 or time.size < 2 or time[-1] == time[0]:
+        return False
+    start, stop = float(time[0]), float(time[-1])
+    step = (stop - start) / (time.size - 1)
+    tolerance = rtol * abs(step)
+    if time.dtype == np.float32:
+        tolerance += 2 * float(np.finfo(np.float32).eps) * max(abs(start), abs(stop))
+    return bool(np.all(np.abs(np.diff(time.astype(np.float64)) - step) <= tolerance))
+
+
+def phase_word(phase: float) -> float:
+    """弧度相位对应的累加器值（未取整）"""
+    return (phase / (2 * np.pi) * ACCUMULATOR_SIZE) % ACCUMULATOR_SIZE
+
+
+class NCO:
+    """数控振荡器：每次调用接着上次的相位继续生成
+
+    同一实例在调用之间保存相位状态，不是线程安全的，每个信号流使用各自的实例。
+    """
+
+    def __init__(self, frequency: float, sampling_rate: float, phase: float = 0.0,
+                 dtype=np.float64, table_bits: int = DEFAULT_TABLE_BITS):
+        if sampling_rate <= 0:
+            raise ValueError('sampling_rate must be positive')
+        self.dtype = np.dtype(dtype)
+        if self.dtype.type not in SUPPORTED_DTYPES:
+            raise ValueError(f'Unsupported dtype: {self.dtype}')
+        self.sampling_rate = float(sampling_rate)
+        self.table_bits = table_bits
+        self.table = cosine_table(table_bits, self.dtype)
+        # 索引取累加器高位前先加半个表项，实现四舍五入
+        self._shift = ACCUMULATOR_BITS - table_bits
+        self._rounding = 1 << (self._shift - 1)
+        self._accumulator = phase_word(phase)
+        self._scratch = np.empty(0, dtype=np.uint32)
+        self.retune(frequency)
+
+    @classmethod
+    def for_time_axis(cls, frequency: float, time, phase: float = 0.0, **kwargs) -> 'NCO':
+        """按均匀时间轴（如 np.linspace 的结果）创建，使生成结果与 cos(2πf·t + phase) 对齐"""
+        time = np.asarray(time)
+        if time.size < 2 or time[-1] == time[0]:
+            raise ValueError('time axis must contain at least two distinct samples')
+        sampling_rate = (time.size - 1) / float(time[-1] - time[0])
+        return cls(frequency, sampling_rate, phase=phase + 2 * np.pi * frequency * float(time[0]),
+                   **kwargs)
+
+    @property
+    def phase(self) -> float:
+        """当前相位（弧度，[0, 2π)）"""
+        return 2 * np.pi * self._accumulator / ACCUMULATOR_SIZE
+
+    def retune(self, frequency: float) -> None:
+        """改变频率，相位保持连续"""
+        self.frequency = float(frequency)
+        self._step = tuning_word(self.frequency, self.sampling_rate)
+
+    def reset(self, phase: float = 0.0) -> None:
+        self._accumulator = phase_word(phase)
+
+    def _render(self, count: int, out: Optional[np.ndarray], offset: int) -> np.ndarray:
+        if out is None:
+            out = np.empty(count, dtype=self.dtype)
+        elif out.shape != (count,) or out.dtype != self.dtype:
+            raise ValueError(f'out must be a ({count},) {self.dtype} array')
+
+        if self._scratch.size < min(count, BLOCK_SIZE):
+            self._scratch = np.empty(min(count, BLOCK_SIZE), dtype=np.uint32)
+        step = np.uint32(round(self._step) % ACCUMULATOR_SIZE)
+        start = self._accumulator + offset + self._rounding
+        for begin in range(0, count, BLOCK_SIZE):
+            block = min(BLOCK_SIZE, count - begin)
+            accumulator = self._scratch[:block]
+            # 块内 acc[k] = acc0 + k·step（uint32 运算按 2^32 回绕），acc0 由精确相位取整
+            np.multiply(_RAMP[:block], step, out=accumulator)
+            accumulator += np.uint32(int(start + begin * self._step) % ACCUMULATOR_SIZE)
+            accumulator >>= self._shift
+            np.take(self.table, accumulator, out=out[begin:begin + block], mode='clip')
+
+        self._accumulator = (self._accumulator + count * self._step) % ACCUMULATOR_SIZE
+        return out
+
+    def cos(self, count: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """接下来 count 个采样的 cos(φ)，并推进相位"""
+        return self._render(count, out, 0)
+
+    def sin(self, count: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """接下来 count 个采样的 sin(φ) = cos(φ - π/2)，并推进相位"""
+        return self._render(count, out, ACCUMULATOR_SIZE - QUARTER_TURN)
@@ -0,0 +1,304 @@
+"""
+RFVision - 相位连续的实时波形流（Server-Sent Events）
+
+动画页面原先每一帧都重新请求整段 2 秒信号。这里改为逐帧推送固定长度的采样块：
+- 载波与调制音各由一个相位累加器驱动，相位在帧之间延续（按 2π 取模，长时间运行不损失精度），
+  因此相邻帧首尾无缝衔接
+- CARRIER / AM 的纯载波由查表 NCO（nco.py）从当前相位合成，写入复用的帧缓冲区
+- FM 对瞬时频率 fc + Δf·cos(φm) 逐帧精确积分，参数在流中途改变时载波相位依然连续
+- 参数更新（POST /api/waveform-stream/<stream_id>）在下一帧边界生效
+- 每帧的负载只与帧长有关，与演示持续时间无关
+- 响应关闭（含 HEAD 请求、响应未被读取、客户端断开）时注销流；超过空闲时限
+  没有产出帧的流在下次打开新流时被回收，避免泄漏的流占满并发名额
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+
+from nco import NCO
+from transport import to_jsonable
+
+SSE_MIMETYPE = 'text/event-stream'
+
+STREAM_TYPES = ('CARRIER', 'AM', 'FM', 'PM')
+
+DEFAULT_PARAMETERS = {
+    'carrier_freq': 50.0,
+    'mod_freq': 5.0,
+    'mod_depth': 0.5,
+    'freq_dev': 10.0,
+    'phase_dev': np.pi / 4,
+    'amplitude': 1.0,
+}
+
+# 与 /api/generate_carrier 的参数名保持兼容
+PARAMETER_ALIASES = {'frequency': 'carrier_freq'}
+
+DEFAULT_FRAME_SIZE = 256
+MAX_FRAME_SIZE = 8192
+
+# 帧间隔上下限（秒）：下限防止客户端把流变成忙循环，上限须小于空闲回收时限
+MIN_INTERVAL = 0.01
+MAX_INTERVAL = 10.0
+
+# 流超过该时长（秒）没有产出帧即视为已断开，可被回收
+DEFAULT_IDLE_TIMEOUT = 60.0
+
+# 流数量达到上限时建议客户端的重试间隔（秒）；流是长连接，名额不会像计算任务那样很快释放
+DEFAULT_STREAM_RETRY_AFTER = 5
+
+# 输出保留的小数位数，缩短每帧的JSON长度
+OUTPUT_DECIMALS = 6
+
+TWO_PI = 2 * np.pi
+
+
+class TooManyStreams(Exception):
+    """同时打开的波形流数量达到上限"""
+
+
+def _validate_parameters(updates: Dict) -> Dict:
+    """校验参数更新，返回规范化后的字典（type 大写，其余为浮点数）"""
+    parameters = {}
+    for key, value in updates.items():
+        key = PARAMETER_ALIASES.get(key, key)
+        if key == 'type':
+            value = str(value).upper()
+            if value not in STREAM_TYPES:
+                raise ValueError(f'Unsupported waveform type: {value}')
+        elif key in DEFAULT_PARAMETERS:
+            value = float(value)
+            if not np.isfinite(value):
+                raise ValueError(f'{key} must be finite')
+        else:
+            continue
+        parameters[key] = value
+    return parameters
+
+
+class PhaseOscillator:
+    """帧式波形发生器：载波与调制音的相位在帧之间连续"""
+
+    def __init__(self, waveform_type: str, sampling_rate: float,
+                 frame_size: int = DEFAULT_FRAME_SIZE, **parameters):
+        if not 0 < frame_size <= MAX_FRAME_SIZE:
+            raise ValueError(f'frame_size must be in 1..{MAX_FRAME_SIZE}')
+        self.sampling_rate = float(sampling_rate)
+        self.frame_size = int(frame_size)
+        self.parameters = dict(DEFAULT_PARAMETERS, type='CARRIER')
+        self.parameters.update(_validate_parameters(dict(parameters, type=waveform_type)))
+
+        self.carrier_phase = 0.0
+        self.message_phase = 0.0
+        self.sample_offset = 0
+        self.frame_index = 0
+        self._pending: Dict = {}
+        self._lock = threading.Lock()
+        self._steps = np.arange(self.frame_size)
+        # 纯载波（CARRIER / AM）由查表 NCO 合成，写入复用的帧缓冲区
+        self._nco = NCO(self.parameters['carrier_freq'], self.sampling_rate)
+        self._carrier_buffer = np.empty(self.frame_size)
+
+    def update(self, **updates) -> Dict:
+        """登记参数更新（下一帧边界生效），返回更新后的完整参数"""
+        parameters = _validate_parameters(updates)
+        with self._lock:
+            self._pending.update(parameters)
+            return dict(self.parameters, **self._pending)
+
+    def next_frame(self) -> Dict:
+        """生成下一帧，并推进两个相位累加器"""
+        with self._lock:
+            self.parameters.update(self._pending)
+            self._pending.clear()
+            parameters = dict(self.parameters)
+
+        fs, n, k = self.sampling_rate, self.frame_size, self._steps
+        waveform_type = parameters['type']
+        carrier_freq = parameters['carrier_freq']
+
+        # 调制音：φm[k] = φm0 + 2π·fm·k/fs
+        mod_freq = parameters['mod_freq']
+        message_step = TWO_PI * mod_freq / fs
+        message_phase = self.message_phase + message_step * k
+        message_end = self.message_phase + message_step * n
+        message = np.cos(message_phase)
+
+        carrier_step = TWO_PI * carrier_freq / fs
+        carrier_end = self.carrier_phase + carrier_step * n
+        if waveform_type in ('CARRIER', 'AM'):
+            self._nco.retune(carrier_freq)
+            self._nco.reset(self.carrier_phase)
+            carrier = self._nco.cos(n, out=self._carrier_buffer)
+        else:
+            carrier_phase = self.carrier_phase + carrier_step * k
+        if waveform_type == 'FM':
+            # 瞬时频率 fc + Δf·cos(φm) 的精确积分：相位增量为 β·(sin φm[k] - sin φm0)，β = Δf/fm，
+            # 从本帧起点开始积分，因此 Δf、fm 中途改变时载波相位仍然连续
+            freq_dev = parameters['freq_dev']
+            if mod_freq:
+                beta = freq_dev / mod_freq
+                start = np.sin(self.message_phase)
+                carrier_phase += beta * (np.sin(message_phase) - start)
+                carrier_end += beta * (np.sin(message_end) - start)
+            else:
+                deviation_step = TWO_PI * freq_dev * message[0] / fs
+                carrier_phase += deviation_step * k
+                carrier_end += deviation_step * n
+
+        self.message_phase = message_end % TWO_PI
+        self.carrier_phase = carrier_end % TWO_PI
+
+        if waveform_type == 'AM':
+            signal = (1 + parameters['mod_depth'] * message) * carrier
+        elif waveform_type == 'PM':
+            signal = np.cos(carrier_phase + parameters['phase_dev'] * message)
+        elif waveform_type == 'FM':
+            signal = np.cos(carrier_phase)
+        else:
+            signal = carrier.copy()
+        signal *= parameters['amplitude']
+
+        frame = {
+            'frame': self.frame_index,
+            'sample_offset': self.sample_offset,
+            'time': (self.sample_offset + k) / fs,
+            'signal': np.round(signal, OUTPUT_DECIMALS),
+            'message': np.round(message, OUTPUT_DECIMALS),
+            'parameters': parameters,
+            'type': waveform_type,
+        }
+        self.sample_offset += n
+        self.frame_index += 1
+        return frame
+
+
+class WaveformStreams:
+    """活动波形流的注册表（线程安全），供参数更新接口按 stream_id 查找
+
+    每个流记录最后一次产出帧的时刻；打开新流时先回收空闲超过 idle_timeout 的流。
+    """
+
+    def __init__(self, max_streams: int = 32, idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 retry_after: int = DEFAULT_STREAM_RETRY_AFTER):
+        self.max_streams = max_streams
+        self.retry_after = retry_after
+        # 正常运行的流每 MAX_INTERVAL 秒内至少产出一帧，时限不能比它短
+        self.idle_timeout = max(idle_timeout, 2 * MAX_INTERVAL)
+        self._streams: Dict[str, PhaseOscillator] = {}
+        self._last_active: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.rejected = 0
+        self.reaped = 0
+
+    @classmethod
+    def from_env(cls) -> 'WaveformStreams':
+        """根据环境变量 RFVISION_MAX_STREAMS / RFVISION_STREAM_IDLE_TIMEOUT /
+        RFVISION_STREAM_RETRY_AFTER 创建"""
+        return cls(int(os.environ.get('RFVISION_MAX_STREAMS', 32)),
+                   float(os.environ.get('RFVISION_STREAM_IDLE_TIMEOUT', DEFAULT_IDLE_TIMEOUT)),
+                   int(os.environ.get('RFVISION_STREAM_RETRY_AFTER',
+                                      DEFAULT_STREAM_RETRY_AFTER)))
+
+    def _reap(self, now: float) -> None:
+        """回收空闲超时的流（调用方持有锁）"""
+        expired = [stream_id for stream_id, last_active in self._last_active.items()
+                   if now - last_active > self.idle_timeout]
+        for stream_id in expired:
+            del self._streams[stream_id], self._last_active[stream_id]
+        self.reaped += len(expired)
+
+    def open(self, oscillator: PhaseOscillator) -> str:
+        now = time.monotonic()
+        with self._lock:
+            self._reap(now)
+            if len(self._streams) >= self.max_streams:
+                self.rejected += 1
+                raise TooManyStreams()
+            stream_id = uuid.uuid4().hex
+            self._streams[stream_id] = oscillator
+            self._last_active[stream_id] = now
+            self.opened += 1
+            return stream_id
+
+    def get(self, stream_id: str) -> PhaseOscillator:
+        """按ID查找，不存在（已结束）时抛出 KeyError"""
+        with self._lock:
+            return self._streams[stream_id]
+
+    def touch(self, stream_id: str) -> bool:
+        """记录流仍在产出帧；流已被关闭或回收时返回 False"""
+        with self._lock:
+            if stream_id not in self._streams:
+                return False
+            self._last_active[stream_id] = time.monotonic()
+            return True
+
+    def close(self, stream_id: str) -> bool:
+        with self._lock:
+            self._last_active.pop(stream_id, None)
+            return self._streams.pop(stream_id, None) is not None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'active': len(self._streams),
+                'max_streams': self.max_streams,
+                'idle_timeout': self.idle_timeout,
+                'opened': self.opened,
+                'rejected': self.rejected,
+                'reaped': self.reaped,
+            }
+
+
+def _event(data: Dict, event: Optional[str] = None, event_id: Optional[int] = None) -> str:
+    """格式化一条SSE事件"""
+    lines = []
+    if event:
+        lines.append(f'event: {event}')
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append('data: ' + json.dumps(to_jsonable(data), separators=(',', ':')))
+    return '\n'.join(lines) + '\n\n'
+
+
+def sse_frames(streams: WaveformStreams, stream_id: str, interval: float,
+               max_frames: int = 0) -> Iterator[str]:
+    """按固定间隔产出波形帧事件；客户端断开或达到帧数上限时注销该流
+
+    流被 DELETE 关闭或因空闲被回收后，在下一帧边界结束。
+    """
+    try:
+        oscillator = streams.get(stream_id)
+    except KeyError:
+        return
+    try:
+        yield _event({'stream_id': stream_id,
+                      'sampling_rate': oscillator.sampling_rate,
+                      'frame_size': oscillator.frame_size,
+                      'interval': interval,
+                      'parameters': oscillator.parameters}, event='session')
+        deadline = time.monotonic()
+        while not max_frames or oscillator.frame_index < max_frames:
+            # 按绝对时刻调度，避免逐帧累积延迟
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                deadline = time.monotonic()
+            if not streams.touch(stream_id):
+                break
+            frame = oscillator.next_frame()
+            yield _event(frame, event_id=frame['frame'])
+            deadline += interval
+        yield _event({'frames': oscillator.frame_index,
+                      'samples': oscillator.sample_offset}, event='done')
+    finally:
+        streams.close(stream_id)
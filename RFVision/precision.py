@@ -0,0 +1,67 @@
+"""
+RFVision - 计算精度模式（float64 / float32）
+
+可视化与误码率统计并不需要 float64 的精度。float32 模式下：
+- 时间轴、信号、噪声、频谱、解调统计量均为 float32，复数中间量（解析信号、衰落增益）为 complex64，
+  内存占用与二进制传输量减半
+- 比特判决结果一直是 uint8
+- 相位先在 float64 中计算并按周期取模，再转为 float32 求三角函数，长信号的相位不会因 float32 而漂移
+- 累积和（滑动平均）在 float64 中累加，避免长序列的舍入误差累积
+
+各辅助模块（spectrum / baseband / demodulation / channel）保持输入的精度：
+float32 输入得到 float32 结果，其余输入按 float64 处理。
+"""
+
+import os
+from typing import Tuple
+
+import numpy as np
+
+PRECISION_MODES = {
+    'float64': (np.dtype(np.float64), np.dtype(np.complex128)),
+    'float32': (np.dtype(np.float32), np.dtype(np.complex64)),
+}
+
+DEFAULT_PRECISION = 'float64'
+
+
+def resolve_precision(name: str) -> Tuple[np.dtype, np.dtype]:
+    """精度模式名 → (实数 dtype, 复数 dtype)"""
+    try:
+        return PRECISION_MODES[str(name).lower()]
+    except KeyError:
+        raise ValueError(f'Unsupported precision: {name}') from None
+
+
+def precision_from_env() -> str:
+    """环境变量 RFVISION_PRECISION 指定的精度模式（默认 float64）"""
+    name = os.environ.get('RFVISION_PRECISION', DEFAULT_PRECISION).lower()
+    resolve_precision(name)
+    return name
+
+
+def float_dtype(values) -> np.dtype:
+    """保持 float32，其余一律按 float64 计算"""
+    if getattr(values, 'dtype', None) == np.float32:
+        return np.dtype(np.float32)
+    return np.dtype(np.float64)
+
+
+def as_float(values) -> np.ndarray:
+    """转换为浮点数组，保持 float32 输入的精度"""
+    return np.asarray(values, dtype=float_dtype(values))
+
+
+def complex_dtype(dtype) -> np.dtype:
+    """与实数 dtype 精度相同的复数 dtype"""
+    return np.dtype(np.complex64 if np.dtype(dtype) == np.float32 else np.complex128)
+
+
+def wrapped_cos(cycles: np.ndarray, dtype) -> np.ndarray:
+    """cos(2π·cycles)：周期数在 float64 中取小数部分，再以目标精度求余弦"""
+    dtype = np.dtype(dtype)
+    cycles = np.asarray(cycles, dtype=np.float64)
+    if dtype == np.float64:
+        return np.cos(2 * np.pi * cycles)
+    fraction = cycles - np.floor(cycles)
+    return np.cos((2 * np.pi * fraction).astype(dtype))
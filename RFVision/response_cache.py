@@ -0,0 +1,198 @@
+"""
+RFVision - 确定性路由的响应缓存
+
+信号生成类接口是查询参数的纯函数，滑块页面会以相同参数反复请求。
+这里缓存序列化后的完整响应体：
+- 缓存键: 路由 + 规范化的查询参数/JSON请求体（JSON 数值统一为浮点，字符串保持原样）
+  + 协商的传输格式
+- 容量: 同时按条目数与总字节数限制，超出时按LRU淘汰
+- 强ETag（响应体SHA-1），If-None-Match 命中时返回 304
+- Cache-Control 允许浏览器与反向代理缓存重复请求
+- 命中/未命中/淘汰统计
+
+响应引用了信号存储中的 signal_id 时，命中前会确认这些信号仍然存在，
+否则按未命中重新计算（确定性路由使用稳定ID，重新计算后响应体与ETag不变）。
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from flask import current_app, request
+
+from transport import negotiate_format, requested_max_points
+
+# 视图在 request.environ 中登记其响应所引用的 signal_id
+SIGNAL_IDS_KEY = 'rfvision.signal_ids'
+
+# 不参与缓存键的查询参数
+_VOLATILE_ARGS = ('timing',)
+
+_HOP_HEADERS = ('Content-Length', 'Date', 'Server-Timing', 'X-Cache')
+
+
+def _normalize(value: Any) -> Any:
+    """规范化参数值：JSON 数值统一为浮点，容器递归处理
+
+    字符串保持原样：文本、比特串等路由按字符串解释参数，"1"、"01"、"1.0" 是不同的输入。
+    """
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return str(value)
+
+
+def cache_key(req) -> str:
+    """由当前请求计算缓存键"""
+    args = {key: _normalize(value) for key, value in req.args.items()
+            if key not in _VOLATILE_ARGS and key not in ('format', 'max_points')}
+    body = req.get_json(silent=True) if req.is_json else None
+    if isinstance(body, dict):
+        body = {key: value for key, value in body.items() if key != 'max_points'}
+    float_dtype = negotiate_format(req)
+    material = json.dumps({
+        'path': req.path,
+        'args': args,
+        'body': _normalize(body),
+        'format': None if float_dtype is None else float_dtype.str,
+        'max_points': requested_max_points(req),
+    }, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(material.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """按条目数与字节数双重限制的LRU响应缓存（线程安全）"""
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024,
+                 max_age: int = 300):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._entries: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.not_modified = 0
+
+    @classmethod
+    def from_env(cls) -> 'ResponseCache':
+        """根据环境变量 RFVISION_CACHE_MAX_ENTRIES / RFVISION_CACHE_MAX_MB / RFVISION_CACHE_MAX_AGE 创建"""
+        return cls(int(os.environ.get('RFVISION_CACHE_MAX_ENTRIES', 512)),
+                   int(os.environ.get('RFVISION_CACHE_MAX_MB', 64)) * 1024 * 1024,
+                   int(os.environ.get('RFVISION_CACHE_MAX_AGE', 300)))
+
+    def get(self, key: str, is_valid: Callable[[Iterable[str]], bool]) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not is_valid(entry['signal_ids']):
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, entry: Dict) -> None:
+        size = len(entry['body'])
+        if size > self.max_bytes:
+            return
+        entry['size'] = size
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._total_bytes += size
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or self._total_bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        """删除条目（调用方持有锁）"""
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry['size']
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'not_modified': self.not_modified,
+            }
+
+
+def record_signal_id(signal_id: str) -> None:
+    """登记当前响应引用的 signal_id"""
+    request.environ.setdefault(SIGNAL_IDS_KEY, []).append(signal_id)
+
+
+def cached(cache: ResponseCache, signal_exists: Callable[[str], bool]) -> Callable:
+    """路由装饰器：缓存成功响应，并处理 ETag / If-None-Match / Cache-Control"""
+    def is_valid(signal_ids: Iterable[str]) -> bool:
+        return all(signal_exists(signal_id) for signal_id in signal_ids)
+
+    def finalize(response, etag: str, status: str):
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = cache.max_age
+        response.headers['X-Cache'] = status
+        if request.if_none_match.contains(etag):
+            with cache._lock:
+                cache.not_modified += 1
+            response.status_code = 304
+            response.set_data(b'')
+        return response
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = cache_key(request)
+            entry = cache.get(key, is_valid)
+            if entry is not None:
+                response = current_app.response_class(entry['body'], status=200,
+                                                      headers=entry['headers'])
+                return finalize(response, entry['etag'], 'HIT')
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+
+            body = response.get_data()
+            etag = hashlib.sha1(body).hexdigest()
+            headers = [(name, value) for name, value in response.headers.items()
+                       if name not in _HOP_HEADERS]
+            cache.put(key, {
+                'body': body,
+                'headers': headers,
+                'etag': etag,
+                'signal_ids': tuple(request.environ.get(SIGNAL_IDS_KEY, ())),
+            })
+            return finalize(response, etag, 'MISS')
+        return wrapper
+    return decorator
@@ -0,0 +1,114 @@
+"""
+RFVision - 服务端信号存储
+
+生成类接口把信号以NumPy数组形式保存在进程内，并返回 signal_id；
+信道仿真、解调、频谱分析等后续步骤直接引用该ID，
+无需浏览器把整段信号再以JSON列表上传一次。
+
+存储按条目数和总字节数双重限制，超出时按LRU顺序淘汰；
+存入的数组被设置为只读，防止被后续处理就地修改。
+"""
+
+import hashlib
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+from precision import as_float
+
+
+def _readonly(values) -> np.ndarray:
+    """返回数组的只读视图（不复制数据，float32 信号保持 float32）"""
+    view = as_float(values).view()
+    view.setflags(write=False)
+    return view
+
+
+class SignalStore:
+    """有界LRU信号存储（线程安全）"""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> 'SignalStore':
+        """根据环境变量 RFVISION_STORE_MAX_ENTRIES / RFVISION_STORE_MAX_MB 创建"""
+        return cls(int(os.environ.get('RFVISION_STORE_MAX_ENTRIES', 256)),
+                   int(os.environ.get('RFVISION_STORE_MAX_MB', 256)) * 1024 * 1024)
+
+    @staticmethod
+    def stable_id(*parts) -> str:
+        """由生成参数得到确定性的 signal_id（相同参数的纯函数结果共用同一ID）"""
+        return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+    def put(self, signal, time=None, signal_id: Optional[str] = None, **meta) -> str:
+        """保存信号（及其时间轴和元数据），返回 signal_id
+
+        未指定 signal_id 时生成随机ID；指定时覆盖同ID的旧条目。
+        """
+        signal = _readonly(signal)
+        if time is not None:
+            time = _readonly(time)
+
+        entry = {'signal': signal, 'time': time, 'meta': meta}
+        size = signal.nbytes + (time.nbytes if time is not None else 0)
+        if size > self.max_bytes:
+            raise ValueError('信号过大，无法保存到信号存储')
+
+        signal_id = signal_id or uuid.uuid4().hex
+        with self._lock:
+            if signal_id in self._entries:
+                del self._entries[signal_id]
+                self._total_bytes -= self._sizes.pop(signal_id)
+            self._entries[signal_id] = entry
+            self._sizes[signal_id] = size
+            self._total_bytes += size
+            self._evict()
+        return signal_id
+
+    def get(self, signal_id: str) -> Dict:
+        """按ID读取信号，不存在或已被淘汰时抛出 KeyError"""
+        with self._lock:
+            entry = self._entries[signal_id]
+            self._entries.move_to_end(signal_id)
+            return entry
+
+    def discard(self, signal_id: str) -> None:
+        """删除指定信号"""
+        with self._lock:
+            if signal_id in self._entries:
+                del self._entries[signal_id]
+                self._total_bytes -= self._sizes.pop(signal_id)
+
+    def _evict(self) -> None:
+        """淘汰最久未使用的条目，直至满足容量限制（调用方持有锁）"""
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self._total_bytes > self.max_bytes):
+            signal_id, _ = self._entries.popitem(last=False)
+            self._total_bytes -= self._sizes.pop(signal_id)
+            self.evictions += 1
+
+    def stats(self) -> Dict:
+        """存储统计信息"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions,
+            }
+
+    def __contains__(self, signal_id: Optional[str]) -> bool:
+        with self._lock:
+            return signal_id in self._entries
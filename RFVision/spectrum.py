@@ -0,0 +1,162 @@
+"""
+RFVision - 频谱分析引擎
+
+- 实数信号使用 rfft，只计算非负频率，计算量约为复数FFT的一半
+- FFT长度补零到 2^a·3^b·5^c 的"快速长度"
+- 可选窗函数（矩形/汉宁/汉明/布莱克曼/巴特利特/凯泽）
+- Welch 平均功率谱密度，适合长信号和含噪信号
+- 批量模式：(signals, samples) 二维输入在一次 rfft 调用中完成
+"""
+
+from functools import lru_cache
+from typing import Dict, Optional, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from precision import as_float
+
+WINDOWS = ('rectangular', 'hann', 'hamming', 'blackman', 'bartlett', 'kaiser')
+
+# 单次分析允许的最大FFT长度
+MAX_NFFT = 1 << 22
+
+NfftLike = Union[None, int, str]
+
+
+@lru_cache(maxsize=256)
+def next_fast_len(n: int) -> int:
+    """不小于 n 的最小 5-smooth 数 (2^a·3^b·5^c)"""
+    if n <= 6:
+        return max(1, n)
+    best = 1 << (n - 1).bit_length()
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            # 用2的幂补足到 >= n
+            quotient = -(-n // power35)
+            candidate = power35 * (1 << (quotient - 1).bit_length())
+            best = min(best, candidate)
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+@lru_cache(maxsize=64)
+def get_window(name: str, length: int) -> np.ndarray:
+    """获取（缓存的、只读的）窗函数"""
+    if name in (None, '', 'none', 'rectangular', 'boxcar'):
+        window = np.ones(length)
+    elif name in ('hann', 'hanning'):
+        window = np.hanning(length)
+    elif name == 'hamming':
+        window = np.hamming(length)
+    elif name == 'blackman':
+        window = np.blackman(length)
+    elif name == 'bartlett':
+        window = np.bartlett(length)
+    elif name == 'kaiser':
+        window = np.kaiser(length, 8.6)
+    else:
+        raise ValueError(f'Unsupported window: {name}')
+    window.setflags(write=False)
+    return window
+
+
+def resolve_nfft(length: int, nfft: NfftLike = 'fast') -> int:
+    """确定FFT长度：None/'none' 为原长，'fast' 为快速长度，整数为指定长度（不小于原长）"""
+    if nfft in (None, 'none', 'exact'):
+        size = length
+    elif nfft == 'fast':
+        size = next_fast_len(length)
+    else:
+        size = max(int(nfft), length)
+    if size > MAX_NFFT:
+        raise ValueError(f'FFT长度超过上限 {MAX_NFFT}')
+    return size
+
+
+def amplitude_spectrum(signals, sampling_rate: float, window: str = 'rectangular',
+                       nfft: NfftLike = 'fast') -> Dict:
+    """单边幅度谱（支持批量）
+
+    signals 为一维信号或 (signals, samples) 二维数组，沿最后一维变换。
+    幅度按窗函数相干增益归一，矩形窗时与 |FFT| 数值一致。
+    float32 输入在 complex64 中变换，结果为 float32。
+    """
+    data = as_float(signals)
+    length = data.shape[-1]
+    size = resolve_nfft(length, nfft)
+
+    taper = get_window(window, length)
+    if window not in (None, '', 'none', 'rectangular', 'boxcar'):
+        data = data * (taper * (length / taper.sum())).astype(data.dtype)
+
+    fft_result = np.fft.rfft(data, n=size, axis=-1)
+    return {
+        'frequencies': np.fft.rfftfreq(size, 1 / sampling_rate).astype(data.dtype, copy=False),
+        'magnitude': np.abs(fft_result),
+        'phase': np.angle(fft_result),
+        'nfft': size,
+        'window': window,
+    }
+
+
+def welch_psd(signals, sampling_rate: float, segment_length: int = 256,
+              overlap: float = 0.5, window: str = 'hann',
+              nfft: NfftLike = 'fast') -> Dict:
+    """Welch 平均功率谱密度（单边，单位 功率/Hz，支持批量）
+
+    信号被切分为重叠的加窗段，所有段在一次 rfft 中变换后取平均。
+    """
+    data = as_float(signals)
+    length = data.shape[-1]
+    segment_length = int(min(max(8, segment_length), length))
+    if not 0 <= overlap < 1:
+        raise ValueError('overlap 必须在 [0, 1) 范围内')
+    step = max(1, int(segment_length * (1 - overlap)))
+    size = resolve_nfft(segment_length, nfft)
+
+    # (..., segments, segment_length) 视图，不复制数据
+    segments = sliding_window_view(data, segment_length, axis=-1)[..., ::step, :]
+    segments = segments - segments.mean(axis=-1, keepdims=True)  # 去均值
+    taper = get_window(window, segment_length)
+
+    fft_result = np.fft.rfft(segments * taper.astype(data.dtype, copy=False), n=size, axis=-1)
+    power = np.mean(np.abs(fft_result) ** 2, axis=-2)
+    psd = power / float(sampling_rate * np.sum(taper ** 2))
+    # 单边谱：除直流（及偶数长度的奈奎斯特点）外功率加倍
+    if size % 2 == 0:
+        psd[..., 1:-1] *= 2
+    else:
+        psd[..., 1:] *= 2
+
+    return {
+        'frequencies': np.fft.rfftfreq(size, 1 / sampling_rate).astype(data.dtype, copy=False),
+        'psd': psd,
+        'psd_db': 10 * np.log10(np.maximum(psd, 1e-20)),
+        'segments': int(segments.shape[-2]),
+        'segment_length': segment_length,
+        'overlap': overlap,
+        'nfft': size,
+        'window': window,
+    }
+
+
+def analyze(signals, sampling_rate: float, method: str = 'fft', window: Optional[str] = None,
+            nfft: NfftLike = 'fast', segment_length: int = 256, overlap: float = 0.5) -> Dict:
+    """统一的频谱分析入口"""
+    if method == 'welch':
+        result = welch_psd(signals, sampling_rate, segment_length, overlap,
+                           window or 'hann', nfft)
+    elif method == 'fft':
+        result = amplitude_spectrum(signals, sampling_rate, window or 'rectangular', nfft)
+        result['magnitude_db'] = 20 * np.log10(np.maximum(result['magnitude'], 1e-12))
+    else:
+        raise ValueError(f'Unsupported spectrum method: {method}')
+
+    result['method'] = method
+    result['sampling_rate'] = sampling_rate
+    result['type'] = 'spectrum'
+    return result
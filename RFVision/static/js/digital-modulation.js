@@ -45,6 +45,7 @@ class DigitalModulationDemo {
         this.maxSteps = 4;
         this.animationSpeed = 1;
         this.currentTime = 0;
+        this.performanceData = null;
         
         // 信号参数
         this.params = {
@@ -706,10 +707,8 @@ class DigitalModulationDemo {
         if (!container) return;
         
         let asciiHtml = '';
-        for (let i = 0; i < text.length; i++) {
-            const char = text[i];
-            const ascii = char.charCodeAt(0);
-            asciiHtml += `<span class="ascii-item">'${char}' → ${ascii}</span>`;
+        for (const char of text) {
+            asciiHtml += `<span class="ascii-item">'${char}' → ${char.codePointAt(0)}</span>`;
         }
         
         container.innerHTML = asciiHtml;
@@ -725,10 +724,9 @@ class DigitalModulationDemo {
         let binaryHtml = '';
         let fullBinary = '';
         
-        for (let i = 0; i < text.length; i++) {
-            const char = text[i];
-            const ascii = char.charCodeAt(0);
-            const binary = ascii.toString(2).padStart(8, '0');
+        // 按码点遍历，每个字符展开为其 UTF-8 字节
+        for (const char of text) {
+            const binary = window.RFVision.DigitalModulation.charToBinary(char);
             fullBinary += binary;
             
             binaryHtml += `<div class="binary-group">
@@ -907,13 +905,48 @@ class DigitalModulationDemo {
         
         ctx.clearRect(0, 0, width, height);
         
-        this.drawPerformanceChart(ctx, width, height);
+        this.drawPerformanceChart(ctx, width, height, this.performanceData);
+        
+        if (!this.performanceData) {
+            this.loadPerformanceData().then(data => {
+                if (!data) return;
+                ctx.clearRect(0, 0, width, height);
+                this.drawPerformanceChart(ctx, width, height, data);
+            });
+        }
+    }
+    
+    /**
+     * 从后端获取蒙特卡洛仿真的误码率曲线
+     */
+    async loadPerformanceData() {
+        const api = window.RFVision && window.RFVision.APIUtils;
+        if (!api) return null;
+        
+        try {
+            const result = await api.request('/api/ber-curve', {}, {
+                body: {
+                    // 逐采样SNR；每比特100个采样，相干接收的处理增益约20dB，
+                    // 因此 -24~-4 dB 对应 Eb/N0 约 -4~16 dB
+                    snr_db: Array.from({length: 11}, (_, i) => i * 2 - 24),
+                    trials: 20,
+                    num_bits: 200,
+                    modulation_types: ['ASK', 'FSK', 'PSK']
+                }
+            });
+            this.performanceData = result;
+            return result;
+        } catch (error) {
+            console.warn('误码率仿真数据获取失败，使用示意曲线:', error);
+            return null;
+        }
     }
     
     /**
      * 绘制性能图表
+     * data: /api/ber-curve 的返回结果；缺省时绘制示意曲线
      */
-    drawPerformanceChart(ctx, width, height) {
+    drawPerformanceChart(ctx, width, height, data = null) {
         const margin = 60;
         const plotWidth = width - 2 * margin;
         const plotHeight = height - 2 * margin;
@@ -927,25 +960,39 @@ class DigitalModulationDemo {
         ctx.lineTo(width - margin, height - margin);
         ctx.stroke();
         
-        // 模拟误码率数据
-        const snrRange = Array.from({length: 21}, (_, i) => i); // 0-20 dB
-        const askBER = snrRange.map(snr => Math.pow(10, -snr/5 - 1));
-        const fskBER = snrRange.map(snr => Math.pow(10, -snr/4 - 1.5));
-        const pskBER = snrRange.map(snr => Math.pow(10, -snr/3 - 2));
-        
-        // 绘制曲线
         const colors = ['#dc3545', '#ffc107', '#28a745'];
         const labels = ['ASK', 'FSK', 'PSK'];
-        const data = [askBER, fskBER, pskBER];
+        let snrRange;
+        let series;
+        
+        if (data && data.curves) {
+            // 蒙特卡洛仿真数据
+            snrRange = Array.from(data.snr_db);
+            series = labels.map(label => data.curves[label] || null);
+        } else {
+            // 示意误码率数据
+            snrRange = Array.from({length: 21}, (_, i) => i); // 0-20 dB
+            series = [
+                { ber: snrRange.map(snr => Math.pow(10, -snr/5 - 1)) },
+                { ber: snrRange.map(snr => Math.pow(10, -snr/4 - 1.5)) },
+                { ber: snrRange.map(snr => Math.pow(10, -snr/3 - 2)) }
+            ];
+        }
         
-        data.forEach((ber, index) => {
+        // 对数坐标，BER为0时截断在 1e-6
+        const toX = i => margin + (i / Math.max(1, snrRange.length - 1)) * plotWidth;
+        const toY = rate => height - margin - (Math.log10(Math.max(rate, 1e-6)) + 6) / 6 * plotHeight;
+        
+        series.forEach((curve, index) => {
+            if (!curve) return;
+            
             ctx.strokeStyle = colors[index];
             ctx.lineWidth = 2;
             ctx.beginPath();
             
-            ber.forEach((rate, i) => {
-                const x = margin + (i / (snrRange.length - 1)) * plotWidth;
-                const y = height - margin - (Math.log10(rate) + 6) / 6 * plotHeight;
+            curve.ber.forEach((rate, i) => {
+                const x = toX(i);
+                const y = toY(rate);
                 
                 if (i === 0) {
                     ctx.moveTo(x, y);
@@ -956,6 +1003,18 @@ class DigitalModulationDemo {
             
             ctx.stroke();
             
+            // 置信区间误差棒
+            if (curve.ci_lower && curve.ci_upper) {
+                ctx.lineWidth = 1;
+                ctx.beginPath();
+                curve.ber.forEach((rate, i) => {
+                    const x = toX(i);
+                    ctx.moveTo(x, toY(curve.ci_lower[i]));
+                    ctx.lineTo(x, toY(curve.ci_upper[i]));
+                });
+                ctx.stroke();
+            }
+            
             // 添加图例
             ctx.fillStyle = colors[index];
             ctx.fillRect(width - margin + 10, margin + index * 25, 15, 10);
@@ -50,6 +50,7 @@
 window.RFVision = {
     charts: {},
     animations: {},
+    streams: {},  // 活动的服务端波形流
     constants: {
         LIGHT_SPEED: 3e8,  // 光速 m/s
         VACUUM_PERMEABILITY: 4 * Math.PI * 1e-7,  // 真空磁导率
@@ -337,6 +338,15 @@ const ChartUtils = {
         return new Chart(ctx, config);
     },
 
+    /**
+     * 根据画布宽度建议服务端降采样点数（每像素保留最小/最大两个点）
+     */
+    suggestMaxPoints: function(canvasId) {
+        const canvas = document.getElementById(canvasId);
+        const width = canvas ? (canvas.clientWidth || canvas.width) : 0;
+        return Math.max(100, Math.round(width * 2));
+    },
+
     /**
      * 更新图表数据
      */
@@ -400,10 +410,35 @@ const AnimationController = {
         return animationId;
     },
 
+    /**
+     * 基于服务端波形流的滚动动画：图表保留最近 windowSize 个采样，每收到一帧追加并滚动
+     * 返回 { animationId, stream }，stream.update(params) 可在播放中修改参数
+     */
+    startStreamAnimation: function(chart, params, windowSize = 1000) {
+        const animationId = 'stream_' + Date.now();
+        let times = [];
+        let values = [];
+
+        const stream = APIUtils.openWaveformStream(params, (frame) => {
+            times = times.concat(frame.time).slice(-windowSize);
+            values = values.concat(frame.signal).slice(-windowSize);
+            chart.data.labels = times;
+            chart.data.datasets[0].data = values;
+            chart.update('none');
+        });
+
+        window.RFVision.streams[animationId] = stream;
+        return { animationId, stream };
+    },
+
     /**
      * 停止动画
      */
     stopAnimation: function(animationId) {
+        if (window.RFVision.streams[animationId]) {
+            window.RFVision.streams[animationId].close();
+            delete window.RFVision.streams[animationId];
+        }
         if (window.RFVision.animations[animationId]) {
             cancelAnimationFrame(window.RFVision.animations[animationId]);
             delete window.RFVision.animations[animationId];
@@ -414,9 +449,11 @@ const AnimationController = {
      * 停止所有动画
      */
     stopAllAnimations: function() {
-        Object.keys(window.RFVision.animations).forEach(id => {
-            this.stopAnimation(id);
-        });
+        Object.keys(window.RFVision.animations)
+            .concat(Object.keys(window.RFVision.streams))
+            .forEach(id => {
+                this.stopAnimation(id);
+            });
     }
 };
 
@@ -506,21 +543,104 @@ const UIUtils = {
  * API通信工具
  */
 const APIUtils = {
+    /**
+     * 二进制传输的MIME类型
+     */
+    BINARY_MIMETYPE: 'application/octet-stream',
+
+    /**
+     * 传输dtype -> TypedArray构造函数
+     */
+    TYPED_ARRAYS: {
+        float32: Float32Array,
+        float64: Float64Array,
+        int8: Int8Array,
+        uint8: Uint8Array,
+        int16: Int16Array,
+        int32: Int32Array
+    },
+
+    /**
+     * 解析二进制响应帧
+     * 格式: uint32(LE)头长度 + JSON头 + 8字节对齐的数组数据块
+     * 数组直接以TypedArray视图返回，不做拷贝
+     */
+    decodeBinary: function(buffer) {
+        const view = new DataView(buffer);
+        const headerLength = view.getUint32(0, true);
+        const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 4, headerLength)));
+        const base = Math.ceil((4 + headerLength) / 8) * 8;
+        const arrays = header.arrays.map(desc => {
+            const TypedArray = this.TYPED_ARRAYS[desc.dtype];
+            const flat = new TypedArray(buffer, base + desc.offset, desc.length);
+            const width = desc.shape ? desc.shape[desc.shape.length - 1] : 0;
+            if (!desc.shape || desc.shape.length < 2 || !width) {
+                return flat;
+            }
+            // 多维数组按最后一维拆成行视图（subarray 不复制数据）
+            const rows = [];
+            for (let start = 0; start < flat.length; start += width) {
+                rows.push(flat.subarray(start, start + width));
+            }
+            return rows;
+        });
+
+        const restore = (obj) => {
+            if (Array.isArray(obj)) {
+                return obj.map(restore);
+            }
+            if (obj !== null && typeof obj === 'object') {
+                if ('$array' in obj && Object.keys(obj).length === 1) {
+                    return arrays[obj.$array];
+                }
+                const result = {};
+                Object.keys(obj).forEach(key => {
+                    result[key] = restore(obj[key]);
+                });
+                return result;
+            }
+            return obj;
+        };
+
+        return restore(header.payload);
+    },
+
     /**
      * 通用API请求
+     * options.binary: 'f32' | 'f64' 时请求二进制格式，数组解码为TypedArray
+     * options.method / options.body: POST请求时使用（body为对象，按JSON发送）
+     * options.maxPoints: 服务端降采样后的最大点数（通常取图表像素宽度的2倍）
      */
-    async request(endpoint, params = {}) {
+    async request(endpoint, params = {}, options = {}) {
         try {
             const url = new URL(endpoint, window.location.origin);
             Object.keys(params).forEach(key => {
                 url.searchParams.append(key, params[key]);
             });
+
+            const init = { method: options.method || 'GET', headers: {} };
+            if (options.maxPoints) {
+                url.searchParams.set('max_points', options.maxPoints);
+            }
+            if (options.binary) {
+                url.searchParams.set('format', options.binary);
+                init.headers['Accept'] = this.BINARY_MIMETYPE;
+            }
+            if (options.body !== undefined) {
+                init.method = options.method || 'POST';
+                init.headers['Content-Type'] = 'application/json';
+                init.body = JSON.stringify(options.body);
+            }
             
-            const response = await fetch(url);
+            const response = await fetch(url, init);
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
             
+            const contentType = response.headers.get('Content-Type') || '';
+            if (contentType.startsWith(this.BINARY_MIMETYPE)) {
+                return this.decodeBinary(await response.arrayBuffer());
+            }
             return await response.json();
         } catch (error) {
             console.error('API request failed:', error);
@@ -529,44 +649,148 @@ const APIUtils = {
         }
     },
 
+    /**
+     * NDJSON流式请求：每收到一行JSON记录即回调 onRecord(record)
+     * 返回所有记录组成的数组
+     */
+    async stream(endpoint, body, onRecord) {
+        const response = await fetch(new URL(endpoint, window.location.origin), {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(body)
+        });
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        const records = [];
+        let pending = '';
+
+        const emit = (line) => {
+            if (!line.trim()) return;
+            const record = JSON.parse(line);
+            records.push(record);
+            if (onRecord) onRecord(record);
+        };
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            pending += decoder.decode(value, { stream: true });
+            const lines = pending.split('\n');
+            pending = lines.pop();
+            lines.forEach(emit);
+        }
+        emit(pending + decoder.decode());
+        return records;
+    },
+
+    /**
+     * 流式完整传输仿真，按帧回调累计误码率和恢复文本
+     */
+    async streamTransmission(params, onFrame) {
+        return this.stream('/api/complete-transmission/stream', params, onFrame);
+    },
+
+    /**
+     * 打开实时波形流（SSE）：相位连续的载波/AM/FM/PM采样帧逐帧回调 onFrame(frame)
+     * params: { type: 'AM', carrier_freq, mod_freq, mod_depth, frame_size, interval, ... }
+     * 返回 { update(params), close() }；update 在下一帧边界生效
+     */
+    openWaveformStream(params, onFrame) {
+        const url = new URL('/api/waveform-stream', window.location.origin);
+        Object.keys(params).forEach(key => url.searchParams.set(key, params[key]));
+
+        const source = new EventSource(url);
+        let streamId = null;
+        let queued = null;
+
+        const send = (update) => fetch(`/api/waveform-stream/${streamId}`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(update)
+        });
+
+        source.addEventListener('session', (event) => {
+            streamId = JSON.parse(event.data).stream_id;
+            if (queued) {
+                send(queued);
+                queued = null;
+            }
+        });
+        source.addEventListener('done', () => source.close());
+        source.onmessage = (event) => onFrame(JSON.parse(event.data));
+        source.onerror = () => {
+            // 服务端结束或连接中断时不自动重连（重连会开启新的会话）
+            source.close();
+        };
+
+        return {
+            update: (update) => {
+                if (streamId) {
+                    return send(update);
+                }
+                queued = Object.assign(queued || {}, update);
+                return Promise.resolve();
+            },
+            close: () => {
+                source.close();
+                if (streamId) {
+                    fetch(`/api/waveform-stream/${streamId}`, { method: 'DELETE' });
+                }
+            }
+        };
+    },
+
     /**
      * 获取载波数据
      */
-    async getCarrierData(frequency, amplitude) {
-        return this.request('/api/generate_carrier', { frequency, amplitude });
+    async getCarrierData(frequency, amplitude, options = {}) {
+        return this.request('/api/generate_carrier', { frequency, amplitude }, options);
     },
 
     /**
      * 获取AM调制数据
      */
-    async getAMData(carrierFreq, modFreq, modDepth) {
+    async getAMData(carrierFreq, modFreq, modDepth, options = {}) {
         return this.request('/api/generate_am', {
             carrier_freq: carrierFreq,
             mod_freq: modFreq,
             mod_depth: modDepth
-        });
+        }, options);
     },
 
     /**
      * 获取FM调制数据
      */
-    async getFMData(carrierFreq, modFreq, freqDev) {
+    async getFMData(carrierFreq, modFreq, freqDev, options = {}) {
         return this.request('/api/generate_fm', {
             carrier_freq: carrierFreq,
             mod_freq: modFreq,
             freq_dev: freqDev
-        });
+        }, options);
     },
 
     /**
      * 获取PM调制数据
      */
-    async getPMData(carrierFreq, modFreq, phaseDev) {
+    async getPMData(carrierFreq, modFreq, phaseDev, options = {}) {
         return this.request('/api/generate_pm', {
             carrier_freq: carrierFreq,
             mod_freq: modFreq,
             phase_dev: phaseDev
-        });
+        }, options);
+    },
+
+    /**
+     * 批量参数扫描：一次请求获取一组曲线及其频谱
+     * sweep 示例: { modulation_type: 'AM', carrier_freq: 50, mod_freq: 5, mod_depth: [0.1, 0.5, 0.9] }
+     * 返回的 sweep.signals / spectrum.magnitude 为按曲线排列的数组
+     */
+    async getBatchData(sweep, options = {}) {
+        return this.request('/api/batch', {}, Object.assign({}, options, { body: sweep }));
     }
 };
 
@@ -574,6 +798,25 @@ const APIUtils = {
  * 数字调制可视化工具
  */
 const DigitalModulation = {
+    utf8Encoder: new TextEncoder(),
+
+    /**
+     * 单个字符的二进制表示（UTF-8 字节，与服务端 /api/text-to-binary 一致）
+     */
+    charToBinary: function(char) {
+        return Array.from(this.utf8Encoder.encode(char),
+                          byte => byte.toString(2).padStart(8, '0')).join('');
+    },
+
+    /**
+     * 字符编码标签：ASCII 字符显示 ASCII 码，其余显示 Unicode 码点
+     */
+    charCodeLabel: function(char) {
+        const code = char.codePointAt(0);
+        return code < 128 ? `ASCII: ${code}`
+                          : `U+${code.toString(16).toUpperCase().padStart(4, '0')}`;
+    },
+
     /**
      * 文本到二进制转换并显示映射
      */
@@ -588,18 +831,18 @@ const DigitalModulation = {
         
         let fullBinary = '';
         
-        // 为每个字符创建映射显示
-        for (let i = 0; i < text.length; i++) {
-            const char = text[i];
-            const ascii = char.charCodeAt(0);
-            const binary = ascii.toString(2).padStart(8, '0');
+        // 为每个字符创建映射显示（按码点遍历，代理对字符不会被拆开）
+        const chars = Array.from(text);
+        for (let i = 0; i < chars.length; i++) {
+            const char = chars[i];
+            const binary = this.charToBinary(char);
             fullBinary += binary;
             
             const charDiv = document.createElement('div');
             charDiv.className = 'char-mapping';
             charDiv.innerHTML = `
                 <div class="character">'${char === ' ' ? '空格' : char}'</div>
-                <div class="ascii">ASCII: ${ascii}</div>
+                <div class="ascii">${this.charCodeLabel(char)}</div>
                 <div class="binary">${binary}</div>
             `;
             
@@ -627,7 +870,7 @@ const DigitalModulation = {
             
             const streamDiv = document.getElementById('binary-stream');
             this.animateBinarySequence(streamDiv, fullBinary);
-        }, text.length * 100 + 200);
+        }, chars.length * 100 + 200);
         
         return fullBinary;
     },
@@ -0,0 +1,158 @@
+"""
+RFVision - 分帧流式传输仿真管线
+
+将消息按固定比特数分帧，每帧依次经过
+    文本分块 -> 比特 -> 调制 -> 加噪信道 -> 解调 -> 文本
+并以生成器逐帧产出结果。消息先整体编码为 UTF-8 字节，再按字符边界切分为帧，
+多字节字符不会被拆到两帧中。内存占用只与帧长有关，与消息长度无关；
+客户端可通过 NDJSON 流实时获得运行中的误码率与已恢复文本。
+"""
+
+import json
+from typing import Dict, Iterator
+
+import numpy as np
+
+from baseband import (bits_to_string, bits_to_text, fsk_frequency_track, render_baseband,
+                      render_fsk)
+from transport import to_jsonable
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# 默认帧长（比特），取8的倍数保证每帧按字节对齐、可独立解码为文本
+DEFAULT_FRAME_BITS = 256
+
+# 单帧允许的最大比特数
+MAX_FRAME_BITS = 65536
+
+
+def _frame_slices(payload: bytes, bytes_per_frame: int) -> Iterator[slice]:
+    """按 UTF-8 字符边界把字节串切分为不超过 bytes_per_frame 字节的帧
+
+    帧尾落在多字节字符中间时回退到该字符起点；单个字符比帧还长时整字符单独成帧。
+    """
+    start = 0
+    while start < len(payload):
+        stop = min(start + bytes_per_frame, len(payload))
+        # UTF-8 续字节形如 0b10xxxxxx
+        while start < stop < len(payload) and payload[stop] & 0xC0 == 0x80:
+            stop -= 1
+        if stop == start:
+            stop = start + 1
+            while stop < len(payload) and payload[stop] & 0xC0 == 0x80:
+                stop += 1
+        yield slice(start, stop)
+        start = stop
+
+
+def _modulate_frame(processor, bits: np.ndarray, t: np.ndarray, carrier_freq: float,
+                    samples_per_bit: int, modulation_type: str) -> np.ndarray:
+    """对单帧比特进行调制（与 simulate_complete_transmission 的调制方式及精度一致）"""
+    if modulation_type == 'FSK':
+        frequency_trace = fsk_frequency_track(bits, carrier_freq - 20, carrier_freq + 20,
+                                              samples_per_bit)
+        return render_fsk(t, frequency_trace, processor.dtype)
+
+    baseband = render_baseband(bits, 'NRZ', samples_per_bit, processor.dtype)
+    carrier = processor.carrier(carrier_freq, t)
+    if modulation_type == 'ASK':
+        return (baseband + 1) / 2 * carrier
+    return baseband * carrier  # PSK
+
+
+def transmission_frames(processor, text: str, carrier_freq: float = 100,
+                        bit_rate: float = 10, snr_db: float = 20,
+                        modulation_type: str = 'ASK',
+                        frame_bits: int = DEFAULT_FRAME_BITS,
+                        include_signals: bool = False) -> Iterator[Dict]:
+    """逐帧仿真完整的数字通信链路
+
+    每帧产出一条记录（帧序号、本帧比特与恢复结果、累计误码率、本帧恢复的文本），
+    最后产出一条 done=True 的汇总记录。参数在调用时立即校验，
+    因此错误可以在开始流式响应之前返回给客户端。
+    """
+    if modulation_type not in ('ASK', 'FSK', 'PSK'):
+        raise ValueError(f'Unsupported modulation type: {modulation_type}')
+    frame_bits = int(frame_bits)
+    if frame_bits <= 0 or frame_bits % 8 != 0 or frame_bits > MAX_FRAME_BITS:
+        raise ValueError(f'frame_bits 必须是8的倍数且不超过 {MAX_FRAME_BITS}')
+
+    return _frames(processor, text, carrier_freq, bit_rate, snr_db, modulation_type,
+                   frame_bits, include_signals)
+
+
+def _frames(processor, text: str, carrier_freq: float, bit_rate: float, snr_db: float,
+            modulation_type: str, frame_bits: int, include_signals: bool) -> Iterator[Dict]:
+    """transmission_frames 的生成器主体"""
+    bit_duration = 1.0 / bit_rate
+    samples_per_bit = int(processor.sampling_rate * bit_duration)
+    payload = text.encode('utf-8', errors='replace')
+
+    total_errors = 0
+    total_bits = 0
+    recovered_chars = 0
+    frame_index = 0
+
+    for frame_slice in _frame_slices(payload, frame_bits // 8):
+        bits = np.unpackbits(np.frombuffer(payload[frame_slice], dtype=np.uint8))
+
+        # 帧时间轴接续上一帧，保证载波相位连续
+        first_sample = total_bits * samples_per_bit
+        t = (first_sample + np.arange(bits.size * samples_per_bit)) / processor.sampling_rate
+
+        modulated = _modulate_frame(processor, bits, t, carrier_freq, samples_per_bit,
+                                    modulation_type)
+        received = processor.add_noise(modulated, snr_db)
+        demodulated = processor.coherent_demodulation(received, t, carrier_freq, bit_rate,
+                                                      modulation_type, include_waveform=False,
+                                                      as_string=False)
+        recovered_bits = demodulated['recovered_binary']
+
+        compared = min(bits.size, recovered_bits.size)
+        frame_errors = int(np.count_nonzero(bits[:compared] != recovered_bits[:compared]))
+        frame_ber = frame_errors / compared if compared else 1.0
+        total_errors += frame_errors
+        total_bits += bits.size
+
+        recovered_text = bits_to_text(recovered_bits)
+        recovered_chars += len(recovered_text)
+
+        frame = {
+            'frame': frame_index,
+            'bit_offset': total_bits - bits.size,
+            'binary_data': bits_to_string(bits),
+            'recovered_binary': bits_to_string(recovered_bits),
+            'recovered_text': recovered_text,
+            'frame_ber': frame_ber,
+            'errors': total_errors,
+            'bits': total_bits,
+            'ber': total_errors / total_bits if total_bits else 0.0,
+        }
+        if include_signals:
+            frame['time'] = t.astype(processor.dtype, copy=False)
+            frame['modulated_signal'] = modulated
+            frame['received_signal'] = received
+        yield frame
+        frame_index += 1
+
+    yield {
+        'done': True,
+        'frames': frame_index,
+        'errors': total_errors,
+        'bits': total_bits,
+        'ber': total_errors / total_bits if total_bits else 0.0,
+        'recovered_chars': recovered_chars,
+        'parameters': {
+            'carrier_freq': carrier_freq,
+            'bit_rate': bit_rate,
+            'snr_db': snr_db,
+            'modulation_type': modulation_type,
+            'frame_bits': frame_bits,
+        },
+    }
+
+
+def ndjson_lines(frames: Iterator[Dict]) -> Iterator[str]:
+    """将帧记录序列化为 NDJSON 行"""
+    for frame in frames:
+        yield json.dumps(to_jsonable(frame), ensure_ascii=False, separators=(',', ':')) + '\n'
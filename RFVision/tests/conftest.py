@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 模块按文件名直接导入（与 app.py、benchmark.py 相同）
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,110 @@
+"""波形归档的 .npz / .npy 导入与大小限制"""
+
+import io
+import zipfile
+
+import numpy as np
+import pytest
+
+from archive import WaveformArchive
+
+
+def npz_bytes(**arrays) -> io.BytesIO:
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return WaveformArchive(str(tmp_path), max_array_bytes=1024 * 1024,
+                           max_import_bytes=3 * 1024 * 1024)
+
+
+def test_import_npz_round_trip(archive):
+    signal = np.linspace(-1, 1, 1000, dtype=np.float32)
+    bits = np.arange(64, dtype=np.uint8) % 2
+    run_id = archive.import_npz(npz_bytes(signal=signal, bits=bits), {'source': 'test'})
+    manifest = archive.manifest(run_id)
+    assert sorted(manifest['arrays']) == ['bits', 'signal']
+    np.testing.assert_array_equal(archive.open_array(run_id, 'signal'), signal)
+    np.testing.assert_array_equal(archive.open_array(run_id, 'bits'), bits)
+
+
+def test_import_npy(archive):
+    buffer = io.BytesIO()
+    np.save(buffer, np.ones(16))
+    buffer.seek(0)
+    run_id = archive.import_npz(buffer)
+    np.testing.assert_array_equal(archive.open_array(run_id, 'signal'), np.ones(16))
+
+
+def test_rejects_compressed_oversize_member(archive):
+    # 16 MB 的零数组压缩后只有几十 KB
+    with pytest.raises(ValueError, match='too large'):
+        archive.import_npz(npz_bytes(signal=np.zeros(2 * 1024 * 1024)))
+    assert archive.list_runs() == []
+
+
+def test_rejects_oversize_npy(archive):
+    buffer = io.BytesIO()
+    np.save(buffer, np.zeros(2 * 1024 * 1024))
+    buffer.seek(0)
+    with pytest.raises(ValueError, match='too large'):
+        archive.import_npz(buffer)
+
+
+def test_rejects_total_import_size(archive):
+    members = {f'part{i}': np.zeros(100_000) for i in range(4)}
+    with pytest.raises(ValueError, match='Import exceeds'):
+        archive.import_npz(npz_bytes(**members))
+    assert archive.list_runs() == []
+
+
+def test_rejects_non_npy_member(archive):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as bundle:
+        bundle.writestr('notes.txt', b'hello')
+    buffer.seek(0)
+    with pytest.raises(ValueError, match='not a valid .npy'):
+        archive.import_npz(buffer)
+
+
+def test_upload_size_limit(monkeypatch):
+    import app as webapp
+    assert webapp.app.config['MAX_CONTENT_LENGTH']
+    monkeypatch.setitem(webapp.app.config, 'MAX_CONTENT_LENGTH', 1024)
+    response = webapp.app.test_client().post(
+        '/api/archive/import', data={'file': (npz_bytes(signal=np.random.rand(1000)), 'run.npz')},
+        content_type='multipart/form-data')
+    assert response.status_code == 413
+
+
+def test_read_without_count_is_capped(archive, monkeypatch):
+    import archive as archive_module
+    monkeypatch.setattr(archive_module, 'MAX_READ_COUNT', 100)
+    run_id = archive.save({'signal': np.arange(250.0)})
+    window = archive.read(run_id, 'signal', 20)
+    assert (window['start'], window['count'], window['total']) == (20, 100, 250)
+    assert window['truncated']
+    np.testing.assert_array_equal(window['values'], np.arange(20.0, 120.0))
+    assert not archive.read(run_id, 'signal', 200)['truncated']
+    with pytest.raises(ValueError):
+        archive.read(run_id, 'signal', 0, 101)
+
+
+def test_array_route_reports_run_deleted_during_read(monkeypatch, tmp_path):
+    import app as webapp
+    store = WaveformArchive(str(tmp_path))
+    run_id = store.save({'signal': np.arange(10.0)}, {'sampling_rate': 1000})
+    monkeypatch.setattr(webapp, 'waveform_archive', store)
+    client = webapp.app.test_client()
+    response = client.get(f'/api/archive/{run_id}/arrays/signal')
+    assert response.status_code == 200
+    assert response.get_json()['truncated'] is False
+
+    def deleted(_run_id):
+        raise KeyError(_run_id)
+    monkeypatch.setattr(store, 'manifest', deleted)
+    assert client.get(f'/api/archive/{run_id}/arrays/signal').status_code == 404
@@ -0,0 +1,96 @@
+"""查表生成的基带 / FSK 波形与原逐比特循环实现逐采样一致"""
+
+import numpy as np
+import pytest
+
+from app import RFSignalProcessor
+from baseband import bits_to_array, fsk_frequency_track, render_baseband, render_fsk
+
+BIT_PATTERNS = ['0', '1', '0110', '1111000010101100', '1001' * 16]
+
+# 比特率 10 → 每比特 100 个采样，比特率 9 → 111 个（奇数，半比特边界不对称）
+BIT_RATES = [10, 9]
+
+
+def reference_baseband(binary_data: str, samples_per_bit: int, encoding: str) -> np.ndarray:
+    """原 generate_digital_baseband 的逐比特循环"""
+    signal = np.zeros(samples_per_bit * len(binary_data))
+    half = samples_per_bit // 2
+    for i, bit in enumerate(binary_data):
+        start, end = i * samples_per_bit, (i + 1) * samples_per_bit
+        if encoding == 'NRZ':
+            signal[start:end] = 1 if bit == '1' else -1
+        elif encoding == 'RZ':
+            signal[start:start + half] = 1 if bit == '1' else 0
+            signal[start + half:end] = 0
+        elif encoding == 'Manchester':
+            signal[start:start + half] = -1 if bit == '1' else 1
+            signal[start + half:end] = 1 if bit == '1' else -1
+    return signal
+
+
+def reference_fsk(binary_data: str, t: np.ndarray, samples_per_bit: int,
+                  freq_0: float, freq_1: float):
+    """原 fsk_modulation 的逐比特循环，返回 (信号, 频率轨迹)"""
+    signal = np.zeros(t.size)
+    trace = np.zeros(t.size)
+    for i, bit in enumerate(binary_data):
+        start, end = i * samples_per_bit, (i + 1) * samples_per_bit
+        frequency = freq_1 if bit == '1' else freq_0
+        signal[start:end] = np.cos(2 * np.pi * frequency * t[start:end])
+        trace[start:end] = frequency
+    return signal, trace
+
+
+@pytest.mark.parametrize('encoding', ['NRZ', 'RZ', 'Manchester'])
+@pytest.mark.parametrize('binary_data', BIT_PATTERNS)
+@pytest.mark.parametrize('samples_per_bit', [1, 2, 7, 100])
+def test_render_baseband_matches_loop(encoding, binary_data, samples_per_bit):
+    rendered = render_baseband(bits_to_array(binary_data), encoding, samples_per_bit)
+    np.testing.assert_array_equal(rendered,
+                                  reference_baseband(binary_data, samples_per_bit, encoding))
+
+
+def test_render_baseband_batch_rows_match_loop():
+    patterns = ['0110', '1000', '1111']
+    bits = np.stack([bits_to_array(pattern) for pattern in patterns])
+    rendered = render_baseband(bits, 'Manchester', 7)
+    for row, pattern in zip(rendered, patterns):
+        np.testing.assert_array_equal(row, reference_baseband(pattern, 7, 'Manchester'))
+
+
+@pytest.mark.parametrize('binary_data', BIT_PATTERNS)
+@pytest.mark.parametrize('bit_rate', BIT_RATES)
+def test_render_fsk_matches_loop(binary_data, bit_rate):
+    samples_per_bit = int(1000 / bit_rate)
+    t = np.linspace(0, len(binary_data) / bit_rate, samples_per_bit * len(binary_data))
+    trace = fsk_frequency_track(bits_to_array(binary_data), 50.0, 150.0, samples_per_bit)
+    expected_signal, expected_trace = reference_fsk(binary_data, t, samples_per_bit, 50.0, 150.0)
+    np.testing.assert_array_equal(trace, expected_trace)
+    np.testing.assert_array_equal(render_fsk(t, trace), expected_signal)
+
+
+@pytest.mark.parametrize('encoding', ['NRZ', 'RZ', 'Manchester'])
+@pytest.mark.parametrize('bit_rate', BIT_RATES)
+def test_processor_baseband_matches_loop(encoding, bit_rate):
+    processor = RFSignalProcessor('float64')
+    binary_data = '1111000010101100'
+    samples_per_bit = int(processor.sampling_rate / bit_rate)
+    result = processor.generate_digital_baseband(binary_data, bit_rate, encoding)
+    np.testing.assert_array_equal(result['amplitude'],
+                                  reference_baseband(binary_data, samples_per_bit, encoding))
+    np.testing.assert_array_equal(
+        result['time'],
+        np.linspace(0, len(binary_data) / bit_rate, samples_per_bit * len(binary_data)))
+
+
+@pytest.mark.parametrize('bit_rate', BIT_RATES)
+def test_processor_fsk_matches_loop(bit_rate):
+    processor = RFSignalProcessor('float64')
+    binary_data = '0110100111'
+    samples_per_bit = int(processor.sampling_rate / bit_rate)
+    t = np.linspace(0, len(binary_data) / bit_rate, samples_per_bit * len(binary_data))
+    result = processor.fsk_modulation(binary_data, 50.0, 150.0, bit_rate)
+    expected_signal, expected_trace = reference_fsk(binary_data, t, samples_per_bit, 50.0, 150.0)
+    np.testing.assert_array_equal(result['fsk_signal'], expected_signal)
+    np.testing.assert_array_equal(result['frequency_trace'], expected_trace)
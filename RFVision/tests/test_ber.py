@@ -0,0 +1,49 @@
+"""BER-SNR 曲线引擎的规模限制与超时"""
+
+import numpy as np
+import pytest
+
+from app import RFSignalProcessor
+from ber import MAX_TOTAL_SAMPLES, ber_curve, samples_per_trial, wilson_interval
+
+
+def test_rejects_oversized_request():
+    processor = RFSignalProcessor()
+    trials = MAX_TOTAL_SAMPLES // samples_per_trial(processor, 'PSK', 200, 10) + 1
+    with pytest.raises(ValueError):
+        ber_curve(processor, [0], trials, ['PSK'], num_bits=200)
+
+
+def test_timeout_stops_before_remaining_batches():
+    with pytest.raises(TimeoutError):
+        ber_curve(RFSignalProcessor(), [0, 5, 10], 2, ['PSK'], num_bits=50, timeout=-1)
+
+
+def test_curve_without_timeout():
+    curve = ber_curve(RFSignalProcessor(), [0, 10], 2, ['PSK'], num_bits=50, seed=1,
+                      timeout=60)
+    assert curve['curves']['PSK']['total_bits'] == [100, 100]
+
+
+@pytest.mark.parametrize('confidence, z', [(0.8, 1.2815516), (0.95, 1.9599640),
+                                           (0.999, 3.2905267)])
+def test_wilson_interval_uses_requested_confidence(confidence, z):
+    errors, total = np.array([0, 10, 500]), np.array([1000, 1000, 1000])
+    lower, upper = wilson_interval(errors, total, confidence)
+    p = errors / total
+    expected = z * np.sqrt(p * (1 - p) / total + z ** 2 / (4 * total ** 2)) / (1 + z ** 2 / total)
+    np.testing.assert_allclose((upper - lower) / 2, expected, rtol=1e-6)
+
+
+@pytest.mark.parametrize('confidence', [0, 1, -0.5, 1.5, float('nan')])
+def test_rejects_confidence_outside_unit_interval(confidence):
+    with pytest.raises(ValueError):
+        wilson_interval(np.array([1]), np.array([10]), confidence)
+
+
+@pytest.mark.parametrize('confidence', [0, 1.2])
+def test_route_rejects_confidence(confidence):
+    import app as webapp
+    response = webapp.app.test_client().post('/api/ber-curve', json={
+        'snr_db': [0], 'trials': 1, 'num_bits': 20, 'confidence': confidence})
+    assert response.status_code == 400
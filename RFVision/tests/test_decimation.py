@@ -0,0 +1,49 @@
+"""max_points 包络降采样：点数上限与只处理浮点信号数组"""
+
+import numpy as np
+import pytest
+
+from decimation import decimate_payload, minmax_indices
+
+
+@pytest.mark.parametrize('curves', [1, 3, 50, 400])
+@pytest.mark.parametrize('max_points', [4, 5, 100, 1000])
+def test_indices_never_exceed_max_points(curves, max_points):
+    rng = np.random.default_rng(curves)
+    series = list(rng.standard_normal((curves, 5000)))
+    indices = minmax_indices(series, max_points)
+    assert indices.size <= max_points
+    assert indices[0] == 0 and indices[-1] == 4999
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_single_curve_keeps_extremes():
+    signal = np.sin(np.linspace(0, 40 * np.pi, 10_000))
+    signal[1234], signal[8765] = 5.0, -5.0
+    indices = minmax_indices([signal], 200)
+    assert {1234, 8765} <= set(indices.tolist())
+
+
+def test_batch_rows_respect_max_points():
+    payload = {'time': np.linspace(0, 1, 2000),
+               'signals': np.random.default_rng(0).random((64, 2000))}
+    result = decimate_payload(payload, 100)
+    assert result['time'].size <= 100
+    assert result['signals'].shape == (64, result['time'].size)
+
+
+def test_integer_arrays_are_not_decimated():
+    bits = np.random.default_rng(1).integers(0, 2, 5000).astype(np.uint8)
+    payload = {'bits': bits, 'time': np.linspace(0, 1, 5000), 'signal': np.linspace(-1, 1, 5000)}
+    result = decimate_payload(payload, 100)
+    np.testing.assert_array_equal(result['bits'], bits)
+    assert result['signal'].size == result['time'].size <= 100
+
+
+def test_arrays_without_time_axis_are_not_decimated():
+    parameters = np.linspace(0.1, 1.0, 500)
+    payload = {'time': np.linspace(0, 1, 2000), 'signals': np.ones((500, 2000)),
+               'parameters': {'mod_depth': parameters}}
+    result = decimate_payload(payload, 100)
+    np.testing.assert_array_equal(result['parameters']['mod_depth'], parameters)
+    assert result['signals'].shape == (500, result['time'].size)
@@ -0,0 +1,113 @@
+"""float32 精度模式相对 float64 的误差（与 benchmark.py --check-precision 的上限一致）"""
+
+import numpy as np
+import pytest
+
+from app import RFSignalProcessor
+from ber import ber_curve
+
+# README「性能优化」中记录的误差上限
+WAVEFORM_ATOL = 1e-5      # 波形：最大绝对误差（幅度约为 1）
+SPECTRUM_RTOL = 1e-5      # 幅度谱 / Welch PSD：相对峰值
+STATISTICS_ATOL = 1e-4    # 无噪声判决统计量：最大绝对误差
+
+BITS = ''.join('1' if bit else '0' for bit in np.random.default_rng(0).integers(0, 2, 256))
+
+
+def make_processors(duration: float = 20.0):
+    processors = []
+    for precision in ('float64', 'float32'):
+        processor = RFSignalProcessor(precision)
+        processor.time_duration = duration
+        processors.append(processor)
+    return processors
+
+
+@pytest.fixture(scope='module')
+def processors():
+    return make_processors()
+
+
+def modulate(processor, modulation_type: str):
+    """按调制方式生成 (信号, 时间轴)"""
+    baseband = processor.generate_digital_baseband(BITS, 10, 'NRZ')
+    if modulation_type == 'FSK':
+        modulated = processor.fsk_modulation(BITS, 80, 120, 10)
+        return modulated['fsk_signal'], modulated['time']
+    if modulation_type == 'ASK':
+        signal = processor.ask_modulation(baseband['amplitude'], 100, baseband['time'])
+        return signal['ask_signal'], baseband['time']
+    signal = processor.psk_modulation(baseband['amplitude'], 100, baseband['time'])
+    return signal['psk_signal'], baseband['time']
+
+
+def demodulate(processor, signal, time, modulation_type: str):
+    return processor.coherent_demodulation(signal, time, 100, 10, modulation_type,
+                                           freq_0=80, freq_1=120, include_waveform=False)
+
+
+def test_dtypes(processors):
+    exact, compact = processors
+    assert exact.generate_carrier_wave(50)['amplitude'].dtype == np.float64
+    assert compact.generate_carrier_wave(50)['amplitude'].dtype == np.float32
+
+
+@pytest.mark.parametrize('name, generate', [
+    ('carrier', lambda p: p.generate_carrier_wave(50)['amplitude']),
+    ('am', lambda p: p.amplitude_modulation(50, 5, 0.5)['am_signal']),
+    ('fm', lambda p: p.frequency_modulation(50, 5, 10)['fm_signal']),
+    ('pm', lambda p: p.phase_modulation(50, 5, np.pi / 4)['pm_signal']),
+    ('sweep', lambda p: p.modulation_sweep('FM', 50, 5, [5, 10, 20])['signals']),
+    ('fsk', lambda p: p.fsk_modulation(BITS, 80, 120, 10)['fsk_signal']),
+])
+def test_waveforms(processors, name, generate):
+    exact, compact = processors
+    np.testing.assert_allclose(np.asarray(generate(compact), dtype=np.float64),
+                               generate(exact), rtol=0, atol=WAVEFORM_ATOL, err_msg=name)
+
+
+@pytest.mark.parametrize('method, key', [('fft', 'magnitude'), ('welch', 'psd')])
+def test_spectrum(processors, method, key):
+    results = [np.asarray(p.calculate_spectrum(p.amplitude_modulation(50, 5, 0.5)['am_signal'],
+                                               method=method)[key], dtype=np.float64)
+               for p in processors]
+    reference, values = results
+    np.testing.assert_allclose(values, reference, rtol=0,
+                               atol=SPECTRUM_RTOL * np.max(np.abs(reference)))
+
+
+@pytest.mark.parametrize('modulation_type', ['ASK', 'FSK', 'PSK'])
+def test_demodulation(processors, modulation_type):
+    results = [demodulate(p, *modulate(p, modulation_type), modulation_type)
+               for p in processors]
+    reference, values = results
+    np.testing.assert_allclose(np.asarray(values['decision_statistics'], dtype=np.float64),
+                               reference['decision_statistics'], rtol=0, atol=STATISTICS_ATOL)
+    assert values['recovered_binary'] == reference['recovered_binary'] == BITS
+
+
+@pytest.mark.parametrize('modulation_type', ['ASK', 'FSK', 'PSK'])
+def test_noisy_decisions_match(processors, modulation_type):
+    """同一含噪信号在两种精度下判决出相同的比特与误码率"""
+    exact, compact = processors
+    signal, time = modulate(exact, modulation_type)
+    noisy = exact.add_noise(signal, -15, rng=np.random.default_rng(7))
+    results = [demodulate(p, noisy, time, modulation_type) for p in processors]
+    reference, values = results
+    assert values['recovered_binary'] == reference['recovered_binary']
+    ber = exact.calculate_ber(BITS, reference['recovered_binary'])
+    assert ber > 0
+    assert compact.calculate_ber(BITS, values['recovered_binary']) == ber
+
+
+def test_ber_curve_matches():
+    """两种精度的噪声流不同（float32 直接生成 float32 正态样本），低 SNR 下的
+    统计一致性由 benchmark.py --check-precision 检查；这里在无误码区间要求结果完全相同"""
+    exact, compact = make_processors(duration=2.0)
+    curves = [ber_curve(p, [6, 10, 14], 4, num_bits=200, seed=1)['curves']
+              for p in (exact, compact)]
+    reference, values = curves
+    assert reference.keys() == values.keys()
+    for modulation_type, curve in reference.items():
+        assert values[modulation_type]['errors'] == curve['errors']
+        np.testing.assert_array_equal(values[modulation_type]['ber'], curve['ber'])
@@ -0,0 +1,51 @@
+"""响应缓存：缓存键、ETag 与 304"""
+
+import pytest
+
+import app as webapp
+
+
+@pytest.fixture
+def client():
+    webapp.response_cache.clear()
+    return webapp.app.test_client()
+
+
+@pytest.mark.parametrize('route, field', [('/api/text-to-binary', 'text'),
+                                          ('/api/modulation-demo', 'bit_value')])
+def test_numeric_looking_strings_are_distinct(client, route, field):
+    responses = {value: client.post(route, json={field: value}) for value in ('1', '01', '1.0')}
+    assert all(response.status_code == 200 for response in responses.values())
+    assert len({response.headers['ETag'] for response in responses.values()}) == 3
+    assert len({response.get_data() for response in responses.values()}) == 3
+    assert all(response.headers['X-Cache'] == 'MISS' for response in responses.values())
+
+
+def test_repeat_request_hits_with_same_etag(client):
+    first = client.get('/api/generate_am?mod_depth=0.3')
+    second = client.get('/api/generate_am?mod_depth=0.3')
+    assert (first.headers['X-Cache'], second.headers['X-Cache']) == ('MISS', 'HIT')
+    assert first.headers['ETag'] == second.headers['ETag']
+    assert first.get_data() == second.get_data()
+
+
+def test_json_numbers_share_an_entry(client):
+    first = client.post('/api/modulation-demo', json={'bit_value': 1})
+    second = client.post('/api/modulation-demo', json={'bit_value': 1.0})
+    assert second.headers['X-Cache'] == 'HIT'
+    assert first.headers['ETag'] == second.headers['ETag']
+
+
+def test_if_none_match_returns_304(client):
+    etag = client.get('/api/generate_fm').headers['ETag']
+    response = client.get('/api/generate_fm', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.get_data() == b''
+    assert response.headers['ETag'] == etag
+
+
+def test_format_is_part_of_the_key(client):
+    json_etag = client.get('/api/generate_pm').headers['ETag']
+    binary = client.get('/api/generate_pm?format=f32')
+    assert binary.headers['X-Cache'] == 'MISS'
+    assert binary.headers['ETag'] != json_etag
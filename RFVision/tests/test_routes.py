@@ -0,0 +1,28 @@
+"""API 路由的参数校验"""
+
+import pytest
+
+import app as webapp
+
+
+@pytest.fixture
+def client():
+    return webapp.app.test_client()
+
+
+@pytest.mark.parametrize('route', ['generate_carrier', 'generate_am', 'generate_fm',
+                                   'generate_pm'])
+def test_generate_rejects_unknown_window(client, route):
+    response = client.get(f'/api/{route}?window=triangle')
+    assert response.status_code == 400
+    assert 'Unsupported window' in response.get_json()['error']
+
+
+@pytest.mark.parametrize('window', ['rectangular', 'hann', 'kaiser'])
+def test_generate_accepts_known_window(client, window):
+    assert client.get(f'/api/generate_am?window={window}').status_code == 200
+
+
+def test_batch_rejects_unknown_window(client):
+    response = client.post('/api/batch', json={'modulation_type': 'AM', 'window': 'triangle'})
+    assert response.status_code == 400
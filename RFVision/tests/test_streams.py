@@ -0,0 +1,87 @@
+"""实时波形流的注册、注销与空闲回收"""
+
+import pytest
+
+import app as webapp
+from oscillator import PhaseOscillator, TooManyStreams, WaveformStreams, sse_frames
+
+
+def make_oscillator():
+    return PhaseOscillator('AM', 1000, 64)
+
+
+@pytest.fixture
+def client():
+    return webapp.app.test_client()
+
+
+def active_streams():
+    return webapp.waveform_streams.stats()['active']
+
+
+def test_head_request_releases_stream(client):
+    before = active_streams()
+    response = client.head('/api/waveform-stream?frames=3')
+    response.close()
+    assert response.status_code == 200
+    assert active_streams() == before
+
+
+def test_unconsumed_response_releases_stream(client):
+    before = active_streams()
+    response = client.get('/api/waveform-stream?interval=0.01', buffered=False)
+    assert active_streams() == before + 1
+    response.close()
+    assert active_streams() == before
+
+
+def test_finished_stream_is_unregistered(client):
+    before = active_streams()
+    body = client.get('/api/waveform-stream?frames=2&interval=0.01').get_data(as_text=True)
+    assert 'event: done' in body
+    assert active_streams() == before
+
+
+def test_idle_streams_are_reaped():
+    streams = WaveformStreams(max_streams=2)
+    stale = [streams.open(make_oscillator()) for _ in range(2)]
+    with pytest.raises(TooManyStreams):
+        streams.open(make_oscillator())
+    for stream_id in stale:
+        streams._last_active[stream_id] -= streams.idle_timeout + 1
+    streams.open(make_oscillator())
+    assert streams.stats()['reaped'] == 2
+    with pytest.raises(KeyError):
+        streams.get(stale[0])
+
+
+def test_closed_stream_ends_frames():
+    streams = WaveformStreams()
+    stream_id = streams.open(make_oscillator())
+    frames = sse_frames(streams, stream_id, 0.01)
+    assert next(frames).startswith('event: session')
+    assert next(frames).startswith('id: 0')
+    streams.close(stream_id)
+    assert next(frames).startswith('event: done')
+    with pytest.raises(StopIteration):
+        next(frames)
+
+
+def test_stream_limit_uses_stream_retry_after(client, monkeypatch):
+    monkeypatch.setattr(webapp.waveform_streams, 'max_streams', 0)
+    monkeypatch.setattr(webapp.waveform_streams, 'retry_after', 7)
+    response = client.get('/api/waveform-stream')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '7'
+
+
+def test_serve_threads_cover_streams(monkeypatch):
+    import sys
+    import types
+    calls = {}
+    monkeypatch.setitem(sys.modules, 'waitress',
+                        types.SimpleNamespace(serve=lambda app, **kwargs: calls.update(kwargs)))
+    webapp.serve()
+    executor = webapp.compute_executor
+    assert calls['threads'] > (executor.max_workers + executor.max_queue
+                               + webapp.waveform_streams.max_streams)
@@ -0,0 +1,213 @@
+"""
+RFVision - 信号数据传输编码
+
+API响应的序列化与内容协商：
+- 默认: JSON (NumPy数组转换为列表)
+- 二进制: 小端序 float32/float64 原始缓冲区 + 小型JSON头
+
+二进制帧格式:
+    [0:4]        uint32 (LE)  JSON头长度 N
+    [4:4+N]      UTF-8 JSON头 {"payload": ..., "arrays": [...]}
+    [pad]        填充至8字节对齐
+    [data...]    各数组数据块，每块起始偏移均为8字节对齐
+
+JSON头中数组以 {"$array": i} 占位，arrays[i] 记录
+dtype / 相对数据区起始的 offset / 元素个数 length。
+客户端可直接以 TypedArray 视图读取，无需拷贝。
+"""
+
+import json
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from flask import Response, jsonify, request
+
+from decimation import decimate_payload
+from metrics import phase
+
+BINARY_MIMETYPE = 'application/octet-stream'
+
+# format 查询参数 -> 浮点数组的传输类型
+BINARY_FORMATS = {
+    'f32': np.dtype('<f4'),
+    'f64': np.dtype('<f8'),
+}
+
+# 传输中允许出现的dtype名称（与前端TypedArray一一对应）
+_WIRE_DTYPES = {
+    'float32': np.dtype('<f4'),
+    'float64': np.dtype('<f8'),
+    'int8': np.dtype('i1'),
+    'uint8': np.dtype('u1'),
+    'int16': np.dtype('<i2'),
+    'int32': np.dtype('<i4'),
+}
+
+_ALIGNMENT = 8
+
+# float32 数组写入JSON时保留的有效数字（9位可保证读回后与原 float32 值完全相同）
+FLOAT32_JSON_DIGITS = 9
+
+
+def _align(offset: int) -> int:
+    """向上对齐到8字节边界"""
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def negotiate_format(req) -> Optional[np.dtype]:
+    """根据请求确定二进制传输格式，返回None表示使用JSON
+
+    优先使用 format 查询参数 (json / f32 / f64)，
+    其次检查 Accept: application/octet-stream（默认float32）。
+    """
+    fmt = req.args.get('format', '').lower()
+    if fmt == 'json':
+        return None
+    if fmt in BINARY_FORMATS:
+        return BINARY_FORMATS[fmt]
+    accept = req.accept_mimetypes
+    if accept[BINARY_MIMETYPE] > accept['application/json']:
+        return BINARY_FORMATS['f32']
+    return None
+
+
+def compact_float32(values: np.ndarray, digits: int = FLOAT32_JSON_DIGITS) -> np.ndarray:
+    """把 float32 数组舍入为 digits 位有效数字的 float64
+
+    float32 直接 tolist() 会按 float64 输出17位数字（0.1 → 0.10000000149011612），
+    比 float64 模式的JSON还长；舍入后的值按最短形式输出，且转换回 float32 时不变。
+    """
+    values = values.astype(np.float64)
+    magnitude = np.abs(values)
+    exponent = np.zeros_like(values)
+    np.log10(magnitude, out=exponent, where=magnitude > 0)
+    # 10 的非负整数次幂可精确表示，整数除以它的结果是最接近该十进制数的 float64
+    scale = 10.0 ** np.clip(digits - 1 - np.floor(exponent), 0, 22)
+    return np.round(values * scale) / scale
+
+
+def to_jsonable(obj: Any) -> Any:
+    """递归地将NumPy数组/标量转换为可JSON序列化的Python对象"""
+    if isinstance(obj, np.ndarray):
+        if obj.dtype == np.float32:
+            return compact_float32(obj).tolist()
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, dict):
+        return {key: to_jsonable(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_jsonable(value) for value in obj]
+    return obj
+
+
+def _wire_dtype(array: np.ndarray, float_dtype: np.dtype) -> Tuple[str, np.dtype]:
+    """确定数组在传输中使用的dtype"""
+    if array.dtype.kind == 'f':
+        dtype = float_dtype
+    elif array.dtype.kind == 'b':
+        dtype = np.dtype('u1')
+    else:
+        dtype = array.dtype.newbyteorder('<')
+    for name, wire in _WIRE_DTYPES.items():
+        if wire == dtype:
+            return name, wire
+    # 不支持的类型(如int64)退化为浮点传输
+    return ('float32' if float_dtype.itemsize == 4 else 'float64'), float_dtype
+
+
+def pack_binary(payload: Any, float_dtype: np.dtype = BINARY_FORMATS['f32']) -> bytes:
+    """将包含NumPy数组的响应打包为二进制帧"""
+    blocks: List[bytes] = []
+    descriptors: List[Dict] = []
+    offset = 0
+
+    def extract(obj: Any) -> Any:
+        nonlocal offset
+        if isinstance(obj, np.ndarray) and obj.dtype.kind in 'biuf' and obj.ndim >= 1:
+            name, wire = _wire_dtype(obj, float_dtype)
+            data = np.ascontiguousarray(obj, dtype=wire).tobytes()
+            start = _align(offset)
+            if start > offset:
+                blocks.append(b'\0' * (start - offset))
+            descriptors.append({
+                'dtype': name,
+                'offset': start,
+                'length': int(obj.size),
+                'shape': list(obj.shape),
+            })
+            blocks.append(data)
+            offset = start + len(data)
+            return {'$array': len(descriptors) - 1}
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if isinstance(obj, dict):
+            return {key: extract(value) for key, value in obj.items()}
+        if isinstance(obj, (list, tuple)):
+            return [extract(value) for value in obj]
+        return obj
+
+    header = json.dumps({'payload': extract(payload), 'arrays': descriptors},
+                        separators=(',', ':')).encode('utf-8')
+    prefix = struct.pack('<I', len(header)) + header
+    prefix += b'\0' * (_align(len(prefix)) - len(prefix))
+    return prefix + b''.join(blocks)
+
+
+def unpack_binary(buffer: bytes) -> Any:
+    """解析二进制帧（主要用于测试和基准工具）"""
+    (header_length,) = struct.unpack_from('<I', buffer, 0)
+    header = json.loads(buffer[4:4 + header_length].decode('utf-8'))
+    base = _align(4 + header_length)
+    arrays = [
+        np.frombuffer(buffer, dtype=_WIRE_DTYPES[desc['dtype']],
+                      count=desc['length'], offset=base + desc['offset']).reshape(desc['shape'])
+        for desc in header['arrays']
+    ]
+
+    def restore(obj: Any) -> Any:
+        if isinstance(obj, dict):
+            if set(obj) == {'$array'}:
+                return arrays[obj['$array']]
+            return {key: restore(value) for key, value in obj.items()}
+        if isinstance(obj, list):
+            return [restore(value) for value in obj]
+        return obj
+
+    return restore(header['payload'])
+
+
+def requested_max_points(req) -> Optional[int]:
+    """读取 max_points 参数（查询参数优先，其次JSON请求体），无效或缺省时返回None"""
+    value = req.args.get('max_points')
+    if value is None and req.is_json:
+        body = req.get_json(silent=True)
+        if isinstance(body, dict):
+            value = body.get('max_points')
+    try:
+        max_points = int(value)
+    except (TypeError, ValueError):
+        return None
+    return max_points if max_points > 0 else None
+
+
+def signal_response(payload: Any) -> Response:
+    """按当前请求的内容协商结果返回JSON或二进制响应
+
+    请求携带 max_points 时，先对信号/频谱数组做最小/最大包络降采样。
+    """
+    with phase('serialize'):
+        max_points = requested_max_points(request)
+        if max_points is not None:
+            payload = decimate_payload(payload, max_points)
+
+        float_dtype = negotiate_format(request)
+        if float_dtype is None:
+            response = jsonify(to_jsonable(payload))
+        else:
+            response = Response(pack_binary(payload, float_dtype), mimetype=BINARY_MIMETYPE)
+        response.vary.add('Accept')
+    return response
@@ -0,0 +1,127 @@
+"""
+RFVision - 中间数组记忆化（时间轴 / 载波 / 调制音）
+
+AM/FM/PM 页面拖动滑块时通常只改变调制深度或频偏，
+时间轴、载波和调制余弦在相同 (采样率, 时长, 频率) 下完全相同。
+这里按依赖关系缓存这些中间数组：
+- time_base(fs, duration)            -> t
+- phase_ramp(fs, duration, f)        -> 2πft          （依赖 t）
+- cosine(fs, duration, f) / sine(...) -> cos/sin(2πft) （依赖相位斜坡）
+
+缓存的数组均为只读，调用方只能在其基础上生成新数组，
+因此参数变化时只重新计算最后的组合步骤。
+
+每个数组可按 float64 或 float32 缓存（dtype 是键的一部分）。float32 的相位斜坡
+先在 float64 中按周期取模再转换，保持在 [0, 2π) 内，长时间轴的相位不会损失精度。
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+
+class WaveformMemo:
+    """按条目数与字节数限制的只读中间数组LRU缓存（线程安全）"""
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Tuple, np.ndarray]' = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> 'WaveformMemo':
+        """根据环境变量 RFVISION_MEMO_MAX_ENTRIES / RFVISION_MEMO_MAX_MB 创建"""
+        return cls(int(os.environ.get('RFVISION_MEMO_MAX_ENTRIES', 128)),
+                   int(os.environ.get('RFVISION_MEMO_MAX_MB', 64)) * 1024 * 1024)
+
+    def __getstate__(self) -> Dict:
+        # 处理器会被发送到 BER 进程池：只传递容量配置，子进程中从空缓存开始
+        return {'max_entries': self.max_entries, 'max_bytes': self.max_bytes}
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__init__(state['max_entries'], state['max_bytes'])
+
+    def _lookup(self, key: Tuple, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        with self._lock:
+            values = self._entries.get(key)
+            if values is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return values
+            self.misses += 1
+
+        # 在锁外计算，并发的相同请求最多重复计算一次
+        values = compute()
+        values.setflags(write=False)
+        if values.nbytes > self.max_bytes:
+            return values
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = values
+                self._total_bytes += values.nbytes
+                while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._total_bytes -= evicted.nbytes
+                    self.evictions += 1
+            return self._entries[key]
+
+    def time_base(self, sampling_rate: float, duration: float, dtype=np.float64) -> np.ndarray:
+        """时间轴 linspace(0, duration, fs·duration)"""
+        dtype = np.dtype(dtype)
+        key = ('t', float(sampling_rate), float(duration), dtype.str)
+        return self._lookup(key, lambda: np.linspace(0, duration, int(sampling_rate * duration),
+                                                     dtype=dtype))
+
+    def phase_ramp(self, sampling_rate: float, duration: float, frequency: float,
+                   dtype=np.float64) -> np.ndarray:
+        """相位斜坡 2πft（float32 时按 2π 取模）"""
+        dtype = np.dtype(dtype)
+        key = ('phase', float(sampling_rate), float(duration), float(frequency), dtype.str)
+        if dtype == np.float64:
+            return self._lookup(key, lambda: 2 * np.pi * frequency
+                                * self.time_base(sampling_rate, duration))
+
+        def wrapped() -> np.ndarray:
+            cycles = frequency * self.time_base(sampling_rate, duration)
+            return (2 * np.pi * (cycles - np.floor(cycles))).astype(dtype)
+        return self._lookup(key, wrapped)
+
+    def cosine(self, sampling_rate: float, duration: float, frequency: float,
+               dtype=np.float64) -> np.ndarray:
+        """cos(2πft)"""
+        key = ('cos', float(sampling_rate), float(duration), float(frequency), np.dtype(dtype).str)
+        return self._lookup(key, lambda: np.cos(self.phase_ramp(sampling_rate, duration, frequency,
+                                                                dtype)))
+
+    def sine(self, sampling_rate: float, duration: float, frequency: float,
+             dtype=np.float64) -> np.ndarray:
+        """sin(2πft)"""
+        key = ('sin', float(sampling_rate), float(duration), float(frequency), np.dtype(dtype).str)
+        return self._lookup(key, lambda: np.sin(self.phase_ramp(sampling_rate, duration, frequency,
+                                                                dtype)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict:
+        """缓存统计信息"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }